@@ -60,11 +60,13 @@ from ludwig.utils.horovod_utils import broadcast_return, configure_horovod, \
     is_on_master
 from ludwig.utils.misc_utils import get_output_directory, get_file_names, \
     get_experiment_description
-from ludwig.utils.tf_utils import initialize_tensorflow
+from ludwig.utils.tf_utils import initialize_tensorflow, \
+    mixed_precision_policy
 
 import yaml
 
-from ludwig.utils.defaults import default_random_seed, merge_with_defaults
+from ludwig.utils.defaults import default_random_seed, merge_with_defaults, \
+    default_training_params
 from ludwig.utils.print_utils import print_boxed
 
 logger = logging.getLogger(__name__)
@@ -536,7 +538,11 @@ class LudwigModel:
 
         logger.debug('Predicting')
         predictor = Predictor(
-            batch_size=batch_size, horovod=self._horovod, debug=debug
+            batch_size=batch_size, horovod=self._horovod, debug=debug,
+            input_pipeline=self.model_definition[TRAINING].get(
+                'input_pipeline',
+                default_training_params['input_pipeline']
+            )
         )
         predictions = predictor.batch_predict(
             self.model,
@@ -628,7 +634,11 @@ class LudwigModel:
 
         logger.debug('Predicting')
         predictor = Predictor(
-            batch_size=batch_size, horovod=self._horovod, debug=debug
+            batch_size=batch_size, horovod=self._horovod, debug=debug,
+            input_pipeline=self.model_definition[TRAINING].get(
+                'input_pipeline',
+                default_training_params['input_pipeline']
+            )
         )
         stats, predictions = predictor.batch_evaluation(
             self.model,
@@ -824,7 +834,11 @@ class LudwigModel:
 
         logger.debug('Predicting')
         predictor = Predictor(
-            batch_size=batch_size, horovod=self._horovod, debug=debug
+            batch_size=batch_size, horovod=self._horovod, debug=debug,
+            input_pipeline=self.model_definition[TRAINING].get(
+                'input_pipeline',
+                default_training_params['input_pipeline']
+            )
         )
         activations = predictor.batch_collect_activations(
             self.model,
@@ -840,7 +854,8 @@ class LudwigModel:
              use_horovod=None,
              gpus=None,
              gpu_memory_limit=None,
-             allow_parallel_threads=True):
+             allow_parallel_threads=True,
+             mixed_precision=None):
         """This function allows for loading pretrained models
 
         # Inputs
@@ -855,6 +870,10 @@ class LudwigModel:
         :param allow_parallel_threads: (bool, default: `True`) allow TensorFlow to use
                multithreading parallelism to improve performance at the cost of
                determinism.
+        :param mixed_precision: (string, default: `None`) keras mixed
+               precision policy used for predictions, `mixed_float16` or
+               `mixed_bfloat16`. By default the policy the model was trained
+               with is used. Variables are float32 with every policy.
 
         # Return
 
@@ -873,6 +892,8 @@ class LudwigModel:
             model_dir,
             MODEL_HYPERPARAMETERS_FILE_NAME
         )), horovod)
+        if mixed_precision is not None:
+            model_definition[TRAINING]['mixed_precision'] = mixed_precision
 
         # initialize model
         ludwig_model = LudwigModel(
@@ -986,11 +1007,15 @@ class LudwigModel:
     @staticmethod
     def create_model(model_definition):
         # todo: support loading other model types based on definition
-        return ECD(
-            input_features_def=model_definition['input_features'],
-            combiner_def=model_definition['combiner'],
-            output_features_def=model_definition['output_features'],
-        )
+        # the layers compute with the policy active when they are created
+        with mixed_precision_policy(
+                model_definition[TRAINING].get('mixed_precision')
+        ):
+            return ECD(
+                input_features_def=model_definition['input_features'],
+                combiner_def=model_definition['combiner'],
+                output_features_def=model_definition['output_features'],
+            )
 
     @staticmethod
     def set_logging_level(logging_level):
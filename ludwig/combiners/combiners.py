@@ -243,7 +243,7 @@ class SequenceConcatCombiner(tf.keras.Model):
         )
         hidden = tf.multiply(
             hidden,
-            tf.cast(tf.expand_dims(sequence_mask, -1), dtype=tf.float32)
+            tf.cast(tf.expand_dims(sequence_mask, -1), dtype=hidden.dtype)
         )
 
         # ================ Reduce ================
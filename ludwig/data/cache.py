@@ -0,0 +1,164 @@
+#! /usr/bin/env python
+# coding=utf-8
+# Copyright (c) 2019 Uber Technologies, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+
+import h5py
+
+from ludwig.globals import LUDWIG_VERSION
+from ludwig.utils.data_utils import NumpyEncoder
+from ludwig.utils.data_utils import load_json
+from ludwig.utils.data_utils import read_hdf5_value
+from ludwig.utils.data_utils import save_hdf5
+from ludwig.utils.data_utils import save_json
+
+logger = logging.getLogger(__name__)
+
+CACHE_DATA_FILE_NAME = 'data.hdf5'
+CACHE_METADATA_FILE_NAME = 'metadata.json'
+
+
+def get_file_fingerprint(file_path, checksum=False):
+    """
+    Returns a fingerprint identifying the content of a file.
+    By default it is made of the absolute path, size and modification time
+    of the file. With checksum it is the md5 of the content of the file,
+    which is slower to compute but is shared by copies of the same file.
+    :param file_path: path to the file
+    :param checksum: if True use the md5 of the content of the file
+    :return: dictionary fingerprint
+    """
+    if file_path is None:
+        return None
+    if checksum:
+        md5 = hashlib.md5()
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                md5.update(block)
+        return {'md5': md5.hexdigest()}
+    stat = os.stat(file_path)
+    return {
+        'path': os.path.abspath(file_path),
+        'size': stat.st_size,
+        'mtime': stat.st_mtime_ns
+    }
+
+
+def get_data_fingerprint(file_paths, checksum=False):
+    return [get_file_fingerprint(fp, checksum=checksum) for fp in file_paths]
+
+
+class PreprocessingCache:
+    """
+    Content addressed cache of preprocessed data. Each entry is a directory
+    named after its key containing a hdf5 file with the arrays and a json
+    file with the metadata. When the size of the cache exceeds max_size
+    the least recently used entries are evicted.
+    """
+
+    def __init__(self, cache_dir, max_size=None):
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def get_key(**kwargs):
+        key_dict = dict(kwargs, ludwig_version=LUDWIG_VERSION)
+        key_json = json.dumps(key_dict, cls=NumpyEncoder, sort_keys=True)
+        return hashlib.sha256(key_json.encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        entry_dir = os.path.join(self.cache_dir, key)
+        if not os.path.isdir(entry_dir):
+            return None
+
+        try:
+            data_fp = os.path.join(entry_dir, CACHE_DATA_FILE_NAME)
+            with h5py.File(data_fp, 'r') as h5_file:
+                data = {
+                    name: read_hdf5_value(h5_file[name])
+                    for name in h5_file
+                }
+            metadata = load_json(
+                os.path.join(entry_dir, CACHE_METADATA_FILE_NAME)
+            )
+            # mark the entry as recently used
+            os.utime(entry_dir)
+        except (OSError, ValueError):
+            logger.warning(
+                'Unable to read cache entry {}, ignoring it'.format(entry_dir)
+            )
+            return None
+        return data, metadata
+
+    def put(self, key, data, metadata=None):
+        # write to a temporary directory first so that concurrent
+        # readers never see partially written entries
+        tmp_dir = tempfile.mkdtemp(prefix='.tmp_', dir=self.cache_dir)
+        save_hdf5(os.path.join(tmp_dir, CACHE_DATA_FILE_NAME), data)
+        save_json(os.path.join(tmp_dir, CACHE_METADATA_FILE_NAME), metadata)
+        try:
+            os.rename(tmp_dir, os.path.join(self.cache_dir, key))
+        except OSError:
+            # the same entry was written concurrently
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+        self.evict()
+
+    def evict(self):
+        if self.max_size is None:
+            return
+
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            entry_dir = os.path.join(self.cache_dir, name)
+            if name.startswith('.') or not os.path.isdir(entry_dir):
+                continue
+            try:
+                size = sum(
+                    os.path.getsize(os.path.join(entry_dir, file_name))
+                    for file_name in os.listdir(entry_dir)
+                )
+                entries.append((os.path.getmtime(entry_dir), size, entry_dir))
+            except OSError:
+                # evicted concurrently
+                continue
+
+        cache_size = sum(size for _, size, _ in entries)
+        for _, size, entry_dir in sorted(entries):
+            if cache_size <= self.max_size:
+                break
+            logger.debug('Evicting cache entry {}'.format(entry_dir))
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            cache_size -= size
+
+
+def get_preprocessing_cache(global_preprocessing_parameters):
+    """
+    Returns the preprocessing cache configured in the preprocessing
+    parameters, None if no cache_dir is set.
+    """
+    cache_dir = global_preprocessing_parameters.get('cache_dir')
+    if cache_dir is None:
+        return None
+    return PreprocessingCache(
+        os.path.expanduser(cache_dir),
+        max_size=global_preprocessing_parameters.get('cache_max_size')
+    )
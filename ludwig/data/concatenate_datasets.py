@@ -35,19 +35,23 @@ def concatenate(train_csv, vali_csv, test_csv, output_csv):
 
 
 def concatenate_csv(train_csv, vali_csv, test_csv):
-    logger.info('Loading training csv...')
-    train_df = read_csv(train_csv)
+    return concatenate_files(train_csv, vali_csv, test_csv, read_csv)
+
+
+def concatenate_files(train_fp, vali_fp, test_fp, read_fn):
+    logger.info('Loading training file...')
+    train_df = read_fn(train_fp)
     logger.info('done')
 
-    logger.info('Loading validation csv..')
-    vali_df = read_csv(vali_csv) if vali_csv is not None else None
+    logger.info('Loading validation file..')
+    vali_df = read_fn(vali_fp) if vali_fp is not None else None
     logger.info('done')
 
-    logger.info('Loading test csv..')
-    test_df = read_csv(test_csv) if test_csv is not None else None
+    logger.info('Loading test file..')
+    test_df = read_fn(test_fp) if test_fp is not None else None
     logger.info('done')
 
-    logger.info('Concatenating csvs..')
+    logger.info('Concatenating files..')
     concatenated_df = concatenate_df(train_df, vali_df, test_df)
     logger.info('done')
 
@@ -14,15 +14,27 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # ==============================================================================
+import os
+
 import h5py
 import numpy as np
+from scipy import sparse
+
+from ludwig.constants import TEXT
+from ludwig.utils.data_utils import out_of_core_data_key
+from ludwig.utils.data_utils import read_hdf5_rows
+from ludwig.utils.data_utils import text_feature_data_field
+
+# bytes of hdf5 chunks cached by the reader, a shuffle buffer of chunks
+# is read from the cache
+HDF5_CHUNK_CACHE_SIZE = 64 << 20
 
 
 class Dataset:
     def __init__(self, dataset, input_features, output_features, data_hdf5_fp):
         self.dataset = dataset
 
-        self.size = min(map(len, self.dataset.values()))
+        self.size = min(value.shape[0] for value in self.dataset.values())
 
         self.input_features = {}
         for feature in input_features:
@@ -35,29 +47,109 @@ class Dataset:
         self.features = self.input_features.copy()
         self.features.update(self.output_features)
         self.data_hdf5_fp = data_hdf5_fp
+        self._hdf5_file = None
+        self._hdf5_pid = None
 
-    def get(self, feature_name, idx=None):
+    def get(self, feature_name, idx=None, out=None):
+        """
+        Returns the rows of a feature.
+        :param feature_name: name of the feature
+        :param idx: slice or indices of the rows, all the rows if None.
+               In memory rows selected by a slice are a view of the dataset
+        :param out: optional array with a row for each index the rows are
+               gathered into, to reuse the memory of a previous batch
+        :return: numpy array with the rows
+        """
         if idx is None:
             idx = range(self.size)
-        if (self.data_hdf5_fp is None or
-                'preprocessing' not in self.features[feature_name] or
-                'in_memory' not in self.features[feature_name]['preprocessing']):
-            return self.dataset[feature_name][idx]
-        if self.features[feature_name]['preprocessing']['in_memory']:
-            return self.dataset[feature_name][idx]
-
-        sub_batch = self.dataset[feature_name][idx]
-
-        indices = np.empty((3, len(sub_batch)), dtype=np.int64)
-        indices[0, :] = sub_batch
-        indices[1, :] = np.arange(len(sub_batch))
-        indices = indices[:, np.argsort(indices[0])]
-
-        with h5py.File(self.data_hdf5_fp, 'r') as h5_file:
-            im_data = h5_file[feature_name + '_data'][indices[0, :], :, :]
-        indices[2, :] = np.arange(len(sub_batch))
-        indices = indices[:, np.argsort(indices[1])]
-        return im_data[indices[2, :]]
+        if self.is_in_memory(feature_name):
+            return self._get_in_memory(feature_name, idx, out)
+        return self._get_out_of_core(feature_name, idx, out)
+
+    def is_in_memory(self, feature_name):
+        preprocessing = self.features[feature_name].get('preprocessing', {})
+        return (
+                self.data_hdf5_fp is None or
+                preprocessing.get('in_memory', True)
+        )
+
+    def get_storage_order(self):
+        """
+        Returns the positions of the rows sorted by where the data of the
+        features not kept in memory is stored in the hdf5 file, so that
+        reading them in this order is sequential. None if all the features
+        are in memory.
+        """
+        for feature_name in self.features:
+            if not self.is_in_memory(feature_name):
+                return np.argsort(self.dataset[feature_name], kind='stable')
+        return None
+
+    def get_chunk_size(self):
+        """
+        Returns the smallest number of rows of the hdf5 chunks of the
+        features not kept in memory, None if they are not chunked by rows.
+        """
+        chunk_sizes = []
+        for feature_name in self.features:
+            if not self.is_in_memory(feature_name):
+                h5_value = self._get_hdf5_file()[
+                    self._get_data_key(feature_name)
+                ]
+                if isinstance(h5_value, h5py.Dataset) and h5_value.chunks:
+                    chunk_sizes.append(h5_value.chunks[0])
+        return min(chunk_sizes) if chunk_sizes else None
+
+    def _get_in_memory(self, feature_name, idx, out=None):
+        data = self.dataset[feature_name]
+        if sparse.issparse(data):
+            # sparse features are only densified one batch at a time
+            if not isinstance(idx, slice):
+                idx = np.asarray(idx)
+            return data[idx].toarray()
+        if out is None or isinstance(idx, slice):
+            return data[idx]
+        return np.take(data, idx, axis=0, out=out)
+
+    def _get_out_of_core(self, feature_name, idx, out=None):
+        # the in memory data are the indices of the rows in the hdf5 file
+        rows = np.asarray(self.dataset[feature_name][idx])
+        # hdf5 reads rows in increasing order
+        order = np.argsort(rows)
+        data = read_hdf5_rows(
+            self._get_hdf5_file()[self._get_data_key(feature_name)],
+            rows[order]
+        )
+        if sparse.issparse(data):
+            data = data.toarray()
+        return np.take(data, np.argsort(order), axis=0, out=out)
+
+    def _get_data_key(self, feature_name):
+        feature = self.features[feature_name]
+        if feature['type'] == TEXT:
+            return out_of_core_data_key(text_feature_data_field(feature))
+        return out_of_core_data_key(feature_name)
+
+    def _get_hdf5_file(self):
+        # the reader stays open between batches, each process opens its own
+        if self._hdf5_file is None or self._hdf5_pid != os.getpid():
+            self._hdf5_file = h5py.File(
+                self.data_hdf5_fp,
+                'r',
+                rdcc_nbytes=HDF5_CHUNK_CACHE_SIZE
+            )
+            self._hdf5_pid = os.getpid()
+        return self._hdf5_file
+
+    def close(self):
+        if self._hdf5_file is not None and self._hdf5_pid == os.getpid():
+            self._hdf5_file.close()
+        self._hdf5_file = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_hdf5_file'] = None
+        return state
 
     def get_dataset(self):
         return self.dataset
@@ -16,6 +16,15 @@
 # ==============================================================================
 import argparse
 import logging
+import multiprocessing
+import os
+import shutil
+import tempfile
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import partial
 
 import h5py
 import numpy as np
@@ -24,17 +33,32 @@ import yaml
 
 from ludwig.constants import *
 from ludwig.constants import TEXT
-from ludwig.data.concatenate_datasets import concatenate_csv
+from ludwig.data.cache import get_data_fingerprint
+from ludwig.data.cache import PreprocessingCache
+from ludwig.data.cache import get_preprocessing_cache
 from ludwig.data.concatenate_datasets import concatenate_df
+from ludwig.data.concatenate_datasets import concatenate_files
 from ludwig.data.dataset import Dataset
 from ludwig.features.feature_registries import base_type_registry, \
     input_type_registry
+from ludwig.features.text_feature import TEXT_LEVELS
 from ludwig.utils import data_utils
 from ludwig.utils.data_utils import collapse_rare_labels, figure_data_format, \
-    DATA_TRAIN_HDF5_FP, DICT_FORMATS, DATAFRAME_FORMATS, CSV_FORMATS, \
-    HDF5_FORMATS, override_in_memory_flag
+    DATA_TRAIN_HDF5_FP, DATA_FINGERPRINT, PREPROCESSING_FINGERPRINT, \
+    DICT_FORMATS, DATAFRAME_FORMATS, CSV_FORMATS, HDF5_FORMATS, \
+    PARQUET_FORMATS, FEATHER_FORMATS, COLUMNAR_FORMATS, NPY_FORMATS, \
+    override_in_memory_flag
 from ludwig.utils.data_utils import file_exists_with_diff_extension
+from ludwig.utils.data_utils import append_hdf5
+from ludwig.utils.data_utils import append_out_of_core_data
 from ludwig.utils.data_utils import read_csv
+from ludwig.utils.data_utils import read_csv_chunks
+from ludwig.utils.data_utils import read_feather
+from ludwig.utils.data_utils import read_parquet
+from ludwig.utils.data_utils import read_parquet_chunks
+from ludwig.utils.data_utils import read_hdf5_value
+from ludwig.utils.data_utils import load_npy_dir
+from ludwig.utils.data_utils import load_npy_dir_metadata
 from ludwig.utils.data_utils import replace_file_extension
 from ludwig.utils.data_utils import split_dataset_ttv
 from ludwig.utils.data_utils import text_feature_data_field
@@ -48,6 +72,26 @@ from ludwig.utils.misc_utils import set_random_seed
 
 logger = logging.getLogger(__name__)
 
+# features reading files from disk: they manage their own parallelism
+# and can write to the hdf5 cache, so they are preprocessed in this process
+SERIAL_PREPROCESSING_TYPES = {AUDIO, IMAGE}
+
+FILL_METHODS = {'backfill', 'bfill', 'pad', 'ffill'}
+MISSING_VALUE_STRATEGIES = {
+    FILL_WITH_CONST, FILL_WITH_MODE, FILL_WITH_MEAN, DROP_ROW
+} | FILL_METHODS
+
+# rows of the features with in_memory False built at once
+OUT_OF_CORE_CHUNK_SIZE = 1000
+
+# features kept in the hdf5 file saved next to chunked datasets unless
+# their in_memory parameter is set, only the indices of their rows are loaded
+CHUNKED_OUT_OF_CORE_TYPES = {AUDIO, IMAGE, SEQUENCE, TEXT, TIMESERIES}
+
+# features whose builders read the column as strings: it is converted once
+# by normalize_columns and shared by the metadata and data builders
+STRING_COLUMN_TYPES = {BAG, CATEGORY, DATE, SEQUENCE, SET, TEXT, TIMESERIES}
+
 
 def build_dataset_csv(
         dataset_csv,
@@ -69,12 +113,88 @@ def build_dataset_csv(
     )
 
 
+def build_dataset_columnar(
+        dataset_fp,
+        features,
+        global_preprocessing_parameters,
+        training_set_metadata=None,
+        random_seed=default_random_seed,
+        data_format='parquet',
+        **kwargs
+):
+    dataset_df = read_dataset_file(
+        dataset_fp,
+        data_format,
+        columns=get_dataset_columns(features, global_preprocessing_parameters)
+    )
+    return build_dataset_df(
+        dataset_df,
+        features,
+        global_preprocessing_parameters,
+        training_set_metadata,
+        random_seed,
+        **kwargs
+    )
+
+
+def read_dataset_file(dataset_fp, data_format, columns=None):
+    """
+    Reads a dataset file into a dataframe. Columnar formats (Parquet and
+    Feather) only read the requested columns, CSV files are read entirely.
+    :param dataset_fp: path to the dataset file
+    :param data_format: format of the file
+    :param columns: names of the columns needed for preprocessing
+    :return: Pandas dataframe with the data
+    """
+    if data_format in PARQUET_FORMATS:
+        dataset_df = read_parquet(dataset_fp, columns=columns)
+    elif data_format in FEATHER_FORMATS:
+        dataset_df = read_feather(dataset_fp, columns=columns)
+    else:
+        dataset_df = read_csv(dataset_fp)
+    # features containing file paths (image, audio)
+    # resolve them relative to the dataset location
+    dataset_df.csv = dataset_fp
+    return dataset_df
+
+
+def read_dataset_chunks(dataset_fp, data_format, chunk_size, columns=None):
+    """
+    Reads a dataset file one chunk of rows at a time. Works for CSV and
+    Parquet files.
+    :param dataset_fp: path to the dataset file
+    :param data_format: format of the file
+    :param chunk_size: number of rows of each chunk
+    :param columns: names of the columns needed for preprocessing
+    :return: iterator over Pandas dataframes
+    """
+    if data_format in PARQUET_FORMATS:
+        chunks = read_parquet_chunks(dataset_fp, chunk_size, columns=columns)
+    else:
+        chunks = read_csv_chunks(dataset_fp, chunk_size, columns=columns)
+    for chunk in chunks:
+        # each chunk is preprocessed as a dataframe on its own
+        chunk.index = pd.RangeIndex(len(chunk))
+        chunk.csv = dataset_fp
+        yield chunk
+
+
+def get_dataset_columns(features, global_preprocessing_parameters):
+    columns = [feature[NAME] for feature in features] + [SPLIT]
+    stratify = global_preprocessing_parameters.get('stratify')
+    if stratify is not None:
+        columns.append(stratify)
+    # remove duplicates preserving order
+    return list(dict.fromkeys(columns))
+
+
 def build_dataset_df(
         dataset_df,
         features,
         global_preprocessing_parameters,
         metadata=None,
         random_seed=default_random_seed,
+        data_hdf5_fp=None,
         **kwargs
 ):
     global_preprocessing_parameters = merge_dict(
@@ -82,20 +202,24 @@ def build_dataset_df(
         global_preprocessing_parameters
     )
 
-    if metadata is None:
-        metadata = build_metadata(
+    with feature_executor(global_preprocessing_parameters) as executor:
+        if metadata is None:
+            metadata = build_metadata(
+                dataset_df,
+                features,
+                global_preprocessing_parameters,
+                executor=executor
+            )
+
+        dataset = build_data(
             dataset_df,
             features,
-            global_preprocessing_parameters
+            metadata,
+            global_preprocessing_parameters,
+            executor=executor,
+            data_hdf5_fp=data_hdf5_fp
         )
 
-    dataset = build_data(
-        dataset_df,
-        features,
-        metadata,
-        global_preprocessing_parameters
-    )
-
     dataset[SPLIT] = get_split(
         dataset_df,
         force_split=global_preprocessing_parameters['force_split'],
@@ -109,114 +233,735 @@ def build_dataset_df(
     return dataset, metadata
 
 
-def build_metadata(dataset_df, features, global_preprocessing_parameters):
-    metadata = {}
+def build_dataset_cached(
+        read_dataset,
+        data_fingerprint,
+        features,
+        global_preprocessing_parameters,
+        cache,
+        metadata=None,
+        random_seed=default_random_seed,
+        data_hdf5_fp=None
+):
+    """
+    Same as build_dataset_df, but the data and metadata of each feature and
+    the split are reused from the preprocessing cache when available.
+    Cache keys depend on the fingerprint of the data, on the preprocessing
+    parameters of the feature and on the features dropping rows, so changing
+    the preprocessing of a feature only rebuilds that feature.
+    :param read_dataset: function returning the dataframe of the dataset
+           given the list of columns to read
+    :param data_fingerprint: fingerprint of the files of the dataset
+    :param features: list of all features (input + output)
+    :param global_preprocessing_parameters: preprocessing parameters
+    :param cache: the PreprocessingCache
+    :param metadata: train set metadata, built if None
+    :param random_seed: random seed
+    :param data_hdf5_fp: hdf5 file storing the features not kept in memory
+    :return: dataset, metadata
+    """
+    global_preprocessing_parameters = merge_dict(
+        default_preprocessing_parameters,
+        global_preprocessing_parameters
+    )
+    feature_parameters = {
+        feature[NAME]: get_feature_preprocessing_parameters(
+            feature,
+            global_preprocessing_parameters
+        )
+        for feature in features
+    }
+
+    # dropping rows in any feature changes the data of all features
+    drop_row_features = [
+        feature for feature in features
+        if feature_parameters[feature[NAME]][
+               'missing_value_strategy'
+           ] == DROP_ROW
+    ]
+    common_key = {
+        'data': data_fingerprint,
+        'drop_row': sorted(feature[NAME] for feature in drop_row_features)
+    }
+
+    feature_keys = {}
     for feature in features:
-        if PREPROCESSING in feature:
-            preprocessing_parameters = merge_dict(
-                global_preprocessing_parameters[feature[TYPE]],
-                feature[PREPROCESSING]
-            )
+        if not feature_parameters[feature[NAME]].get('in_memory', True):
+            # the data is stored in the hdf5 file next to the dataset
+            continue
+        feature_keys[feature[NAME]] = cache.get_key(
+            name=feature[NAME],
+            type=feature[TYPE],
+            preprocessing=feature_parameters[feature[NAME]],
+            metadata=metadata.get(feature[NAME]) if metadata else None,
+            **common_key
+        )
+    split_key = cache.get_key(
+        force_split=global_preprocessing_parameters['force_split'],
+        split_probabilities=global_preprocessing_parameters[
+            'split_probabilities'
+        ],
+        stratify=global_preprocessing_parameters['stratify'],
+        random_seed=random_seed,
+        **common_key
+    )
+
+    dataset = {}
+    new_metadata = {}
+    missing_features = []
+    for feature in features:
+        cache_entry = None
+        if feature[NAME] in feature_keys:
+            cache_entry = cache.get(feature_keys[feature[NAME]])
+        if cache_entry is None:
+            missing_features.append(feature)
         else:
-            preprocessing_parameters = global_preprocessing_parameters[
-                feature[TYPE]
-            ]
+            feature_dataset, new_metadata[feature[NAME]] = cache_entry
+            dataset.update(feature_dataset)
+    split_entry = cache.get(split_key)
 
-        # deal with encoders that have fixed preprocessing
-        if 'encoder' in feature:
-            encoders_registry = get_from_registry(
-                feature[TYPE],
-                input_type_registry
-            ).encoder_registry
-            encoder_class = encoders_registry[feature['encoder']]
-            if hasattr(encoder_class, 'fixed_preprocessing_parameters'):
-                encoder_fpp = encoder_class.fixed_preprocessing_parameters
-
-                preprocessing_parameters = merge_dict(
-                    preprocessing_parameters,
-                    resolve_pointers(encoder_fpp, feature, 'feature.')
+    if missing_features or split_entry is None:
+        logger.info(
+            'Preprocessing features not found in the cache: {}'.format(
+                [feature[NAME] for feature in missing_features]
+            )
+        )
+        dataset_df = read_dataset(
+            get_dataset_columns(
+                missing_features + drop_row_features,
+                global_preprocessing_parameters
+            )
+        )
+        # same order as build_data, as fill values depend on dropped rows
+        normalize_columns(
+            dataset_df,
+            [
+                feature for feature in features
+                if feature in missing_features or feature in drop_row_features
+            ],
+            global_preprocessing_parameters
+        )
+
+        with feature_executor(global_preprocessing_parameters) as executor:
+            if metadata is None:
+                features_metadata = build_metadata(
+                    dataset_df,
+                    missing_features,
+                    global_preprocessing_parameters,
+                    executor=executor
                 )
+            else:
+                features_metadata = {
+                    feature[NAME]: metadata[feature[NAME]]
+                    for feature in missing_features
+                }
+
+            features_data = build_features_data(
+                dataset_df,
+                missing_features,
+                features_metadata,
+                global_preprocessing_parameters,
+                executor=executor,
+                data_hdf5_fp=data_hdf5_fp
+            )
 
-        handle_missing_values(
-            dataset_df,
-            feature,
-            preprocessing_parameters
+        for feature, feature_dataset in zip(missing_features, features_data):
+            dataset.update(feature_dataset)
+            new_metadata[feature[NAME]] = features_metadata[feature[NAME]]
+            if feature[NAME] in feature_keys and is_on_master():
+                cache.put(
+                    feature_keys[feature[NAME]],
+                    feature_dataset,
+                    features_metadata[feature[NAME]]
+                )
+
+        if split_entry is None:
+            dataset[SPLIT] = get_split(
+                dataset_df,
+                force_split=global_preprocessing_parameters['force_split'],
+                split_probabilities=global_preprocessing_parameters[
+                    'split_probabilities'
+                ],
+                stratify=global_preprocessing_parameters['stratify'],
+                random_seed=random_seed
+            )
+            if is_on_master():
+                cache.put(split_key, {SPLIT: np.asarray(dataset[SPLIT])})
+
+    if split_entry is not None:
+        dataset[SPLIT] = split_entry[0][SPLIT]
+
+    if metadata is None:
+        metadata = new_metadata
+    else:
+        metadata.update(new_metadata)
+    return dataset, metadata
+
+
+def get_feature_preprocessing_parameters(
+        feature,
+        global_preprocessing_parameters
+):
+    if PREPROCESSING in feature:
+        preprocessing_parameters = merge_dict(
+            global_preprocessing_parameters[feature[TYPE]],
+            feature[PREPROCESSING]
         )
+    else:
+        preprocessing_parameters = global_preprocessing_parameters[
+            feature[TYPE]
+        ]
 
-        get_feature_meta = get_from_registry(
+    # deal with encoders that have fixed preprocessing
+    if 'encoder' in feature:
+        encoders_registry = get_from_registry(
             feature[TYPE],
-            base_type_registry
-        ).get_feature_meta
-        metadata[feature[NAME]] = get_feature_meta(
-            dataset_df[feature[NAME]].astype(str),
-            preprocessing_parameters
+            input_type_registry
+        ).encoder_registry
+        encoder_class = encoders_registry[feature['encoder']]
+        if hasattr(encoder_class, 'fixed_preprocessing_parameters'):
+            encoder_fpp = encoder_class.fixed_preprocessing_parameters
+
+            preprocessing_parameters = merge_dict(
+                preprocessing_parameters,
+                resolve_pointers(encoder_fpp, feature, 'feature.')
+            )
+
+    # text features only preprocess the level they use
+    if feature[TYPE] == TEXT and 'level' in feature:
+        preprocessing_parameters = merge_dict(
+            preprocessing_parameters,
+            {'level': feature['level']}
         )
-    return metadata
+
+    return preprocessing_parameters
+
+
+def build_metadata(
+        dataset_df,
+        features,
+        global_preprocessing_parameters,
+        executor=None
+):
+    feature_parameters = normalize_columns(
+        dataset_df,
+        features,
+        global_preprocessing_parameters
+    )
+
+    feature_metas = _run_feature_tasks(
+        _get_feature_meta,
+        features,
+        lambda i, remote: (
+            features[i][TYPE],
+            dataset_df[features[i][NAME]],
+            feature_parameters[i]
+        ),
+        executor=executor
+    )
+    return {
+        feature[NAME]: feature_meta
+        for feature, feature_meta in zip(features, feature_metas)
+    }
 
 
 def build_data(
         dataset_df,
         features,
         training_set_metadata,
-        global_preprocessing_parameters
+        global_preprocessing_parameters,
+        fill_values=None,
+        executor=None,
+        data_hdf5_fp=None
 ):
     dataset = {}
-    for feature in features:
-        if PREPROCESSING in feature:
-            preprocessing_parameters = merge_dict(
-                global_preprocessing_parameters[feature[TYPE]],
-                feature[PREPROCESSING]
-            )
-        else:
-            preprocessing_parameters = global_preprocessing_parameters[
-                feature[TYPE]
-            ]
-
-        # deal with encoders that have fixed preprocessing
-        if 'encoder' in feature:
-            encoders_registry = get_from_registry(
-                feature[TYPE],
-                input_type_registry
-            ).encoder_registry
+    for feature_dataset in build_features_data(
+            dataset_df,
+            features,
+            training_set_metadata,
+            global_preprocessing_parameters,
+            fill_values=fill_values,
+            executor=executor,
+            data_hdf5_fp=data_hdf5_fp
+    ):
+        dataset.update(feature_dataset)
+    return dataset
 
-            encoder_class = encoders_registry[feature['encoder']]
-            if hasattr(encoder_class, 'fixed_preprocessing_parameters'):
-                encoder_fpp = encoder_class.fixed_preprocessing_parameters
 
-                preprocessing_parameters = merge_dict(
-                    preprocessing_parameters,
-                    resolve_pointers(encoder_fpp, feature, 'feature.')
+def build_features_data(
+        dataset_df,
+        features,
+        training_set_metadata,
+        global_preprocessing_parameters,
+        fill_values=None,
+        executor=None,
+        data_hdf5_fp=None
+):
+    """
+    Same as build_data, but returns the data of each feature separately,
+    in the same order as features.
+    Features with in_memory False are appended to data_hdf5_fp and their
+    data are the indices of their rows in the file. Without a hdf5 file
+    they are kept in memory.
+    """
+    feature_parameters = normalize_columns(
+        dataset_df,
+        features,
+        global_preprocessing_parameters,
+        fill_values=fill_values
+    )
+    in_memory_idx = []
+    out_of_core_idx = []
+    for i, (feature, preprocessing_parameters) in enumerate(zip(
+            features,
+            feature_parameters
+    )):
+        if preprocessing_parameters.get('in_memory', True):
+            in_memory_idx.append(i)
+        else:
+            if data_hdf5_fp is None:
+                logger.warning(
+                    'Using in_memory = False for feature {} requires a hdf5 '
+                    'file, keeping it in memory'.format(feature[NAME])
                 )
+                in_memory_idx.append(i)
+            else:
+                out_of_core_idx.append(i)
+            # the metadata records where the feature is actually stored
+            preprocessing_parameters = dict(
+                preprocessing_parameters,
+                in_memory=data_hdf5_fp is None
+            )
+            feature_parameters[i] = preprocessing_parameters
 
-        handle_missing_values(
-            dataset_df,
-            feature,
-            preprocessing_parameters
-        )
         if feature[NAME] not in training_set_metadata:
             training_set_metadata[feature[NAME]] = {}
         training_set_metadata[
             feature[NAME]
         ][PREPROCESSING] = preprocessing_parameters
 
-        add_feature_data = get_from_registry(
-            feature[TYPE],
-            base_type_registry
-        ).add_feature_data
-        add_feature_data(
+    def get_args(j, remote):
+        i = in_memory_idx[j]
+        feature_df = dataset_df
+        if remote:
+            # only send the feature column to the worker process
+            feature_df = dataset_df[[features[i][NAME]]]
+        return (
+            features[i],
+            feature_df,
+            training_set_metadata[features[i][NAME]],
+            feature_parameters[i],
+            getattr(dataset_df, 'csv', None)
+        )
+
+    results = dict(zip(
+        in_memory_idx,
+        _run_feature_tasks(
+            _add_feature_data,
+            [features[i] for i in in_memory_idx],
+            get_args,
+            executor=executor
+        )
+    ))
+    for i in out_of_core_idx:
+        results[i] = _add_feature_data_out_of_core(
+            features[i],
+            dataset_df,
+            training_set_metadata[features[i][NAME]],
+            feature_parameters[i],
+            data_hdf5_fp,
+            global_preprocessing_parameters.get('chunk_size') or
+            OUT_OF_CORE_CHUNK_SIZE
+        )
+
+    features_data = []
+    for i, feature in enumerate(features):
+        feature_dataset, feature_metadata = results[i]
+        features_data.append(feature_dataset)
+        training_set_metadata[feature[NAME]] = feature_metadata
+    return features_data
+
+
+def get_feature_executor(global_preprocessing_parameters):
+    """
+    Returns the pool used to preprocess independent features concurrently,
+    None if features are preprocessed sequentially.
+    :param global_preprocessing_parameters: preprocessing parameters
+    :return: an executor or None
+    """
+    num_workers = global_preprocessing_parameters.get('num_workers')
+    if num_workers is None or num_workers <= 1:
+        return None
+
+    worker_type = global_preprocessing_parameters.get('worker_type')
+    if worker_type == 'process':
+        # forking a process that has imported tensorflow can hang or crash
+        return ProcessPoolExecutor(
+            max_workers=num_workers,
+            mp_context=multiprocessing.get_context('spawn')
+        )
+    elif worker_type == 'thread':
+        return ThreadPoolExecutor(max_workers=num_workers)
+    else:
+        raise ValueError('Invalid worker type: {}'.format(worker_type))
+
+
+@contextmanager
+def feature_executor(global_preprocessing_parameters):
+    executor = get_feature_executor(global_preprocessing_parameters)
+    try:
+        yield executor
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+
+def _run_feature_tasks(task, features, get_args, executor=None):
+    """
+    Runs task for each feature, concurrently if an executor is provided.
+    Features in SERIAL_PREPROCESSING_TYPES always run in this process.
+    Results are returned in the order of features, so they don't depend
+    on the number of workers.
+    :param task: function to run
+    :param features: list of features
+    :param get_args: function of the feature index and of a flag telling
+           if the task runs in another process, returning the task arguments
+    :param executor: executor running the tasks, None to run sequentially
+    :return: list of the results of the task for each feature
+    """
+    remote = isinstance(executor, ProcessPoolExecutor)
+    futures = {}
+    if executor is not None:
+        for i, feature in enumerate(features):
+            if feature[TYPE] not in SERIAL_PREPROCESSING_TYPES:
+                futures[i] = executor.submit(task, *get_args(i, remote))
+
+    results = []
+    for i, feature in enumerate(features):
+        if i in futures:
+            results.append(futures[i].result())
+        else:
+            results.append(task(*get_args(i, False)))
+    return results
+
+
+def _get_feature_meta(feature_type, column, preprocessing_parameters):
+    get_feature_meta = get_from_registry(
+        feature_type,
+        base_type_registry
+    ).get_feature_meta
+    return get_feature_meta(column, preprocessing_parameters)
+
+
+def _add_feature_data(
+        feature,
+        dataset_df,
+        feature_metadata,
+        preprocessing_parameters,
+        csv=None
+):
+    if csv is not None:
+        dataset_df.csv = csv
+    dataset = {}
+    metadata = {feature[NAME]: feature_metadata}
+    add_feature_data = get_from_registry(
+        feature[TYPE],
+        base_type_registry
+    ).add_feature_data
+    add_feature_data(
+        feature,
+        dataset_df,
+        dataset,
+        metadata,
+        preprocessing_parameters
+    )
+    return dataset, metadata[feature[NAME]]
+
+
+def _add_feature_data_out_of_core(
+        feature,
+        dataset_df,
+        feature_metadata,
+        preprocessing_parameters,
+        data_hdf5_fp,
+        chunk_size
+):
+    """
+    Same as _add_feature_data, but the data is built one chunk of rows at a
+    time and appended to a hdf5 file, so only the indices of the rows of
+    the feature are kept in memory.
+    """
+    csv = getattr(dataset_df, 'csv', None)
+    chunks_data = []
+    for start in range(0, max(len(dataset_df), 1), chunk_size):
+        chunk_data, feature_metadata = _add_feature_data(
+            feature,
+            dataset_df.iloc[start:start + chunk_size],
+            feature_metadata,
+            preprocessing_parameters,
+            csv
+        )
+        for key in chunk_data:
+            append_out_of_core_data(data_hdf5_fp, chunk_data, key)
+        chunks_data.append(chunk_data)
+    dataset = {
+        key: np.concatenate([chunk_data[key] for chunk_data in chunks_data])
+        for key in chunks_data[0]
+    }
+    return dataset, feature_metadata
+
+
+def build_metadata_chunked(
+        read_chunks,
+        features,
+        global_preprocessing_parameters,
+        fill_values=None
+):
+    """
+    First pass of the chunked preprocessing. Builds the metadata streaming
+    over the chunks of the dataset: features whose metadata depends on the
+    whole column (vocabularies, normalization statistics, maximum lengths)
+    accumulate mergeable statistics chunk by chunk with
+    `update_feature_stats`, the others get their metadata from the first
+    chunk.
+    :param read_chunks: function returning an iterator over the chunks
+    :param features: list of all features (input + output)
+    :param global_preprocessing_parameters: preprocessing parameters
+    :param fill_values: missing values fills computed on the whole dataset
+    :return: train set metadata
+    """
+    feature_parameters = {
+        feature[NAME]: get_feature_preprocessing_parameters(
+            feature,
+            global_preprocessing_parameters
+        )
+        for feature in features
+    }
+
+    metadata = {}
+    stats = {}
+    for chunk in read_chunks():
+        normalize_columns(
+            chunk,
+            features,
+            global_preprocessing_parameters,
+            fill_values=fill_values
+        )
+        for feature in features:
+            preprocessing_parameters = feature_parameters[feature[NAME]]
+            base_type = get_from_registry(feature[TYPE], base_type_registry)
+            column = chunk[feature[NAME]]
+            if hasattr(base_type, 'update_feature_stats'):
+                stats[feature[NAME]] = base_type.update_feature_stats(
+                    stats.get(feature[NAME]),
+                    column,
+                    preprocessing_parameters
+                )
+            elif feature[NAME] not in metadata and len(column) > 0:
+                metadata[feature[NAME]] = base_type.get_feature_meta(
+                    column,
+                    preprocessing_parameters
+                )
+
+    for feature in features:
+        base_type = get_from_registry(feature[TYPE], base_type_registry)
+        if feature[NAME] in stats:
+            metadata[feature[NAME]] = base_type.get_feature_meta_from_stats(
+                stats[feature[NAME]],
+                feature_parameters[feature[NAME]]
+            )
+        elif feature[NAME] not in metadata:
+            raise ValueError(
+                'No rows of the dataset are left to preprocess '
+                'feature {}'.format(feature[NAME])
+            )
+    return metadata
+
+
+def build_data_chunked(
+        read_chunks,
+        features,
+        training_set_metadata,
+        global_preprocessing_parameters,
+        hdf5_fps,
+        fill_values=None,
+        random_seed=default_random_seed,
+        data_hdf5_fp=None
+):
+    """
+    Second pass of the chunked preprocessing. Builds the data of each chunk
+    and appends it to hdf5 files. With a single file all the rows are
+    appended to it together with the split, with three files the rows are
+    appended to the training, validation and test file according to
+    their split.
+    :param read_chunks: function returning an iterator over the chunks
+    :param features: list of all features (input + output)
+    :param training_set_metadata: train set metadata
+    :param global_preprocessing_parameters: preprocessing parameters
+    :param hdf5_fps: list of paths of the hdf5 files to append to
+    :param fill_values: missing values fills computed on the whole dataset
+    :param random_seed: random seed used for splitting
+    :param data_hdf5_fp: hdf5 file the features not kept in memory are
+           appended to, the data files only contain the indices of their rows
+    """
+    # seed once so that the splits of different chunks are independent
+    set_random_seed(random_seed)
+    with feature_executor(global_preprocessing_parameters) as executor:
+        for chunk in read_chunks():
+            data = build_data(
+                chunk,
+                features,
+                training_set_metadata,
+                global_preprocessing_parameters,
+                fill_values=fill_values,
+                executor=executor,
+                data_hdf5_fp=data_hdf5_fp
+            )
+            data[SPLIT] = np.asarray(get_split(
+                chunk,
+                force_split=global_preprocessing_parameters['force_split'],
+                split_probabilities=global_preprocessing_parameters[
+                    'split_probabilities'
+                ],
+                stratify=global_preprocessing_parameters['stratify'],
+                random_seed=None
+            ))
+            if len(data[SPLIT]) == 0:
+                continue
+
+            if len(hdf5_fps) == 1:
+                append_hdf5(hdf5_fps[0], data, training_set_metadata)
+            else:
+                # split_dataset_ttv returns training, test, validation
+                training_data, test_data, validation_data = split_dataset_ttv(
+                    data,
+                    data[SPLIT]
+                )
+                for hdf5_fp, split_data in zip(
+                        hdf5_fps,
+                        [training_data, validation_data, test_data]
+                ):
+                    if split_data is not None:
+                        append_hdf5(hdf5_fp, split_data, training_set_metadata)
+
+
+def get_fill_values_chunked(
+        read_chunks,
+        features,
+        global_preprocessing_parameters
+):
+    """
+    Computes the mode and mean used to fill missing values on the whole
+    dataset, so that every chunk is filled with the same value.
+    :param read_chunks: function returning an iterator over the chunks,
+           takes the list of columns to read
+    :param features: list of all features (input + output)
+    :param global_preprocessing_parameters: preprocessing parameters
+    :return: dictionary of fill values by feature name
+    """
+    mode_features = []
+    mean_features = []
+    for feature in features:
+        missing_value_strategy = get_feature_preprocessing_parameters(
             feature,
+            global_preprocessing_parameters
+        )['missing_value_strategy']
+        if missing_value_strategy == FILL_WITH_MODE:
+            mode_features.append(feature[NAME])
+        elif missing_value_strategy == FILL_WITH_MEAN:
+            if feature[TYPE] != NUMERICAL:
+                raise ValueError(
+                    'Filling missing values with mean is supported '
+                    'only for numerical types',
+                )
+            mean_features.append(feature[NAME])
+
+    if not mode_features and not mean_features:
+        return {}
+
+    value_counts = {name: Counter() for name in mode_features}
+    sums = {name: 0.0 for name in mean_features}
+    counts = {name: 0 for name in mean_features}
+    for chunk in read_chunks(mode_features + mean_features):
+        for name in mode_features:
+            value_counts[name].update(chunk[name].value_counts().to_dict())
+        for name in mean_features:
+            sums[name] += chunk[name].sum()
+            counts[name] += chunk[name].count()
+
+    fill_values = {}
+    for name in mode_features:
+        if value_counts[name]:
+            fill_values[name] = value_counts[name].most_common(1)[0][0]
+    for name in mean_features:
+        if counts[name] > 0:
+            fill_values[name] = sums[name] / counts[name]
+    return fill_values
+
+
+def normalize_columns(
+        dataset_df,
+        features,
+        global_preprocessing_parameters,
+        fill_values=None
+):
+    """
+    Fills the missing values of the column of each feature and converts the
+    columns of STRING_COLUMN_TYPES features to strings, in place. Metadata
+    and data builders then read the same column without copying it.
+    Columns are only rewritten when they have missing values or are not
+    strings yet, so normalizing an already normalized dataframe is cheap.
+    :param dataset_df: the dataframe, modified in place
+    :param features: list of features
+    :param global_preprocessing_parameters: preprocessing parameters
+    :param fill_values: missing values fills computed on the whole dataset
+    :return: list of the preprocessing parameters of each feature
+    """
+    feature_parameters = []
+    for feature in features:
+        preprocessing_parameters = get_feature_preprocessing_parameters(
+            feature,
+            global_preprocessing_parameters
+        )
+        handle_missing_values(
             dataset_df,
-            dataset,
-            training_set_metadata,
-            preprocessing_parameters
+            feature,
+            preprocessing_parameters,
+            fill_values=fill_values
         )
-    return dataset
+        if feature[TYPE] in STRING_COLUMN_TYPES and pd.api.types.infer_dtype(
+                dataset_df[feature[NAME]],
+                skipna=False
+        ) not in ('string', 'empty'):
+            dataset_df[feature[NAME]] = dataset_df[feature[NAME]].astype(str)
+        feature_parameters.append(preprocessing_parameters)
+    return feature_parameters
 
 
-def handle_missing_values(dataset_df, feature, preprocessing_parameters):
+def handle_missing_values(
+        dataset_df,
+        feature,
+        preprocessing_parameters,
+        fill_values=None
+):
     missing_value_strategy = preprocessing_parameters['missing_value_strategy']
+    if missing_value_strategy not in MISSING_VALUE_STRATEGIES:
+        raise ValueError('Invalid missing value strategy')
+    if missing_value_strategy == FILL_WITH_MEAN and feature[TYPE] != NUMERICAL:
+        raise ValueError(
+            'Filling missing values with mean is supported '
+            'only for numerical types',
+        )
+    if not dataset_df[feature[NAME]].hasnans:
+        # nothing to fill, the column is not rewritten
+        return
 
-    if missing_value_strategy == FILL_WITH_CONST:
+    if fill_values is not None and feature[NAME] in fill_values:
+        # fill value precomputed on the whole dataset
+        dataset_df[feature[NAME]] = dataset_df[feature[NAME]].fillna(
+            fill_values[feature[NAME]],
+        )
+    elif missing_value_strategy == FILL_WITH_CONST:
         dataset_df[feature[NAME]] = dataset_df[feature[NAME]].fillna(
             preprocessing_parameters['fill_value'],
         )
@@ -225,22 +970,15 @@ def handle_missing_values(dataset_df, feature, preprocessing_parameters):
             dataset_df[feature[NAME]].value_counts().index[0],
         )
     elif missing_value_strategy == FILL_WITH_MEAN:
-        if feature[TYPE] != NUMERICAL:
-            raise ValueError(
-                'Filling missing values with mean is supported '
-                'only for numerical types',
-            )
         dataset_df[feature[NAME]] = dataset_df[feature[NAME]].fillna(
             dataset_df[feature[NAME]].mean(),
         )
-    elif missing_value_strategy in ['backfill', 'bfill', 'pad', 'ffill']:
+    elif missing_value_strategy in FILL_METHODS:
         dataset_df[feature[NAME]] = dataset_df[feature[NAME]].fillna(
             method=missing_value_strategy,
         )
     elif missing_value_strategy == DROP_ROW:
         dataset_df.dropna(subset=[feature[NAME]], inplace=True)
-    else:
-        raise ValueError('Invalid missing value strategy')
 
 
 def get_split(
@@ -253,7 +991,9 @@ def get_split(
     if SPLIT in dataset_df and not force_split:
         split = dataset_df[SPLIT]
     else:
-        set_random_seed(random_seed)
+        # a None seed keeps drawing from the current random state
+        if random_seed is not None:
+            set_random_seed(random_seed)
         if stratify is None or stratify not in dataset_df:
             split = np.random.choice(
                 3,
@@ -289,38 +1029,294 @@ def load_hdf5(
     for input_feature in input_features:
         if input_feature[TYPE] == TEXT:
             text_data_field = text_feature_data_field(input_feature)
-            dataset[text_data_field] = hdf5_data[text_data_field][()]
+            dataset[text_data_field] = read_hdf5_value(
+                hdf5_data[text_data_field]
+            )
         else:
-            dataset[input_feature[NAME]] = hdf5_data[
-                input_feature[NAME]
-            ][()]
+            dataset[input_feature[NAME]] = read_hdf5_value(
+                hdf5_data[input_feature[NAME]]
+            )
     for output_feature in output_features:
         if output_feature[TYPE] == TEXT:
-            dataset[text_feature_data_field(output_feature)] = hdf5_data[
-                text_feature_data_field(output_feature)
-            ][()]
+            dataset[text_feature_data_field(output_feature)] = read_hdf5_value(
+                hdf5_data[text_feature_data_field(output_feature)]
+            )
         else:
-            dataset[output_feature[NAME]] = hdf5_data[
-                output_feature[NAME]][()]
+            dataset[output_feature[NAME]] = read_hdf5_value(
+                hdf5_data[output_feature[NAME]]
+            )
+        if 'limit' in output_feature:
+            dataset[output_feature[NAME]] = collapse_rare_labels(
+                dataset[output_feature[NAME]],
+                output_feature['limit']
+            )
+
+    if not split_data:
+        hdf5_data.close()
+        return dataset
+
+    split = hdf5_data[SPLIT][()]
+    hdf5_data.close()
+    training_set, test_set, validation_set = split_dataset_ttv(dataset, split)
+
+    # shuffle up
+    if shuffle_training:
+        training_set = data_utils.shuffle_dict_unison_inplace(training_set)
+
+    return training_set, test_set, validation_set
+
+
+def load_npy(
+        npy_dir_path,
+        input_features,
+        output_features,
+        split_data=True
+):
+    logger.info('Loading data from: {0}'.format(npy_dir_path))
+    keys = [
+        text_feature_data_field(feature) if feature[TYPE] == TEXT
+        else feature[NAME]
+        for feature in input_features + output_features
+    ]
+    if split_data:
+        keys.append(SPLIT)
+    # memory mapped, rows are only read when batches are gathered
+    dataset = load_npy_dir(npy_dir_path, keys)
+    for output_feature in output_features:
         if 'limit' in output_feature:
+            # the memory mapped labels are read only
             dataset[output_feature[NAME]] = collapse_rare_labels(
-                dataset[output_feature[NAME]],
+                np.array(dataset[output_feature[NAME]]),
                 output_feature['limit']
             )
 
     if not split_data:
-        hdf5_data.close()
         return dataset
 
-    split = hdf5_data[SPLIT][()]
-    hdf5_data.close()
-    training_set, test_set, validation_set = split_dataset_ttv(dataset, split)
+    split = np.asarray(dataset[SPLIT])
+    if np.any(split[1:] < split[:-1]):
+        return split_dataset_ttv(dataset, split)
+    # rows saved by save_npy are sorted by split,
+    # each split is a view of the memory mapped arrays
+    del dataset[SPLIT]
+    bounds = np.searchsorted(split, [0, 1, 2, 3])
+    training_set, validation_set, test_set = [
+        {key: value[start:end] for key, value in dataset.items()}
+        if end > start else None
+        for start, end in zip(bounds[:-1], bounds[1:])
+    ]
+    return training_set, test_set, validation_set
 
-    # shuffle up
-    if shuffle_training:
-        training_set = data_utils.shuffle_dict_unison_inplace(training_set)
 
-    return training_set, test_set, validation_set
+def save_npy(npy_dir_path, data, metadata=None):
+    """
+    Saves the data as a directory of .npy files with the rows sorted by
+    split, so that load_npy can return the splits without copying them.
+    :param npy_dir_path: path to the directory
+    :param data: dictionary of numpy arrays or scipy sparse matrices
+    :param metadata: train set metadata
+    """
+    if SPLIT in data:
+        split = np.asarray(data[SPLIT])
+        if np.any(split[1:] < split[:-1]):
+            order = np.argsort(split, kind='stable')
+            data = {key: value[order] for key, value in data.items()}
+    data_utils.save_npy_dir(npy_dir_path, data, metadata)
+
+
+def save_npy_dirs_metadata(dataset_fps, training_set_metadata):
+    # npy directories also contain the metadata, so that they can be
+    # provided as training data without it
+    for dataset_fp in dataset_fps:
+        npy_dir_path = replace_file_extension(dataset_fp, 'npy')
+        if npy_dir_path is not None and os.path.isdir(npy_dir_path):
+            data_utils.save_npy_dir_metadata(
+                npy_dir_path,
+                training_set_metadata
+            )
+
+
+def get_chunked_data_features(features):
+    """
+    Returns copies of the features of CHUNKED_OUT_OF_CORE_TYPES that do not
+    set in_memory with in_memory False, the other features as they are.
+    The features are not modified.
+    """
+    return [
+        merge_dict(feature, {PREPROCESSING: {'in_memory': False}})
+        if (feature[TYPE] in CHUNKED_OUT_OF_CORE_TYPES and
+            'in_memory' not in feature.get(PREPROCESSING, {}))
+        else feature
+        for feature in features
+    ]
+
+
+def has_out_of_core_features(features, global_preprocessing_parameters):
+    """
+    Returns True if the data of any of the features is not kept in memory
+    and is written to the hdf5 file next to the dataset.
+    """
+    global_preprocessing_parameters = merge_dict(
+        default_preprocessing_parameters,
+        global_preprocessing_parameters
+    )
+    return any(
+        not get_feature_preprocessing_parameters(
+            feature,
+            global_preprocessing_parameters
+        ).get('in_memory', True)
+        for feature in features
+    )
+
+
+def is_chunked_preprocessing(data_format, preprocessing_params):
+    """
+    Returns True if the dataset is preprocessed in chunks of rows, which
+    is supported for csv and parquet data.
+    """
+    return bool(preprocessing_params.get('chunk_size')) and (
+            data_format in CSV_FORMATS or data_format in PARQUET_FORMATS
+    )
+
+
+def get_processed_data_format(preprocessing_params):
+    """
+    Returns the extension of the files the preprocessed data is saved to,
+    hdf5 or npy, according to the processed_data_format parameter.
+    """
+    processed_data_format = preprocessing_params.get(
+        'processed_data_format',
+        default_preprocessing_parameters['processed_data_format']
+    )
+    if processed_data_format in HDF5_FORMATS:
+        return 'hdf5'
+    if processed_data_format in NPY_FORMATS:
+        return 'npy'
+    raise ValueError(
+        'Invalid processed data format {}, valid formats are: {}'.format(
+            processed_data_format,
+            sorted(HDF5_FORMATS | NPY_FORMATS)
+        )
+    )
+
+
+def get_preprocessing_fingerprint(
+        features,
+        global_preprocessing_parameters,
+        random_seed=default_random_seed
+):
+    """
+    Returns the keys of the preprocessing parameters of each feature and of
+    the split, used to detect changes of the preprocessing before reusing
+    the hdf5 and json files with the same name of the dataset.
+    :param features: list of all features (input + output)
+    :param global_preprocessing_parameters: preprocessing parameters
+    :param random_seed: random seed used for splitting
+    :return: dictionary fingerprint
+    """
+    global_preprocessing_parameters = merge_dict(
+        default_preprocessing_parameters,
+        global_preprocessing_parameters
+    )
+    return {
+        'features': {
+            feature[NAME]: PreprocessingCache.get_key(
+                type=feature[TYPE],
+                preprocessing=get_feature_preprocessing_parameters(
+                    feature,
+                    global_preprocessing_parameters
+                )
+            )
+            for feature in features
+        },
+        'split': PreprocessingCache.get_key(
+            force_split=global_preprocessing_parameters['force_split'],
+            split_probabilities=global_preprocessing_parameters[
+                'split_probabilities'
+            ],
+            stratify=global_preprocessing_parameters['stratify'],
+            random_seed=random_seed
+        )
+    }
+
+
+def is_processed_data_current(
+        dataset_fps,
+        features,
+        preprocessing_params,
+        random_seed=None
+):
+    """
+    Checks that the raw data did not change since the hdf5 and json files
+    with the same name of the first dataset file were written and that
+    the features were preprocessed with the same parameters.
+    :param dataset_fps: paths to the raw data files
+    :param features: list of all features (input + output)
+    :param preprocessing_params: preprocessing parameters
+    :param random_seed: random seed used for splitting, the split is not
+           checked if None
+    :return: True if the hdf5 and json files can be reused
+    """
+    metadata = data_utils.load_json(
+        replace_file_extension(dataset_fps[0], 'json')
+    )
+    if metadata.get(DATA_FINGERPRINT) != get_data_fingerprint(dataset_fps):
+        logger.warning(
+            'Found hdf5 and json with the same filename of the dataset, '
+            'but they do not match the current content of the dataset, '
+            'preprocessing it again'
+        )
+        return False
+    processed_fingerprint = metadata.get(PREPROCESSING_FINGERPRINT, {})
+    fingerprint = get_preprocessing_fingerprint(
+        features,
+        preprocessing_params,
+        random_seed=random_seed
+    )
+    for feature in features:
+        if (processed_fingerprint.get('features', {}).get(feature[NAME]) !=
+                fingerprint['features'][feature[NAME]]):
+            logger.warning(
+                'Found hdf5 and json with the same filename of the dataset, '
+                'but feature {} was preprocessed with different parameters, '
+                'preprocessing it again'.format(feature[NAME])
+            )
+            return False
+    if (random_seed is not None and
+            processed_fingerprint.get('split') != fingerprint['split']):
+        logger.warning(
+            'Found hdf5 and json with the same filename of the dataset, '
+            'but they were split with different parameters, '
+            'preprocessing it again'
+        )
+        return False
+    return True
+
+
+def get_preprocessed_features(features, training_set_metadata):
+    """
+    Returns copies of the features with the in_memory flag they were
+    preprocessed with, so that the rows of the features written to the
+    hdf5 file are read from it. The features are not modified.
+    :param features: list of features
+    :param training_set_metadata: train set metadata
+    :return: list of features
+    """
+    preprocessed_features = []
+    for feature in features:
+        in_memory = training_set_metadata.get(feature[NAME], {}).get(
+            PREPROCESSING, {}
+        ).get('in_memory')
+        if in_memory is not None:
+            feature = dict(
+                feature,
+                **{PREPROCESSING: dict(
+                    feature.get(PREPROCESSING, {}),
+                    in_memory=in_memory
+                )}
+            )
+        preprocessed_features.append(feature)
+    return preprocessed_features
 
 
 def load_metadata(metadata_file_path):
@@ -358,42 +1354,76 @@ def preprocess_for_training(
     features = (model_definition['input_features'] +
                 model_definition['output_features'])
 
-    # in case data_format is csv,
-    # check if there's a cached hdf5 file with hte same name,
-    # and in case move on with the hdf5 branch
-    if data_format in CSV_FORMATS:
+    # in case data_format is csv, parquet or feather,
+    # check if there's a cached hdf5 file (or npy directory) with hte same
+    # name, and in case move on with the hdf5 (or npy) branch
+    processed_data_format = get_processed_data_format(preprocessing_params)
+    if data_format in CSV_FORMATS or data_format in COLUMNAR_FORMATS:
         if dataset:
-            if (file_exists_with_diff_extension(dataset, 'hdf5') and
-                    file_exists_with_diff_extension(dataset, 'json')):
+            if (file_exists_with_diff_extension(
+                    dataset, processed_data_format
+            ) and
+                    file_exists_with_diff_extension(dataset, 'json') and
+                    is_processed_data_current(
+                        [dataset],
+                        features,
+                        preprocessing_params,
+                        random_seed=random_seed
+                    )):
                 logger.info(
-                    'Found hdf5 and json with the same filename '
-                    'of the csv, using them instead'
+                    'Found {} and json with the same filename '
+                    'of the dataset, using them instead'.format(
+                        processed_data_format
+                    )
+                )
+                dataset = replace_file_extension(
+                    dataset,
+                    processed_data_format
                 )
-                dataset = replace_file_extension(dataset, 'hdf5')
                 training_set_metadata_fname = replace_file_extension(dataset,
                                                                      'json')
                 training_set_metadata = data_utils.load_json(
                     training_set_metadata_fname)
-                model_definition['data_hdf5_fp'] = dataset
-                data_format = 'hdf5'
+                if processed_data_format in HDF5_FORMATS:
+                    model_definition['data_hdf5_fp'] = dataset
+                data_format = processed_data_format
 
         elif training_set:
-            if (file_exists_with_diff_extension(training_set, 'hdf5') and
-                    file_exists_with_diff_extension(training_set, 'json')):
+            if (file_exists_with_diff_extension(
+                    training_set, processed_data_format
+            ) and
+                    file_exists_with_diff_extension(training_set, 'json') and
+                    is_processed_data_current(
+                        [training_set, validation_set, test_set],
+                        features,
+                        preprocessing_params,
+                        random_seed=random_seed
+                    )):
                 logger.info(
-                    'Found hdf5 and json with the same filename '
-                    'of the csv, using them instead'
+                    'Found {} and json with the same filename '
+                    'of the dataset, using them instead'.format(
+                        processed_data_format
+                    )
+                )
+                training_set = replace_file_extension(
+                    training_set,
+                    processed_data_format
                 )
-                training_set = replace_file_extension(training_set, 'hdf5')
                 training_set_metadata_fname = replace_file_extension(
                     training_set, 'json')
                 training_set_metadata = data_utils.load_json(
                     training_set_metadata_fname)
-                validation_set = replace_file_extension(validation_set,
-                                                        'hdf5')
-                test_set = replace_file_extension(test_set, 'hdf5')
-                model_definition['data_hdf5_fp'] = training_set
-                data_format = 'hdf5'
+                validation_set = replace_file_extension(
+                    validation_set,
+                    processed_data_format
+                )
+                test_set = replace_file_extension(
+                    test_set,
+                    processed_data_format
+                )
+                if processed_data_format in HDF5_FORMATS:
+                    model_definition['data_hdf5_fp'] = training_set
+                data_format = processed_data_format
 
     if data_format in DATAFRAME_FORMATS:
         num_overrides = override_in_memory_flag(
@@ -422,18 +1452,19 @@ def preprocess_for_training(
             random_seed=random_seed
         )
 
-    elif data_format in CSV_FORMATS:
+    elif data_format in CSV_FORMATS or data_format in COLUMNAR_FORMATS:
         (
             training_set,
             test_set,
             validation_set,
             training_set_metadata
-        ) = _preprocess_csv_for_training(
+        ) = _preprocess_file_for_training(
             features,
             dataset,
             training_set,
             validation_set,
             test_set,
+            data_format=data_format,
             training_set_metadata=training_set_metadata,
             skip_save_processed_input=skip_save_processed_input,
             preprocessing_params=preprocessing_params,
@@ -470,13 +1501,42 @@ def preprocess_for_training(
             )
             training_set_metadata[DATA_TRAIN_HDF5_FP] = dataset
 
+        # the batcher shuffles the training set
         training_set, test_set, validation_set = load_hdf5(
             dataset,
             model_definition['input_features'],
-            model_definition['output_features'],
-            shuffle_training=True
+            model_definition['output_features']
         )
 
+    elif data_format in NPY_FORMATS:
+        if training_set_metadata is None:
+            training_set_metadata = load_npy_dir_metadata(
+                dataset or training_set
+            )
+        if not training_set_metadata:
+            raise ValueError('When providing npy data, '
+                             'training_set_metadata must not be None '
+                             'or saved in the npy directory.')
+
+        logger.info('Using memory mapped npy and json')
+
+        if dataset:
+            training_set, test_set, validation_set = load_npy(
+                dataset,
+                model_definition['input_features'],
+                model_definition['output_features']
+            )
+        else:
+            training_set, validation_set, test_set = [
+                load_npy(
+                    npy_dir_path,
+                    model_definition['input_features'],
+                    model_definition['output_features'],
+                    split_data=False
+                ) if npy_dir_path is not None else None
+                for npy_dir_path in [training_set, validation_set, test_set]
+            ]
+
     elif data_format in DICT_FORMATS:
         num_overrides = override_in_memory_flag(
             model_definition['input_features'],
@@ -522,10 +1582,19 @@ def preprocess_for_training(
         [training_set, validation_set, test_set]
     )
 
-    training_dataset = Dataset(
-        training_set,
+    input_features = get_preprocessed_features(
         model_definition['input_features'],
+        training_set_metadata
+    )
+    output_features = get_preprocessed_features(
         model_definition['output_features'],
+        training_set_metadata
+    )
+
+    training_dataset = Dataset(
+        training_set,
+        input_features,
+        output_features,
         training_set_metadata.get(DATA_TRAIN_HDF5_FP)
     )
 
@@ -533,8 +1602,8 @@ def preprocess_for_training(
     if validation_set is not None:
         validation_dataset = Dataset(
             validation_set,
-            model_definition['input_features'],
-            model_definition['output_features'],
+            input_features,
+            output_features,
             training_set_metadata.get(DATA_TRAIN_HDF5_FP)
         )
 
@@ -542,8 +1611,8 @@ def preprocess_for_training(
     if test_set is not None:
         test_dataset = Dataset(
             test_set,
-            model_definition['input_features'],
-            model_definition['output_features'],
+            input_features,
+            output_features,
             training_set_metadata.get(DATA_TRAIN_HDF5_FP)
         )
 
@@ -555,137 +1624,408 @@ def preprocess_for_training(
     )
 
 
-def _preprocess_csv_for_training(
+def _preprocess_file_for_training(
         features,
         dataset=None,
         training_set=None,
         validation_set=None,
         test_set=None,
+        data_format='csv',
         training_set_metadata=None,
         skip_save_processed_input=False,
         preprocessing_params=default_preprocessing_parameters,
         random_seed=default_random_seed
 ):
     """
-    Method to pre-process csv data
+    Method to pre-process csv, parquet and feather data
     :param features: list of all features (input + output)
-    :param dataset: path to the csv data
-    :param training_set:  training csv data
-    :param validation_set: validation csv data
-    :param test_set: test csv data
+    :param dataset: path to the data
+    :param training_set:  training data
+    :param validation_set: validation data
+    :param test_set: test data
+    :param data_format: format of the data files
     :param training_set_metadata: train set metadata
     :param skip_save_processed_input: if False, the pre-processed data is saved
-    as .hdf5 files in the same location as the csvs with the same names.
+    as .hdf5 files in the same location as the data files with the same names.
     :param preprocessing_params: preprocessing parameters
     :param random_seed: random seed
     :return: training, test, validation datasets, training metadata
     """
+    if preprocessing_params.get('chunk_size'):
+        if is_chunked_preprocessing(data_format, preprocessing_params):
+            return _preprocess_file_for_training_chunked(
+                features,
+                dataset,
+                training_set,
+                validation_set,
+                test_set,
+                data_format=data_format,
+                training_set_metadata=training_set_metadata,
+                skip_save_processed_input=skip_save_processed_input,
+                preprocessing_params=preprocessing_params,
+                random_seed=random_seed
+            )
+        logger.warning(
+            'Chunked preprocessing is not supported with {} data format, '
+            'loading the whole dataset'.format(data_format)
+        )
+
+    cache = get_preprocessing_cache(preprocessing_params)
+
     if dataset:
         # Use data and ignore _train, _validation and _test.
         # Also ignore data and train set metadata needs preprocessing
         logger.info(
-            'Using full raw csv, no hdf5 and json file '
-            'with the same name have been found'
+            'Using full raw {}, no hdf5 and json file '
+            'with the same name have been found'.format(data_format)
         )
         logger.info('Building dataset (it may take a while)')
+        dataset_fps = [dataset]
 
-        data, training_set_metadata = build_dataset_csv(
-            dataset,
-            features,
-            preprocessing_params,
-            training_set_metadata=training_set_metadata,
-            random_seed=random_seed
-        )
-
-        if is_on_master() and not skip_save_processed_input:
-            logger.info('Writing prprocessed dataset cache')
-            data_hdf5_fp = replace_file_extension(dataset, 'hdf5')
-            data_utils.save_hdf5(data_hdf5_fp, data, training_set_metadata)
-            training_set_metadata[DATA_TRAIN_HDF5_FP] = data_hdf5_fp
-            logger.info('Writing train set metadata with vocabulary')
-            training_set_metadata_fp = replace_file_extension(dataset, 'json')
-            data_utils.save_json(training_set_metadata_fp,
-                                 training_set_metadata)
-
-        training_set, test_set, validation_set = split_dataset_ttv(
-            data,
-            data[SPLIT]
-        )
+        def read_dataset(columns):
+            return read_dataset_file(dataset, data_format, columns=columns)
 
     elif training_set:
         # use data_train (including _validation and _test if they are present)
         # and ignore data and train set metadata
         # needs preprocessing
         logger.info(
-            'Using training raw csv, no hdf5 and json '
-            'file with the same name have been found'
+            'Using training raw {}, no hdf5 and json '
+            'file with the same name have been found'.format(data_format)
         )
         logger.info('Building dataset (it may take a while)')
+        dataset_fps = [training_set, validation_set, test_set]
 
-        concatenated_df = concatenate_csv(
-            training_set,
-            validation_set,
-            test_set
-        )
-        concatenated_df.csv = training_set
+        def read_dataset(columns):
+            concatenated_df = concatenate_files(
+                training_set,
+                validation_set,
+                test_set,
+                partial(
+                    read_dataset_file,
+                    data_format=data_format,
+                    columns=columns
+                )
+            )
+            concatenated_df.csv = training_set
+            return concatenated_df
+
+    else:
+        raise ValueError('either data or data_train have to be not None')
 
+    # features not kept in memory are written to it while preprocessing
+    data_hdf5_fp = replace_file_extension(dataset_fps[0], 'hdf5')
+    out_of_core = has_out_of_core_features(features, preprocessing_params)
+    if out_of_core and is_on_master() and os.path.isfile(data_hdf5_fp):
+        # the out of core data is appended to the file
+        logger.info('Replacing {}'.format(data_hdf5_fp))
+        os.remove(data_hdf5_fp)
+
+    if cache is not None:
+        data, training_set_metadata = build_dataset_cached(
+            read_dataset,
+            get_data_fingerprint(
+                dataset_fps,
+                checksum=preprocessing_params.get('cache_checksum', False)
+            ),
+            features,
+            preprocessing_params,
+            cache,
+            metadata=training_set_metadata,
+            random_seed=random_seed,
+            data_hdf5_fp=data_hdf5_fp
+        )
+    else:
         data, training_set_metadata = build_dataset_df(
-            concatenated_df,
+            read_dataset(get_dataset_columns(features, preprocessing_params)),
             features,
             preprocessing_params,
             metadata=training_set_metadata,
-            random_seed=random_seed
+            random_seed=random_seed,
+            data_hdf5_fp=data_hdf5_fp
         )
+    if out_of_core and os.path.isfile(data_hdf5_fp):
+        training_set_metadata[DATA_TRAIN_HDF5_FP] = data_hdf5_fp
+
+    save_processed_input = is_on_master() and not skip_save_processed_input
+    processed_data_format = get_processed_data_format(preprocessing_params)
+
+    def save_processed_data(processed_data_fp, processed_data, metadata):
+        if processed_data_format in NPY_FORMATS:
+            # the directory is replaced
+            save_npy(processed_data_fp, processed_data, metadata)
+            return
+        if (os.path.isfile(processed_data_fp) and
+                not (out_of_core and processed_data_fp == data_hdf5_fp)):
+            # processed data of a previous version of the dataset
+            logger.info('Replacing {}'.format(processed_data_fp))
+            os.remove(processed_data_fp)
+        data_utils.save_hdf5(processed_data_fp, processed_data, metadata)
+
+    if save_processed_input:
+        logger.info('Writing prprocessed dataset cache')
+        if processed_data_format in HDF5_FORMATS:
+            training_set_metadata[DATA_TRAIN_HDF5_FP] = data_hdf5_fp
+        if dataset:
+            save_processed_data(
+                replace_file_extension(dataset, processed_data_format),
+                data,
+                training_set_metadata
+            )
+
+    training_data, test_data, validation_data = split_dataset_ttv(
+        data,
+        data[SPLIT]
+    )
 
-        training_set, test_set, validation_set = split_dataset_ttv(
-            data,
-            data[SPLIT]
+    if save_processed_input:
+        if not dataset:
+            for dataset_fp, split_data in zip(
+                    dataset_fps,
+                    [training_data, validation_data, test_data]
+            ):
+                if dataset_fp is not None and split_data is not None:
+                    save_processed_data(
+                        replace_file_extension(
+                            dataset_fp,
+                            processed_data_format
+                        ),
+                        split_data,
+                        training_set_metadata
+                    )
+        # used to detect changes of the raw data and of the preprocessing
+        # before reusing the hdf5 and json files
+        training_set_metadata[DATA_FINGERPRINT] = get_data_fingerprint(
+            dataset_fps
+        )
+        training_set_metadata[
+            PREPROCESSING_FINGERPRINT
+        ] = get_preprocessing_fingerprint(
+            features,
+            preprocessing_params,
+            random_seed=random_seed
+        )
+        logger.info('Writing train set metadata with vocabulary')
+        training_set_metadata_fp = replace_file_extension(
+            dataset_fps[0],
+            'json'
         )
+        data_utils.save_json(training_set_metadata_fp, training_set_metadata)
+        if processed_data_format in NPY_FORMATS:
+            save_npy_dirs_metadata(dataset_fps, training_set_metadata)
 
-        if is_on_master() and not skip_save_processed_input:
-            logger.info('Writing prprocessed dataset cache')
-            data_train_hdf5_fp = replace_file_extension(training_set, 'hdf5')
-            data_utils.save_hdf5(
-                data_train_hdf5_fp,
-                training_set,
-                training_set_metadata
+    return training_data, test_data, validation_data, training_set_metadata
+
+
+def _preprocess_file_for_training_chunked(
+        features,
+        dataset=None,
+        training_set=None,
+        validation_set=None,
+        test_set=None,
+        data_format='csv',
+        training_set_metadata=None,
+        skip_save_processed_input=False,
+        preprocessing_params=default_preprocessing_parameters,
+        random_seed=default_random_seed
+):
+    """
+    Method to pre-process csv and parquet data in chunks of rows, so that
+    peak memory depends on the chunk size rather than on the dataset size.
+    A first pass over the chunks builds the metadata, a second pass builds
+    the data of each chunk and appends it to the hdf5 file next to the
+    dataset. When the processed input is saved, the large features that do
+    not set in_memory are not kept in memory, only the indices of their
+    rows in the hdf5 file are loaded.
+    Parameters are the same as _preprocess_file_for_training.
+    :return: training, test, validation datasets, training metadata
+    """
+    preprocessing_params = merge_dict(
+        default_preprocessing_parameters,
+        preprocessing_params
+    )
+    chunk_size = preprocessing_params['chunk_size']
+    dataset_columns = get_dataset_columns(features, preprocessing_params)
+
+    if dataset:
+        sources = [(dataset, None)]
+        training_set_metadata_fp = replace_file_extension(dataset, 'json')
+    elif training_set:
+        # like concatenate_files, the source file of each row
+        # determines its split unless force_split is set
+        sources = [
+            (dataset_fp, split)
+            for split, dataset_fp in enumerate(
+                [training_set, validation_set, test_set]
             )
-            training_set_metadata[DATA_TRAIN_HDF5_FP] = data_train_hdf5_fp
+            if dataset_fp is not None
+        ]
+        training_set_metadata_fp = replace_file_extension(
+            training_set,
+            'json'
+        )
+    else:
+        raise ValueError('either data or data_train have to be not None')
 
-            if validation_set is not None:
-                data_validation_hdf5_fp = replace_file_extension(
-                    validation_set,
-                    'hdf5'
-                )
-                data_utils.save_hdf5(
-                    data_validation_hdf5_fp,
-                    validation_set,
-                    training_set_metadata
-                )
+    def read_chunks(columns=dataset_columns):
+        for dataset_fp, split in sources:
+            for chunk in read_dataset_chunks(
+                    dataset_fp,
+                    data_format,
+                    chunk_size,
+                    columns=columns
+            ):
+                if split is not None:
+                    chunk[SPLIT] = np.int8(split)
+                yield chunk
 
-            if test_set is not None:
-                data_test_hdf5_fp = replace_file_extension(
-                    test_set,
-                    'hdf5'
-                )
-                data_utils.save_hdf5(
-                    data_test_hdf5_fp,
-                    test_set,
-                    training_set_metadata
+    for feature in features:
+        missing_value_strategy = get_feature_preprocessing_parameters(
+            feature,
+            preprocessing_params
+        )['missing_value_strategy']
+        if missing_value_strategy in ['backfill', 'bfill', 'pad', 'ffill']:
+            logger.warning(
+                'Missing values of feature {} are filled with {} '
+                'within each chunk'.format(
+                    feature[NAME],
+                    missing_value_strategy
                 )
-
-            logger.info('Writing train set metadata with vocabulary')
-            training_set_metadata_fp = replace_file_extension(
-                training_set,
-                'json'
             )
-            data_utils.save_json(
-                training_set_metadata_fp,
-                training_set_metadata,
+
+    logger.info(
+        'Using raw {} in chunks of {} rows, no hdf5 and json file '
+        'with the same name have been found'.format(data_format, chunk_size)
+    )
+    logger.info('Building dataset (it may take a while)')
+    fill_values = get_fill_values_chunked(
+        read_chunks,
+        features,
+        preprocessing_params
+    )
+
+    if training_set_metadata is None:
+        training_set_metadata = build_metadata_chunked(
+            read_chunks,
+            features,
+            preprocessing_params,
+            fill_values=fill_values
+        )
+
+    save_processed_input = is_on_master() and not skip_save_processed_input
+    # chunks are appended to hdf5 files, converted to npy directories
+    # once they are complete
+    save_npy_dirs = (
+            save_processed_input and
+            get_processed_data_format(preprocessing_params) in NPY_FORMATS
+    )
+    dataset_fps = [dataset] if dataset else [
+        training_set,
+        validation_set,
+        test_set
+    ]
+    data_features = features
+    if save_processed_input:
+        data_features = get_chunked_data_features(features)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        def get_hdf5_fp(dataset_fp, name):
+            if (save_processed_input and not save_npy_dirs and
+                    dataset_fp is not None):
+                return replace_file_extension(dataset_fp, 'hdf5')
+            return os.path.join(tmp_dir, name + '.hdf5')
+
+        if dataset:
+            hdf5_fps = [get_hdf5_fp(dataset, 'dataset')]
+        else:
+            hdf5_fps = [
+                get_hdf5_fp(training_set, 'training'),
+                get_hdf5_fp(validation_set, 'validation'),
+                get_hdf5_fp(test_set, 'test')
+            ]
+        # features not kept in memory are appended to it chunk by chunk,
+        # when the processed input is saved it is also the first data file
+        data_hdf5_fp = replace_file_extension(sources[0][0], 'hdf5')
+        out_of_core = has_out_of_core_features(
+            data_features,
+            preprocessing_params
+        )
+        # only the files that are written again are replaced, the chunks
+        # are appended to them
+        rewritten_fps = hdf5_fps + ([data_hdf5_fp] if out_of_core else [])
+        for hdf5_fp in rewritten_fps:
+            if is_on_master() and os.path.isfile(hdf5_fp):
+                logger.info('Replacing {}'.format(hdf5_fp))
+                os.remove(hdf5_fp)
+
+        build_data_chunked(
+            read_chunks,
+            data_features,
+            training_set_metadata,
+            preprocessing_params,
+            hdf5_fps,
+            fill_values=fill_values,
+            random_seed=random_seed,
+            data_hdf5_fp=data_hdf5_fp
+        )
+
+        if not os.path.isfile(hdf5_fps[0]):
+            raise ValueError('No rows of the dataset are left to preprocess')
+
+        if save_npy_dirs:
+            for dataset_fp, hdf5_fp in zip(dataset_fps, hdf5_fps):
+                npy_dir_path = replace_file_extension(dataset_fp, 'npy')
+                if npy_dir_path is not None and os.path.isdir(npy_dir_path):
+                    shutil.rmtree(npy_dir_path)
+                if os.path.isfile(hdf5_fp):
+                    save_npy(npy_dir_path, data_utils.load_hdf5(hdf5_fp))
+            load_processed_data = load_npy
+            processed_data_fps = [
+                replace_file_extension(dataset_fp, 'npy')
+                for dataset_fp in dataset_fps
+            ]
+        else:
+            load_processed_data = load_hdf5
+            processed_data_fps = hdf5_fps
+
+        if dataset:
+            training_set, test_set, validation_set = load_processed_data(
+                processed_data_fps[0],
+                data_features,
+                [],
+                split_data=True
             )
+        else:
+            training_set, validation_set, test_set = [
+                load_processed_data(
+                    processed_data_fp,
+                    data_features,
+                    [],
+                    split_data=False
+                )
+                if processed_data_fp is not None and
+                   os.path.exists(processed_data_fp) else None
+                for processed_data_fp in processed_data_fps
+            ]
 
-    else:
-        raise ValueError('either data or data_train have to be not None')
+    if out_of_core and os.path.isfile(data_hdf5_fp):
+        training_set_metadata[DATA_TRAIN_HDF5_FP] = data_hdf5_fp
+    if save_processed_input:
+        if not save_npy_dirs:
+            training_set_metadata[DATA_TRAIN_HDF5_FP] = hdf5_fps[0]
+        training_set_metadata[DATA_FINGERPRINT] = get_data_fingerprint(
+            dataset_fps
+        )
+        training_set_metadata[
+            PREPROCESSING_FINGERPRINT
+        ] = get_preprocessing_fingerprint(
+            features,
+            preprocessing_params,
+            random_seed=random_seed
+        )
+        logger.info('Writing train set metadata with vocabulary')
+        data_utils.save_json(training_set_metadata_fp, training_set_metadata)
+        if save_npy_dirs:
+            save_npy_dirs_metadata(dataset_fps, training_set_metadata)
 
     return training_set, test_set, validation_set, training_set_metadata
 
@@ -764,9 +2104,10 @@ def preprocess_for_prediction(
         data_format = figure_data_format(dataset)
 
     # manage the in_memory parameter
-    if data_format not in HDF5_FORMATS:
+    if data_format not in HDF5_FORMATS and data_format not in NPY_FORMATS:
         num_overrides = override_in_memory_flag(
-            model_definition['input_features'],
+            model_definition['input_features'] +
+            model_definition['output_features'],
             True
         )
         if num_overrides > 0:
@@ -792,19 +2133,30 @@ def preprocess_for_prediction(
         output_features += model_definition['output_features']
     features = model_definition['input_features'] + output_features
 
-    # in case data_format is csv,
-    # check if there's a cached hdf5 file with hte same name,
-    # and in case move on with the hdf5 branch
-    if data_format in CSV_FORMATS:
-        if (file_exists_with_diff_extension(dataset, 'hdf5') and
-                file_exists_with_diff_extension(dataset, 'json')):
+    # in case data_format is csv, parquet or feather,
+    # check if there's a cached hdf5 file (or npy directory) with hte same
+    # name, and in case move on with the hdf5 (or npy) branch
+    if data_format in CSV_FORMATS or data_format in COLUMNAR_FORMATS:
+        processed_data_format = get_processed_data_format(
+            preprocessing_params
+        )
+        if (file_exists_with_diff_extension(dataset, processed_data_format)
+                and file_exists_with_diff_extension(dataset, 'json') and
+                is_processed_data_current(
+                    [dataset],
+                    features,
+                    preprocessing_params
+                )):
             logger.info(
-                'Found hdf5 and json with the same filename '
-                'of the csv, using them instead'
+                'Found {} and json with the same filename '
+                'of the dataset, using them instead'.format(
+                    processed_data_format
+                )
             )
-            dataset = replace_file_extension(dataset, 'hdf5')
-            model_definition['data_hdf5_fp'] = dataset
-            data_format = 'hdf5'
+            dataset = replace_file_extension(dataset, processed_data_format)
+            if processed_data_format in HDF5_FORMATS:
+                model_definition['data_hdf5_fp'] = dataset
+            data_format = processed_data_format
 
     if data_format in DATAFRAME_FORMATS:
         dataset, training_set_metadata = build_dataset_df(
@@ -822,6 +2174,15 @@ def preprocess_for_prediction(
             training_set_metadata=training_set_metadata
         )
 
+    elif data_format in COLUMNAR_FORMATS:
+        dataset, training_set_metadata = build_dataset_columnar(
+            dataset,
+            features,
+            preprocessing_params,
+            training_set_metadata=training_set_metadata,
+            data_format=data_format
+        )
+
     elif data_format in HDF5_FORMATS:
         hdf5_fp = dataset
         dataset = load_hdf5(
@@ -831,6 +2192,18 @@ def preprocess_for_prediction(
             split_data=False, shuffle_training=False
         )
 
+    elif data_format in NPY_FORMATS:
+        # the rows of features not kept in memory are in the hdf5 file
+        # the directory was preprocessed with
+        npy_dir_metadata = load_npy_dir_metadata(dataset) or {}
+        hdf5_fp = npy_dir_metadata.get(DATA_TRAIN_HDF5_FP)
+        dataset = load_npy(
+            dataset,
+            model_definition['input_features'],
+            output_features,
+            split_data=False
+        )
+
     elif data_format in DICT_FORMATS:
         dataset, training_set_metadata = build_dataset_df(
             pd.DataFrame(dataset),
@@ -868,7 +2241,7 @@ def replace_text_feature_level(features, datasets):
                             feature['level']
                         )
                     ]
-                    for level in ('word', 'char'):
+                    for level in TEXT_LEVELS:
                         name_level = '{}_{}'.format(
                             feature[NAME],
                             level)
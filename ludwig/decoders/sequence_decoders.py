@@ -27,6 +27,7 @@ from tensorflow_addons.seq2seq import LuongAttention
 from ludwig.constants import *
 from ludwig.modules.reduction_modules import SequenceReducer
 from ludwig.utils.misc_utils import get_from_registry
+from ludwig.utils.tf_utils import get_compute_dtype
 from ludwig.utils.tf_utils import sequence_length_3D, sequence_length_2D
 
 logger = logging.getLogger(__name__)
@@ -286,7 +287,7 @@ class SequenceGeneratorDecoder(Layer):
             encoder_end_state=None
     ):
         # ================ Setup ================
-        batch_size = encoder_output.shape[0]
+        batch_size = tf.shape(encoder_output)[0]
 
         # Prepare target for decoding
         target_sequence_length = sequence_length_2D(target)
@@ -315,7 +316,7 @@ class SequenceGeneratorDecoder(Layer):
         decoder_initial_state = self.build_decoder_initial_state(
             batch_size,
             encoder_state=encoder_end_state,
-            dtype=tf.float32
+            dtype=get_compute_dtype(self)
         )
 
         decoder = tfa.seq2seq.BasicDecoder(
@@ -356,11 +357,11 @@ class SequenceGeneratorDecoder(Layer):
             training=None
     ):
         # ================ Setup ================
-        batch_size = encoder_output.shape[0]
+        batch_size = tf.shape(encoder_output)[0]
         encoder_sequence_length = sequence_length_3D(encoder_output)
 
         # ================ predictions =================
-        decoder_input = tf.expand_dims([self.GO_SYMBOL] * batch_size, 1)
+        decoder_input = tf.fill([batch_size, 1], self.GO_SYMBOL)
         start_tokens = tf.fill([batch_size], self.GO_SYMBOL)
         end_token = self.END_SYMBOL
         decoder_inp_emb = self.decoder_embedding(decoder_input)
@@ -391,7 +392,7 @@ class SequenceGeneratorDecoder(Layer):
         decoder_initial_state = self.build_decoder_initial_state(
             batch_size * self.beam_width,
             encoder_state=tiled_encoder_end_state,
-            dtype=tf.float32
+            dtype=get_compute_dtype(self)
         )
 
         decoder = tfa.seq2seq.beam_search_decoder.BeamSearchDecoder(
@@ -429,6 +430,7 @@ class SequenceGeneratorDecoder(Layer):
         probabilities = extract_sequence_probabilities(
             decoder_output, self.beam_width, sequence_id=sequence_id
         )
+        probabilities = tf.cast(probabilities, tf.float32)
 
         seq_len_diff = self.max_sequence_length - tf.shape(predictions)[1]
         if seq_len_diff > 0:
@@ -459,12 +461,12 @@ class SequenceGeneratorDecoder(Layer):
             training=None
     ):
         # ================ Setup ================
-        batch_size = encoder_output.shape[0]
+        batch_size = tf.shape(encoder_output)[0]
 
         # ================ predictions =================
         greedy_sampler = tfa.seq2seq.GreedyEmbeddingSampler()
 
-        decoder_input = tf.expand_dims([self.GO_SYMBOL] * batch_size, 1)
+        decoder_input = tf.fill([batch_size, 1], self.GO_SYMBOL)
         start_tokens = tf.fill([batch_size], self.GO_SYMBOL)
         end_token = self.END_SYMBOL
         decoder_inp_emb = self.decoder_embedding(decoder_input)
@@ -479,7 +481,7 @@ class SequenceGeneratorDecoder(Layer):
         decoder_initial_state = self.build_decoder_initial_state(
             batch_size,
             encoder_state=encoder_end_state,
-            dtype=tf.float32
+            dtype=get_compute_dtype(self)
         )
 
         decoder = tfa.seq2seq.BasicDecoder(
@@ -513,8 +515,9 @@ class SequenceGeneratorDecoder(Layer):
                 predictions,
                 [[0, 0], [0, seq_len_diff]]
             )
+        # the softmax is computed in float32
         logits = tf.pad(
-            decoder_output.rnn_output,
+            tf.cast(decoder_output.rnn_output, tf.float32),
             [[0, 0], [0, seq_len_diff], [0, 0]]
         )
 
@@ -554,6 +557,12 @@ class SequenceGeneratorDecoder(Layer):
 
     # this should be used only for decoder inference
     def call(self, inputs, training=None, mask=None):
+        # called directly for inference, the inputs are not autocast
+        inputs = tf.nest.map_structure(
+            lambda x: tf.cast(x, get_compute_dtype(self))
+            if x.dtype.is_floating else x,
+            inputs
+        )
         # shape [batch_size, seq_size, state_size]
         encoder_output = inputs['hidden']
         # form dependent on cell_type
@@ -767,7 +776,8 @@ class SequenceTaggerDecoder(Layer):
             training=None
     ):
         outputs = self.call(inputs, training=training)
-        logits = outputs[LOGITS]
+        # the softmax is computed in float32
+        logits = tf.cast(outputs[LOGITS], tf.float32)
         input_sequence_lengths = inputs[
             LENGTHS]  # retrieve input sequence length
 
@@ -22,6 +22,7 @@ from tensorflow.keras.layers import Layer
 
 from ludwig.modules.embedding_modules import Embed
 from ludwig.modules.fully_connected_modules import FCStack
+from ludwig.utils.tf_utils import get_compute_dtype
 
 logger = logging.getLogger(__name__)
 
@@ -287,10 +288,14 @@ class DateEmbed(Layer):
             mask=mask
         )
 
+        # computed in float32, the seconds of the day overflow float16
         periodic_second_of_day = tf.sin(
             tf.cast(input_vector[:, 8:9], dtype=tf.float32)
             * (2 * math.pi / 86400)
         )
+        periodic_second_of_day = tf.cast(
+            periodic_second_of_day, get_compute_dtype(self)
+        )
 
         hidden = tf.concat(
             [scaled_year, embedded_month, embedded_day,
@@ -439,12 +444,16 @@ class DateWave(Layer):
             input_vector[:, 8:9] * (2 * math.pi / 86400)
         )
 
-        hidden = tf.concat(
-            [scaled_year, periodic_month, periodic_day,
+        # computed in float32, the seconds of the day overflow float16
+        periodic = tf.concat(
+            [periodic_month, periodic_day,
              periodic_weekday, periodic_yearday,
              periodic_hour, periodic_minute, periodic_second,
              periodic_second_of_day],
             axis=1)
+        hidden = tf.concat(
+            [scaled_year, tf.cast(periodic, get_compute_dtype(self))],
+            axis=1)
 
         # ================ FC Stack ================
         # logger.debug('  flatten hidden: {0}'.format(hidden))
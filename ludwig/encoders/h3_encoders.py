@@ -235,7 +235,7 @@ class H3Embed(Layer):
         mask = tf.cast(
             tf.expand_dims(tf.sequence_mask(resolution, 15),
                            -1),
-            dtype=tf.float32
+            dtype=embedded_cells.dtype
         )
         masked_embedded_cells = embedded_cells * mask
 
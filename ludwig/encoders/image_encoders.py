@@ -130,7 +130,7 @@ class Stacked2DCNN(Layer):
             inputs,
             training,
         )
-        hidden = tf.reshape(hidden, [hidden.shape[0], -1])
+        hidden = tf.reshape(hidden, [-1, hidden.shape[1:].num_elements()])
 
         # ================ Fully Connected ================
         outputs = self.fc_stack(hidden)
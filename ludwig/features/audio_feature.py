@@ -278,40 +278,39 @@ class AudioFeatureMixin(object):
             'max_length_in_s': audio_file_length_limit_in_s
         }
 
-        if feature['preprocessing']['in_memory']:
-            dataset[feature[NAME]] = np.empty(
-                (num_audio_utterances, max_length, feature_dim),
-                dtype=np.float32
+        dataset[feature[NAME]] = np.empty(
+            (num_audio_utterances, max_length, feature_dim),
+            dtype=np.float32
+        )
+        for i, path in enumerate(dataset_df[feature[NAME]]):
+            filepath = get_abs_path(
+                csv_path,
+                path
+            )
+            audio_feature = AudioFeatureMixin._read_audio_and_transform_to_feature(
+                filepath, audio_feature_dict, feature_dim, max_length,
+                padding_value, normalization_type, audio_stats
             )
-            for i, path in enumerate(dataset_df[feature[NAME]]):
-                filepath = get_abs_path(
-                    csv_path,
-                    path
-                )
-                audio_feature = AudioFeatureMixin._read_audio_and_transform_to_feature(
-                    filepath, audio_feature_dict, feature_dim, max_length,
-                    padding_value, normalization_type, audio_stats
-                )
-
-                dataset[feature[NAME]][i, :, :] = audio_feature
-
-            audio_stats['std'] = np.sqrt(
-                audio_stats['var'] / float(audio_stats['count']))
-            print_statistics = (
-                "{} audio files loaded.\n"
-                "Statistics of audio file lengths:\n"
-                "- mean: {:.4f}\n"
-                "- std: {:.4f}\n"
-                "- max: {:.4f}\n"
-                "- min: {:.4f}\n"
-                "- cropped audio_files: {}\n"
-                "Max length was given as {}s"
-            ).format(
-                audio_stats['count'], audio_stats['mean'],
-                audio_stats['std'], audio_stats['max'],
-                audio_stats['min'], audio_stats['cropped'],
-                audio_stats['max_length_in_s'])
-            logger.debug(print_statistics)
+
+            dataset[feature[NAME]][i, :, :] = audio_feature
+
+        audio_stats['std'] = np.sqrt(
+            audio_stats['var'] / float(audio_stats['count']))
+        print_statistics = (
+            "{} audio files loaded.\n"
+            "Statistics of audio file lengths:\n"
+            "- mean: {:.4f}\n"
+            "- std: {:.4f}\n"
+            "- max: {:.4f}\n"
+            "- min: {:.4f}\n"
+            "- cropped audio_files: {}\n"
+            "Max length was given as {}s"
+        ).format(
+            audio_stats['count'], audio_stats['mean'],
+            audio_stats['std'], audio_stats['max'],
+            audio_stats['min'], audio_stats['cropped'],
+            audio_stats['max_length_in_s'])
+        logger.debug(print_statistics)
 
     @staticmethod
     def _get_max_length_feature(
@@ -15,7 +15,6 @@
 # limitations under the License.
 # ==============================================================================
 import logging
-from collections import Counter
 
 import numpy as np
 import tensorflow as tf
@@ -23,9 +22,10 @@ import tensorflow as tf
 from ludwig.constants import *
 from ludwig.encoders.bag_encoders import BagEmbedWeightedEncoder
 from ludwig.features.base_feature import InputFeature
-from ludwig.features.feature_utils import set_str_to_idx
+from ludwig.features.feature_utils import build_sparse_set_matrix
 from ludwig.utils.misc_utils import set_default_value
-from ludwig.utils.strings_utils import create_vocabulary, UNKNOWN_SYMBOL
+from ludwig.utils.strings_utils import create_vocabulary, count_units, \
+    UNKNOWN_SYMBOL
 
 logger = logging.getLogger(__name__)
 
@@ -43,11 +43,35 @@ class BagFeatureMixin(object):
 
     @staticmethod
     def get_feature_meta(column, preprocessing_parameters):
-        idx2str, str2idx, str2freq, max_size, _, _, _ = create_vocabulary(
+        return BagFeatureMixin.get_feature_meta_from_stats(
+            BagFeatureMixin.update_feature_stats(
+                None, column, preprocessing_parameters
+            ),
+            preprocessing_parameters
+        )
+
+    @staticmethod
+    def update_feature_stats(stats, column, preprocessing_parameters):
+        if stats is None:
+            stats = {'unit_counts': None, 'max_length': 0}
+        stats['unit_counts'], stats['max_length'] = count_units(
             column,
             preprocessing_parameters['tokenizer'],
+            lowercase=preprocessing_parameters['lowercase'],
+            unit_counts=stats['unit_counts'],
+            max_line_length=stats['max_length']
+        )
+        return stats
+
+    @staticmethod
+    def get_feature_meta_from_stats(stats, preprocessing_parameters):
+        idx2str, str2idx, str2freq, max_size, _, _, _ = create_vocabulary(
+            None,
+            preprocessing_parameters['tokenizer'],
             num_most_frequent=preprocessing_parameters['most_common'],
-            lowercase=preprocessing_parameters['lowercase']
+            lowercase=preprocessing_parameters['lowercase'],
+            unit_counts=stats['unit_counts'],
+            max_line_length=stats['max_length']
         )
         return {
             'idx2str': idx2str,
@@ -59,23 +83,13 @@ class BagFeatureMixin(object):
 
     @staticmethod
     def feature_data(column, metadata, preprocessing_parameters):
-        bag_matrix = np.zeros(
-            (len(column),
-             len(metadata['str2idx'])),
-            dtype=np.float32
+        return build_sparse_set_matrix(
+            column,
+            metadata['str2idx'],
+            preprocessing_parameters['tokenizer'],
+            np.float32
         )
 
-        for i, set_str in enumerate(column):
-            col_counter = Counter(set_str_to_idx(
-                set_str,
-                metadata['str2idx'],
-                preprocessing_parameters['tokenizer'])
-            )
-            bag_matrix[i, list(col_counter.keys())] = list(
-                col_counter.values())
-
-        return bag_matrix
-
     @staticmethod
     def add_feature_data(
             feature,
@@ -85,7 +99,7 @@ class BagFeatureMixin(object):
             preprocessing_parameters=None
     ):
         dataset[feature[NAME]] = BagFeatureMixin.feature_data(
-            dataset_df[feature[NAME]].astype(str),
+            dataset_df[feature[NAME]],
             metadata[feature[NAME]],
             preprocessing_parameters
         )
@@ -93,6 +107,7 @@ class BagFeatureMixin(object):
 
 class BagInputFeature(BagFeatureMixin, InputFeature):
     encoder = 'embed'
+    vocab = []
 
     def __init__(self, feature, encoder_obj=None):
         super().__init__(feature)
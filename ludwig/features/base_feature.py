@@ -37,8 +37,8 @@ class BaseFeature(object):
     pattern.
     """
 
-    def __init__(self, feature, *args, **kwargs):
-        super().__init__()
+    def __init__(self, feature, *args, dtype=None, **kwargs):
+        super().__init__(dtype=dtype)
 
         if NAME not in feature:
             raise ValueError('Missing feature name')
@@ -64,7 +64,9 @@ class InputFeature(BaseFeature, tf.keras.Model, ABC):
     """Parent class for all input features."""
 
     def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
+        # inputs keep the dtype they are cast to by the model, with a mixed
+        # precision policy the encoders cast them to the compute dtype
+        super().__init__(*args, dtype='float32', **kwargs)
 
     def create_input(self):
         return tf.keras.Input(shape=self.get_input_shape(),
@@ -353,7 +355,8 @@ class OutputFeature(BaseFeature, tf.keras.Model, ABC):
                         )
                         tiled_representation = tf.multiply(
                             tiled_representation,
-                            tf.cast(mask[:, :, tf.newaxis], dtype=tf.float32)
+                            tf.cast(mask[:, :, tf.newaxis],
+                                    dtype=tiled_representation.dtype)
                         )
 
                         dependencies_hidden.append(tiled_representation)
@@ -419,7 +422,7 @@ class OutputFeature(BaseFeature, tf.keras.Model, ABC):
 
         # reshape back to original first and second dimension
         if len(original_feature_hidden.shape) > 2:
-            sequence_length = original_feature_hidden.shape[1]
+            sequence_length = tf.shape(original_feature_hidden)[1]
             feature_hidden = tf.reshape(
                 feature_hidden,
                 [-1, sequence_length, feature_hidden_size]
@@ -16,8 +16,10 @@
 # ==============================================================================
 import logging
 import os
+from collections import Counter
 
 import numpy as np
+import pandas as pd
 import tensorflow as tf
 
 from ludwig.constants import *
@@ -55,11 +57,40 @@ class CategoryFeatureMixin(object):
 
     @staticmethod
     def get_feature_meta(column, preprocessing_parameters):
+        return CategoryFeatureMixin.get_feature_meta_from_stats(
+            CategoryFeatureMixin.update_feature_stats(
+                None, column, preprocessing_parameters
+            ),
+            preprocessing_parameters
+        )
+
+    @staticmethod
+    def update_feature_stats(stats, column, preprocessing_parameters):
+        if stats is None:
+            stats = {'unit_counts': None, 'max_length': 0}
+        if stats['unit_counts'] is None:
+            stats['unit_counts'] = Counter()
+        # count the unique values once instead of tokenizing each row,
+        # the order of appearance is kept to break ties like before
+        codes, uniques = pd.factorize(column)
+        counts = np.bincount(codes, minlength=len(uniques))
+        if preprocessing_parameters['lowercase']:
+            uniques = [unique.lower() for unique in uniques]
+        for unique, count in zip(uniques, counts):
+            stats['unit_counts'][unique.strip()] += int(count)
+        if len(column) > 0:
+            stats['max_length'] = 1
+        return stats
+
+    @staticmethod
+    def get_feature_meta_from_stats(stats, preprocessing_parameters):
         idx2str, str2idx, str2freq, _, _, _, _ = create_vocabulary(
-            column, 'stripped',
+            None, 'stripped',
             num_most_frequent=preprocessing_parameters['most_common'],
             lowercase=preprocessing_parameters['lowercase'],
-            add_padding=False
+            add_padding=False,
+            unit_counts=stats['unit_counts'],
+            max_line_length=stats['max_length']
         )
         return {
             'idx2str': idx2str,
@@ -70,16 +101,16 @@ class CategoryFeatureMixin(object):
 
     @staticmethod
     def feature_data(column, metadata):
-        return np.array(
-            column.map(
-                lambda x: (
-                    metadata['str2idx'][x.strip()]
-                    if x.strip() in metadata['str2idx']
-                    else metadata['str2idx'][UNKNOWN_SYMBOL]
-                )
-            ),
+        codes, uniques = pd.factorize(column)
+        unknown_idx = metadata['str2idx'][UNKNOWN_SYMBOL]
+        uniques_idx = np.array(
+            [
+                metadata['str2idx'].get(unique.strip(), unknown_idx)
+                for unique in uniques
+            ],
             dtype=int_type(metadata['vocab_size'])
         )
+        return uniques_idx[codes]
 
     @staticmethod
     def add_feature_data(
@@ -90,7 +121,7 @@ class CategoryFeatureMixin(object):
             preprocessing_parameters=None
     ):
         dataset[feature[NAME]] = CategoryFeatureMixin.feature_data(
-            dataset_df[feature[NAME]].astype(str),
+            dataset_df[feature[NAME]],
             metadata[feature[NAME]]
         )
 
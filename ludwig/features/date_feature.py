@@ -19,6 +19,7 @@ from datetime import date
 from datetime import datetime
 
 import numpy as np
+import pandas as pd
 import tensorflow as tf
 from dateutil.parser import parse
 
@@ -92,6 +93,62 @@ class DateFeatureMixin(object):
             second_of_day
         ]
 
+    @staticmethod
+    def dates_to_matrix(column, datetime_format, preprocessing_parameters):
+        """
+        Same as date_to_list applied to each row of column, but parses the
+        whole column at once and extracts the date components as array
+        operations. Values that cannot be parsed in bulk, like dates out
+        of the range of numpy datetimes, go through date_to_list.
+        """
+        try:
+            datetimes = pd.to_datetime(
+                pd.Series(column).reset_index(drop=True),
+                format=datetime_format,
+                errors='coerce'
+            )
+        except (ValueError, TypeError, OverflowError):
+            datetimes = None
+        if datetimes is None or not pd.api.types.is_datetime64_any_dtype(
+                datetimes
+        ):
+            # for instance dates with different timezones
+            return np.array(
+                [
+                    DateFeatureMixin.date_to_list(
+                        date_str, datetime_format, preprocessing_parameters
+                    )
+                    for date_str in column
+                ],
+                dtype=np.int64
+            ).reshape(-1, DATE_VECTOR_LENGTH)
+
+        date_matrix = np.stack(
+            [
+                datetimes.dt.year,
+                datetimes.dt.month,
+                datetimes.dt.day,
+                datetimes.dt.weekday,
+                datetimes.dt.dayofyear,
+                datetimes.dt.hour,
+                datetimes.dt.minute,
+                datetimes.dt.second,
+                (datetimes.dt.hour * 3600 +
+                 datetimes.dt.minute * 60 +
+                 datetimes.dt.second)
+            ],
+            axis=1
+        )
+
+        unparsed = np.flatnonzero(datetimes.isna().values)
+        if len(unparsed) > 0:
+            column = np.asarray(column)
+            for i in unparsed:
+                date_matrix[i] = DateFeatureMixin.date_to_list(
+                    column[i], datetime_format, preprocessing_parameters
+                )
+        return date_matrix.astype(np.int64)
+
     @staticmethod
     def add_feature_data(
             feature,
@@ -100,14 +157,11 @@ class DateFeatureMixin(object):
             metadata,
             preprocessing_parameters=None
     ):
-        datetime_format = preprocessing_parameters['datetime_format']
-        dates_to_lists = [
-            np.array(DateFeatureMixin.date_to_list(
-                row, datetime_format, preprocessing_parameters
-            ))
-            for row in dataset_df[feature[NAME]]
-        ]
-        dataset[feature[NAME]] = np.array(dates_to_lists, dtype=np.int16)
+        dataset[feature[NAME]] = DateFeatureMixin.dates_to_matrix(
+            dataset_df[feature[NAME]],
+            preprocessing_parameters['datetime_format'],
+            preprocessing_parameters
+        ).astype(np.int16)
 
 
 class DateInputFeature(DateFeatureMixin, InputFeature):
@@ -14,11 +14,15 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # ==============================================================================
+from itertools import chain
+
 import numpy as np
+from scipy import sparse
 
 from ludwig.constants import SEQUENCE
 from ludwig.constants import TEXT
 from ludwig.constants import TIMESERIES
+from ludwig.utils.misc_utils import get_from_registry
 from ludwig.utils.strings_utils import UNKNOWN_SYMBOL
 from ludwig.utils.strings_utils import tokenizer_registry
 
@@ -45,3 +49,42 @@ def set_str_to_idx(set_string, feature_dict, tokenizer_name):
            tokenizer(set_string)]
 
     return np.array(out, dtype=np.int32)
+
+
+def build_sparse_set_matrix(column, feature_dict, tokenizer_name, dtype):
+    """
+    Builds a CSR matrix with a row for each string of column and a column
+    for each unit of feature_dict, containing the number of times each unit
+    appears in the string converted to dtype. Only the units present in
+    each row are stored.
+    :param column: iterable of strings
+    :param feature_dict: dictionary mapping units to their index
+    :param tokenizer_name: name of the tokenizer splitting strings in units
+    :param dtype: dtype of the matrix
+    :return: scipy CSR matrix of shape (len(column), len(feature_dict))
+    """
+    tokenizer = get_from_registry(tokenizer_name, tokenizer_registry)()
+
+    unknown_idx = feature_dict[UNKNOWN_SYMBOL]
+    rows_indices = [
+        [feature_dict.get(item, unknown_idx) for item in tokenizer(string)]
+        for string in column
+    ]
+    indptr = np.zeros(len(rows_indices) + 1, dtype=np.int64)
+    np.cumsum(
+        np.fromiter(map(len, rows_indices), dtype=np.int64),
+        out=indptr[1:]
+    )
+    indices = np.fromiter(
+        chain.from_iterable(rows_indices),
+        dtype=np.int32,
+        count=indptr[-1]
+    )
+
+    matrix = sparse.csr_matrix(
+        (np.ones(len(indices), dtype=np.float32), indices, indptr),
+        shape=(len(rows_indices), len(feature_dict))
+    )
+    # repeated units of a row are summed into their count
+    matrix.sum_duplicates()
+    return matrix.astype(dtype)
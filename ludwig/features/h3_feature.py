@@ -16,13 +16,13 @@
 # ==============================================================================
 import logging
 
-import numpy as np
 import tensorflow as tf
 
 from ludwig.constants import *
 from ludwig.encoders.h3_encoders import H3Embed, H3WeightedSum, H3RNN
 from ludwig.features.base_feature import InputFeature
 from ludwig.utils.h3_util import h3_to_components
+from ludwig.utils.h3_util import h3_to_components_array
 from ludwig.utils.misc_utils import set_default_value
 
 logger = logging.getLogger(__name__)
@@ -69,8 +69,11 @@ class H3FeatureMixin(object):
         column = dataset_df[feature[NAME]]
         if column.dtype == object:
             column = column.map(int)
-        column = column.map(H3FeatureMixin.h3_to_list)
-        dataset[feature[NAME]] = np.array(column.tolist(), dtype=np.uint8)
+        dataset[feature[NAME]] = h3_to_components_array(
+            column.values,
+            MAX_H3_RESOLUTION,
+            H3_PADDING_VALUE
+        )
 
 
 class H3InputFeature(H3FeatureMixin, InputFeature):
@@ -20,7 +20,6 @@ import sys
 from functools import partial
 from multiprocessing import Pool
 
-import h5py
 import numpy as np
 import tensorflow as tf
 
@@ -284,58 +283,37 @@ class ImageFeatureMixin(object):
         all_file_paths = [get_abs_path(csv_path, file_path)
                           for file_path in dataset_df[feature[NAME]]]
 
-        if feature['preprocessing']['in_memory']:
-            # Number of processes to run in parallel for preprocessing
-            num_processes = feature['preprocessing']['num_processes']
-            metadata[feature[NAME]]['preprocessing'][
-                'num_processes'] = num_processes
-
-            dataset[feature[NAME]] = np.empty(
-                (num_images, height, width, num_channels),
-                dtype=np.uint8
-            )
-            # Split the dataset into pools only if we have an explicit request to use
-            # multiple processes. In case we have multiple input images use the
-            # standard code anyway.
-            if num_processes > 1 or num_images > 1:
-                with Pool(num_processes) as pool:
-                    logger.debug(
-                        'Using {} processes for preprocessing images'.format(
-                            num_processes
-                        )
-                    )
-                    dataset[feature[NAME]] = np.array(
-                        pool.map(read_image_and_resize, all_file_paths)
-                    )
+        # Number of processes to run in parallel for preprocessing
+        num_processes = feature['preprocessing']['num_processes']
+        metadata[feature[NAME]]['preprocessing'][
+            'num_processes'] = num_processes
 
-            else:
-                # If we're not running multiple processes and we are only processing one
-                # image just use this faster shortcut, bypassing multiprocessing.Pool.map
+        dataset[feature[NAME]] = np.empty(
+            (num_images, height, width, num_channels),
+            dtype=np.uint8
+        )
+        # Split the dataset into pools only if we have an explicit request to use
+        # multiple processes. In case we have multiple input images use the
+        # standard code anyway.
+        if num_processes > 1 or num_images > 1:
+            with Pool(num_processes) as pool:
                 logger.debug(
-                    'No process pool initialized. Using one process for preprocessing images'
+                    'Using {} processes for preprocessing images'.format(
+                        num_processes
+                    )
                 )
-                img = read_image_and_resize(all_file_paths[0])
-                dataset[feature[NAME]] = np.array([img])
-        else:
-            data_fp = os.path.splitext(dataset_df.csv)[0] + '.hdf5'
-            mode = 'w'
-            if os.path.isfile(data_fp):
-                mode = 'r+'
-
-            with h5py.File(data_fp, mode) as h5_file:
-                # todo future add multiprocessing/multithreading
-                image_dataset = h5_file.create_dataset(
-                    feature[NAME] + '_data',
-                    (num_images, height, width, num_channels),
-                    dtype=np.uint8
+                dataset[feature[NAME]] = np.array(
+                    pool.map(read_image_and_resize, all_file_paths)
                 )
-                for i, filepath in enumerate(all_file_paths):
-                    image_dataset[i, :height, :width, :] = (
-                        read_image_and_resize(filepath)
-                    )
-                h5_file.flush()
 
-            dataset[feature[NAME]] = np.arange(num_images)
+        else:
+            # If we're not running multiple processes and we are only processing one
+            # image just use this faster shortcut, bypassing multiprocessing.Pool.map
+            logger.debug(
+                'No process pool initialized. Using one process for preprocessing images'
+            )
+            img = read_image_and_resize(all_file_paths[0])
+            dataset[feature[NAME]] = np.array([img])
 
 
 class ImageInputFeature(ImageFeatureMixin, InputFeature):
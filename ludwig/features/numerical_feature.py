@@ -70,6 +70,57 @@ class NumericalFeatureMixin(object):
         else:
             return {}
 
+    @staticmethod
+    def update_feature_stats(stats, column, preprocessing_parameters):
+        if stats is None:
+            stats = {}
+        values = column.astype(np.float64)
+        if len(values) == 0:
+            return stats
+
+        normalization = preprocessing_parameters['normalization']
+        if normalization == 'zscore':
+            # merge count, mean and sum of squared deviations
+            # with the parallel variance algorithm
+            count = len(values)
+            mean = values.mean()
+            m2 = ((values - mean) ** 2).sum()
+            if not stats:
+                stats.update({'count': count, 'mean': mean, 'm2': m2})
+            else:
+                total = stats['count'] + count
+                delta = mean - stats['mean']
+                stats['mean'] += delta * count / total
+                stats['m2'] += m2 + delta ** 2 * stats['count'] * count / total
+                stats['count'] = total
+        elif normalization == 'minmax':
+            if not stats:
+                stats.update({'min': values.min(), 'max': values.max()})
+            else:
+                stats['min'] = min(stats['min'], values.min())
+                stats['max'] = max(stats['max'], values.max())
+        return stats
+
+    @staticmethod
+    def get_feature_meta_from_stats(stats, preprocessing_parameters):
+        normalization = preprocessing_parameters['normalization']
+        if normalization == 'zscore':
+            std = np.nan
+            if stats.get('count', 0) > 1:
+                std = np.sqrt(stats['m2'] / (stats['count'] - 1))
+            return {
+                'mean': float(stats.get('mean', np.nan)),
+                'std': float(std)
+            }
+        elif normalization == 'minmax':
+            return {
+                'min': float(stats.get('min', np.nan)),
+                'max': float(stats.get('max', np.nan))
+            }
+        return NumericalFeatureMixin.get_feature_meta(
+            None, preprocessing_parameters
+        )
+
     @staticmethod
     def add_feature_data(
             feature,
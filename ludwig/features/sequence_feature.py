@@ -45,6 +45,7 @@ from ludwig.utils.misc_utils import set_default_value
 from ludwig.utils.strings_utils import PADDING_SYMBOL
 from ludwig.utils.strings_utils import UNKNOWN_SYMBOL
 from ludwig.utils.strings_utils import build_sequence_matrix
+from ludwig.utils.strings_utils import count_units
 from ludwig.utils.strings_utils import create_vocabulary
 
 logger = logging.getLogger(__name__)
@@ -62,20 +63,45 @@ class SequenceFeatureMixin(object):
         'tokenizer': 'space',
         'lowercase': False,
         'vocab_file': None,
+        'tokenizer_n_process': 1,
         'missing_value_strategy': FILL_WITH_CONST,
         'fill_value': UNKNOWN_SYMBOL
     }
 
     @staticmethod
     def get_feature_meta(column, preprocessing_parameters):
-        idx2str, str2idx, str2freq, max_length, _, _, _ = create_vocabulary(
+        return SequenceFeatureMixin.get_feature_meta_from_stats(
+            SequenceFeatureMixin.update_feature_stats(
+                None, column, preprocessing_parameters
+            ),
+            preprocessing_parameters
+        )
+
+    @staticmethod
+    def update_feature_stats(stats, column, preprocessing_parameters):
+        if stats is None:
+            stats = {'unit_counts': None, 'max_length': 0}
+        stats['unit_counts'], stats['max_length'] = count_units(
             column, preprocessing_parameters['tokenizer'],
             lowercase=preprocessing_parameters['lowercase'],
+            vocab_file=preprocessing_parameters['vocab_file'],
+            unit_counts=stats['unit_counts'],
+            max_line_length=stats['max_length'],
+            n_process=preprocessing_parameters['tokenizer_n_process']
+        )
+        return stats
+
+    @staticmethod
+    def get_feature_meta_from_stats(stats, preprocessing_parameters):
+        idx2str, str2idx, str2freq, max_length, _, _, _ = create_vocabulary(
+            None, preprocessing_parameters['tokenizer'],
+            lowercase=preprocessing_parameters['lowercase'],
             num_most_frequent=preprocessing_parameters['most_common'],
             vocab_file=preprocessing_parameters['vocab_file'],
             unknown_symbol=preprocessing_parameters['unknown_symbol'],
             padding_symbol=preprocessing_parameters['padding_symbol'],
-
+            unit_counts=stats['unit_counts'],
+            max_line_length=stats['max_length']
         )
         max_length = min(
             preprocessing_parameters['sequence_length_limit'],
@@ -102,7 +128,8 @@ class SequenceFeatureMixin(object):
             lowercase=preprocessing_parameters['lowercase'],
             tokenizer_vocab_file=preprocessing_parameters[
                 'vocab_file'
-            ]
+            ],
+            n_process=preprocessing_parameters['tokenizer_n_process']
         )
         return sequence_data
 
@@ -115,7 +142,7 @@ class SequenceFeatureMixin(object):
             preprocessing_parameters
     ):
         sequence_data = SequenceInputFeature.feature_data(
-            dataset_df[feature[NAME]].astype(str),
+            dataset_df[feature[NAME]],
             metadata[feature[NAME]], preprocessing_parameters)
         dataset[feature[NAME]] = sequence_data
 
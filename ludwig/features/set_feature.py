@@ -26,12 +26,13 @@ from ludwig.decoders.generic_decoders import Classifier
 from ludwig.encoders.set_encoders import SetSparseEncoder
 from ludwig.features.base_feature import InputFeature
 from ludwig.features.base_feature import OutputFeature
-from ludwig.features.feature_utils import set_str_to_idx
+from ludwig.features.feature_utils import build_sparse_set_matrix
 from ludwig.modules.loss_modules import SigmoidCrossEntropyLoss
 from ludwig.modules.metric_modules import SigmoidCrossEntropyMetric
 from ludwig.utils.horovod_utils import is_on_master
 from ludwig.utils.misc_utils import set_default_value
-from ludwig.utils.strings_utils import create_vocabulary, UNKNOWN_SYMBOL
+from ludwig.utils.strings_utils import create_vocabulary, count_units, \
+    UNKNOWN_SYMBOL
 
 logger = logging.getLogger(__name__)
 
@@ -48,11 +49,35 @@ class SetFeatureMixin(object):
 
     @staticmethod
     def get_feature_meta(column, preprocessing_parameters):
-        idx2str, str2idx, str2freq, max_size ,_ , _, _  = create_vocabulary(
+        return SetFeatureMixin.get_feature_meta_from_stats(
+            SetFeatureMixin.update_feature_stats(
+                None, column, preprocessing_parameters
+            ),
+            preprocessing_parameters
+        )
+
+    @staticmethod
+    def update_feature_stats(stats, column, preprocessing_parameters):
+        if stats is None:
+            stats = {'unit_counts': None, 'max_length': 0}
+        stats['unit_counts'], stats['max_length'] = count_units(
             column,
             preprocessing_parameters['tokenizer'],
+            lowercase=preprocessing_parameters['lowercase'],
+            unit_counts=stats['unit_counts'],
+            max_line_length=stats['max_length']
+        )
+        return stats
+
+    @staticmethod
+    def get_feature_meta_from_stats(stats, preprocessing_parameters):
+        idx2str, str2idx, str2freq, max_size, _, _, _ = create_vocabulary(
+            None,
+            preprocessing_parameters['tokenizer'],
             num_most_frequent=preprocessing_parameters['most_common'],
-            lowercase=preprocessing_parameters['lowercase']
+            lowercase=preprocessing_parameters['lowercase'],
+            unit_counts=stats['unit_counts'],
+            max_line_length=stats['max_length']
         )
         return {
             'idx2str': idx2str,
@@ -64,26 +89,13 @@ class SetFeatureMixin(object):
 
     @staticmethod
     def feature_data(column, metadata, preprocessing_parameters):
-        feature_vector = np.array(
-            column.map(
-                lambda x: set_str_to_idx(
-                    x,
-                    metadata['str2idx'],
-                    preprocessing_parameters['tokenizer']
-                )
-            )
-        )
-
-        set_matrix = np.zeros(
-            (len(column),
-             len(metadata['str2idx'])),
+        return build_sparse_set_matrix(
+            column,
+            metadata['str2idx'],
+            preprocessing_parameters['tokenizer'],
+            bool
         )
 
-        for i in range(len(column)):
-            set_matrix[i, feature_vector[i]] = 1
-
-        return set_matrix.astype(np.bool)
-
     @staticmethod
     def add_feature_data(
             feature,
@@ -93,7 +105,7 @@ class SetFeatureMixin(object):
             preprocessing_parameters,
     ):
         dataset[feature[NAME]] = SetFeatureMixin.feature_data(
-            dataset_df[feature[NAME]].astype(str),
+            dataset_df[feature[NAME]],
             metadata[feature[NAME]],
             preprocessing_parameters
         )
@@ -101,6 +113,7 @@ class SetFeatureMixin(object):
 
 class SetInputFeature(SetFeatureMixin, InputFeature):
     encoder = 'embed'
+    vocab = []
 
     def __init__(self, feature, encoder_obj=None):
         super().__init__(feature)
@@ -31,10 +31,13 @@ from ludwig.utils.misc_utils import set_default_values
 from ludwig.utils.strings_utils import PADDING_SYMBOL
 from ludwig.utils.strings_utils import UNKNOWN_SYMBOL
 from ludwig.utils.strings_utils import build_sequence_matrix
+from ludwig.utils.strings_utils import count_units
 from ludwig.utils.strings_utils import create_vocabulary
 
 logger = logging.getLogger(__name__)
 
+TEXT_LEVELS = ('char', 'word')
+
 
 class TextFeatureMixin(object):
     type = TEXT
@@ -53,152 +56,161 @@ class TextFeatureMixin(object):
         'unknown_symbol': UNKNOWN_SYMBOL,
         'padding': 'right',
         'lowercase': True,
+        'tokenizer_n_process': 1,
         'missing_value_strategy': FILL_WITH_CONST,
         'fill_value': UNKNOWN_SYMBOL
     }
 
     @staticmethod
-    def feature_meta(column, preprocessing_parameters):
-        (
-            char_idx2str,
-            char_str2idx,
-            char_str2freq,
-            char_max_len,
-            char_pad_idx,
-            char_pad_symbol,
-            char_unk_symbol,
-        ) = create_vocabulary(
-            column,
-            tokenizer_type='characters',
-            num_most_frequent=preprocessing_parameters['char_most_common'],
-            lowercase=preprocessing_parameters['lowercase'],
-            unknown_symbol=preprocessing_parameters['unknown_symbol'],
-            padding_symbol=preprocessing_parameters['padding_symbol'],
-            pretrained_model_name_or_path=preprocessing_parameters[
-                'pretrained_model_name_or_path']
+    def get_levels(preprocessing_parameters):
+        """
+        Returns the levels to preprocess. When the level used by the feature
+        is known only that one is tokenized, otherwise both are.
+        """
+        level = preprocessing_parameters.get('level')
+        if level is not None:
+            return level,
+        return TEXT_LEVELS
 
-        )
-        (
-            word_idx2str,
-            word_str2idx,
-            word_str2freq,
-            word_max_len,
-            word_pad_idx,
-            word_pad_symbol,
-            word_unk_symbol,
-        ) = create_vocabulary(
-            column,
-            tokenizer_type=preprocessing_parameters['word_tokenizer'],
-            num_most_frequent=preprocessing_parameters['word_most_common'],
-            lowercase=preprocessing_parameters['lowercase'],
-            vocab_file=preprocessing_parameters['word_vocab_file'],
-            unknown_symbol=preprocessing_parameters['unknown_symbol'],
-            padding_symbol=preprocessing_parameters['padding_symbol'],
-            pretrained_model_name_or_path=preprocessing_parameters[
-                'pretrained_model_name_or_path']
-        )
-        return (
-            char_idx2str,
-            char_str2idx,
-            char_str2freq,
-            char_max_len,
-            char_pad_idx,
-            char_pad_symbol,
-            char_unk_symbol,
-            word_idx2str,
-            word_str2idx,
-            word_str2freq,
-            word_max_len,
-            word_pad_idx,
-            word_pad_symbol,
-            word_unk_symbol,
-        )
+    @staticmethod
+    def update_feature_stats(stats, column, preprocessing_parameters):
+        if stats is None:
+            stats = {}
+        for level in TextFeatureMixin.get_levels(preprocessing_parameters):
+            unit_counts, max_length = count_units(
+                column,
+                tokenizer_type=preprocessing_parameters[
+                    '{}_tokenizer'.format(level)
+                ],
+                lowercase=preprocessing_parameters['lowercase'],
+                vocab_file=preprocessing_parameters[
+                    '{}_vocab_file'.format(level)
+                ],
+                pretrained_model_name_or_path=preprocessing_parameters[
+                    'pretrained_model_name_or_path'],
+                unit_counts=stats.get('{}_unit_counts'.format(level)),
+                max_line_length=stats.get('{}_max_length'.format(level), 0),
+                n_process=preprocessing_parameters['tokenizer_n_process']
+            )
+            stats['{}_unit_counts'.format(level)] = unit_counts
+            stats['{}_max_length'.format(level)] = max_length
+        return stats
+
+    @staticmethod
+    def feature_meta(stats, preprocessing_parameters):
+        feature_meta = {}
+        for level in TextFeatureMixin.get_levels(preprocessing_parameters):
+            (
+                idx2str,
+                str2idx,
+                str2freq,
+                max_len,
+                pad_idx,
+                pad_symbol,
+                unk_symbol,
+            ) = create_vocabulary(
+                None,
+                tokenizer_type=preprocessing_parameters[
+                    '{}_tokenizer'.format(level)
+                ],
+                num_most_frequent=preprocessing_parameters[
+                    '{}_most_common'.format(level)
+                ],
+                lowercase=preprocessing_parameters['lowercase'],
+                vocab_file=preprocessing_parameters[
+                    '{}_vocab_file'.format(level)
+                ],
+                unknown_symbol=preprocessing_parameters['unknown_symbol'],
+                padding_symbol=preprocessing_parameters['padding_symbol'],
+                pretrained_model_name_or_path=preprocessing_parameters[
+                    'pretrained_model_name_or_path'],
+                unit_counts=stats['{}_unit_counts'.format(level)],
+                max_line_length=stats['{}_max_length'.format(level)]
+            )
+            feature_meta[level] = (
+                idx2str,
+                str2idx,
+                str2freq,
+                max_len,
+                pad_idx,
+                pad_symbol,
+                unk_symbol,
+            )
+        return feature_meta
 
     @staticmethod
     def get_feature_meta(column, preprocessing_parameters):
-        tf_meta = TextFeatureMixin.feature_meta(
-            column, preprocessing_parameters
-        )
-        (
-            char_idx2str,
-            char_str2idx,
-            char_str2freq,
-            char_max_len,
-            char_pad_idx,
-            char_pad_symbol,
-            char_unk_symbol,
-            word_idx2str,
-            word_str2idx,
-            word_str2freq,
-            word_max_len,
-            word_pad_idx,
-            word_pad_symbol,
-            word_unk_symbol,
-        ) = tf_meta
-        char_max_len = min(
-            preprocessing_parameters['char_sequence_length_limit'],
-            char_max_len
-        )
-        word_max_len = min(
-            preprocessing_parameters['word_sequence_length_limit'],
-            word_max_len
+        return TextFeatureMixin.get_feature_meta_from_stats(
+            TextFeatureMixin.update_feature_stats(
+                None, column, preprocessing_parameters
+            ),
+            preprocessing_parameters
         )
-        return {
-            'char_idx2str': char_idx2str,
-            'char_str2idx': char_str2idx,
-            'char_str2freq': char_str2freq,
-            'char_vocab_size': len(char_idx2str),
-            'char_max_sequence_length': char_max_len,
-            'char_pad_idx': char_pad_idx,
-            'char_pad_symbol': char_pad_symbol,
-            'char_unk_symbol': char_unk_symbol,
-            'word_idx2str': word_idx2str,
-            'word_str2idx': word_str2idx,
-            'word_str2freq': word_str2freq,
-            'word_vocab_size': len(word_idx2str),
-            'word_max_sequence_length': word_max_len,
-            'word_pad_idx': word_pad_idx,
-            'word_pad_symbol': word_pad_symbol,
-            'word_unk_symbol': word_unk_symbol,
-        }
 
     @staticmethod
-    def feature_data(column, metadata, preprocessing_parameters):
-        char_data = build_sequence_matrix(
-            sequences=column,
-            inverse_vocabulary=metadata['char_str2idx'],
-            tokenizer_type=preprocessing_parameters['char_tokenizer'],
-            length_limit=metadata['char_max_sequence_length'],
-            padding_symbol=metadata['char_pad_symbol'],
-            padding=preprocessing_parameters['padding'],
-            unknown_symbol=metadata['char_unk_symbol'],
-            lowercase=preprocessing_parameters['lowercase'],
-            tokenizer_vocab_file=preprocessing_parameters[
-                'char_vocab_file'
-            ],
-            pretrained_model_name_or_path=preprocessing_parameters[
-                'pretrained_model_name_or_path'
-            ]
-
-        )
-        word_data = build_sequence_matrix(
-            sequences=column,
-            inverse_vocabulary=metadata['word_str2idx'],
-            tokenizer_type=preprocessing_parameters['word_tokenizer'],
-            length_limit=metadata['word_max_sequence_length'],
-            padding_symbol=metadata['word_pad_symbol'],
-            padding=preprocessing_parameters['padding'],
-            unknown_symbol=metadata['word_unk_symbol'],
-            lowercase=preprocessing_parameters['lowercase'],
-            tokenizer_vocab_file=preprocessing_parameters[
-                'word_vocab_file'
-            ],
-            pretrained_model_name_or_path=preprocessing_parameters[
-                'pretrained_model_name_or_path'
-            ]
+    def get_feature_meta_from_stats(stats, preprocessing_parameters):
+        metadata = {}
+        feature_meta = TextFeatureMixin.feature_meta(
+            stats, preprocessing_parameters
         )
+        for level, level_meta in feature_meta.items():
+            (
+                idx2str,
+                str2idx,
+                str2freq,
+                max_len,
+                pad_idx,
+                pad_symbol,
+                unk_symbol,
+            ) = level_meta
+            max_len = min(
+                preprocessing_parameters[
+                    '{}_sequence_length_limit'.format(level)
+                ],
+                max_len
+            )
+            metadata.update({
+                '{}_idx2str'.format(level): idx2str,
+                '{}_str2idx'.format(level): str2idx,
+                '{}_str2freq'.format(level): str2freq,
+                '{}_vocab_size'.format(level): len(idx2str),
+                '{}_max_sequence_length'.format(level): max_len,
+                '{}_pad_idx'.format(level): pad_idx,
+                '{}_pad_symbol'.format(level): pad_symbol,
+                '{}_unk_symbol'.format(level): unk_symbol,
+            })
+        return metadata
 
-        return char_data, word_data
+    @staticmethod
+    def feature_data(column, metadata, preprocessing_parameters):
+        """
+        Returns a dictionary mapping each preprocessed level
+        to its sequence matrix.
+        """
+        return {
+            level: build_sequence_matrix(
+                sequences=column,
+                inverse_vocabulary=metadata['{}_str2idx'.format(level)],
+                tokenizer_type=preprocessing_parameters[
+                    '{}_tokenizer'.format(level)
+                ],
+                length_limit=metadata[
+                    '{}_max_sequence_length'.format(level)
+                ],
+                padding_symbol=metadata['{}_pad_symbol'.format(level)],
+                padding=preprocessing_parameters['padding'],
+                unknown_symbol=metadata['{}_unk_symbol'.format(level)],
+                lowercase=preprocessing_parameters['lowercase'],
+                tokenizer_vocab_file=preprocessing_parameters[
+                    '{}_vocab_file'.format(level)
+                ],
+                pretrained_model_name_or_path=preprocessing_parameters[
+                    'pretrained_model_name_or_path'
+                ],
+                n_process=preprocessing_parameters['tokenizer_n_process']
+            )
+            for level in TextFeatureMixin.get_levels(preprocessing_parameters)
+        }
 
     @staticmethod
     def add_feature_data(
@@ -208,12 +220,12 @@ class TextFeatureMixin(object):
             metadata,
             preprocessing_parameters
     ):
-        chars_data, words_data = TextFeatureMixin.feature_data(
-            dataset_df[feature[NAME]].astype(str),
+        levels_data = TextFeatureMixin.feature_data(
+            dataset_df[feature[NAME]],
             metadata[feature[NAME]], preprocessing_parameters
         )
-        dataset['{}_char'.format(feature[NAME])] = chars_data
-        dataset['{}_word'.format(feature[NAME])] = words_data
+        for level, level_data in levels_data.items():
+            dataset['{}_{}'.format(feature[NAME], level)] = level_data
 
 
 class TextInputFeature(TextFeatureMixin, SequenceInputFeature):
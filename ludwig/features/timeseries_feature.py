@@ -23,8 +23,9 @@ from ludwig.constants import *
 from ludwig.encoders.sequence_encoders import StackedCNN, ParallelCNN, \
     StackedParallelCNN, StackedRNN, StackedCNNRNN, SequencePassthroughEncoder
 from ludwig.features.sequence_feature import SequenceInputFeature
-from ludwig.utils.misc_utils import get_from_registry, set_default_values
-from ludwig.utils.strings_utils import tokenizer_registry
+from ludwig.utils.misc_utils import set_default_values
+from ludwig.utils.strings_utils import build_padded_matrix
+from ludwig.utils.strings_utils import tokenize_column
 
 logger = logging.getLogger(__name__)
 
@@ -37,23 +38,37 @@ class TimeseriesFeatureMixin(object):
         'padding_value': 0,
         'padding': 'right',
         'tokenizer': 'space',
+        'dtype': 'float32',
         'missing_value_strategy': FILL_WITH_CONST,
         'fill_value': ''
     }
 
     @staticmethod
     def get_feature_meta(column, preprocessing_parameters):
-        tokenizer = get_from_registry(
-            preprocessing_parameters['tokenizer'],
-            tokenizer_registry
-        )()
-        max_length = 0
-        for timeseries in column:
-            processed_line = tokenizer(timeseries)
-            max_length = max(max_length, len(processed_line))
+        return TimeseriesFeatureMixin.get_feature_meta_from_stats(
+            TimeseriesFeatureMixin.update_feature_stats(
+                None, column, preprocessing_parameters
+            ),
+            preprocessing_parameters
+        )
+
+    @staticmethod
+    def update_feature_stats(stats, column, preprocessing_parameters):
+        if stats is None:
+            stats = {'max_length': 0}
+        _, lengths = tokenize_column(
+            column,
+            preprocessing_parameters['tokenizer']
+        )
+        if len(lengths) > 0:
+            stats['max_length'] = max(stats['max_length'], int(lengths.max()))
+        return stats
+
+    @staticmethod
+    def get_feature_meta_from_stats(stats, preprocessing_parameters):
         max_length = min(
             preprocessing_parameters['timeseries_length_limit'],
-            max_length
+            stats['max_length']
         )
 
         return {'max_timeseries_length': max_length}
@@ -64,20 +79,13 @@ class TimeseriesFeatureMixin(object):
             tokenizer_name,
             length_limit,
             padding_value,
-            padding='right'
+            padding='right',
+            dtype=np.float32
     ):
-        tokenizer = get_from_registry(
-            tokenizer_name,
-            tokenizer_registry
-        )()
-        max_length = 0
-        ts_vectors = []
-        for ts in timeseries:
-            ts_vector = np.array(tokenizer(ts)).astype(np.float32)
-            ts_vectors.append(ts_vector)
-            if len(ts_vector) > max_length:
-                max_length = len(ts_vector)
+        units, lengths = tokenize_column(timeseries, tokenizer_name)
+        values = np.asarray(units).astype(dtype)
 
+        max_length = lengths.max() if len(lengths) > 0 else 0
         if max_length < length_limit:
             logger.debug(
                 'max length of {0}: {1} < limit: {2}'.format(
@@ -86,19 +94,13 @@ class TimeseriesFeatureMixin(object):
                     length_limit
                 )
             )
-        max_length = length_limit
-        timeseries_matrix = np.full(
-            (len(timeseries), max_length),
+        return build_padded_matrix(
+            values,
+            lengths,
+            length_limit,
             padding_value,
-            dtype=np.float32
+            padding=padding
         )
-        for i, vector in enumerate(ts_vectors):
-            limit = min(vector.shape[0], max_length)
-            if padding == 'right':
-                timeseries_matrix[i, :limit] = vector[:limit]
-            else:  # if padding == 'left
-                timeseries_matrix[i, max_length - limit:] = vector[:limit]
-        return timeseries_matrix
 
     @staticmethod
     def feature_data(column, metadata, preprocessing_parameters):
@@ -107,7 +109,9 @@ class TimeseriesFeatureMixin(object):
             preprocessing_parameters['tokenizer'],
             metadata['max_timeseries_length'],
             preprocessing_parameters['padding_value'],
-            preprocessing_parameters['padding'])
+            preprocessing_parameters['padding'],
+            np.dtype(preprocessing_parameters['dtype'])
+        )
         return timeseries_data
 
     @staticmethod
@@ -119,7 +123,7 @@ class TimeseriesFeatureMixin(object):
             preprocessing_parameters
     ):
         dataset[feature[NAME]] = TimeseriesFeatureMixin.feature_data(
-            dataset_df[feature[NAME]].astype(str),
+            dataset_df[feature[NAME]],
             metadata[feature[NAME]],
             preprocessing_parameters
         )
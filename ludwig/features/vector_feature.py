@@ -34,6 +34,7 @@ from ludwig.modules.loss_modules import SoftmaxCrossEntropyLoss, MSELoss, \
 from ludwig.modules.metric_modules import ErrorScore, \
     SoftmaxCrossEntropyMetric, MSEMetric, MAEMetric
 from ludwig.modules.metric_modules import R2Score
+from ludwig.utils.data_utils import get_abs_path
 from ludwig.utils.horovod_utils import is_on_master
 from ludwig.utils.misc_utils import set_default_value
 
@@ -53,6 +54,32 @@ class VectorFeatureMixin(object):
             'preprocessing': preprocessing_parameters
         }
 
+    @staticmethod
+    def feature_data(column, csv_path=None):
+        first_value = column.iloc[0]
+        if not isinstance(first_value, str):
+            # binary vectors do not need any parsing
+            return np.stack(column.values).astype(np.float32, copy=False)
+
+        if first_value.endswith('.npy'):
+            return np.stack([
+                np.load(get_abs_path(csv_path, file_path), mmap_mode='r')
+                for file_path in column
+            ]).astype(np.float32, copy=False)
+
+        # parses all the strings in a single pass without
+        # materializing the list of values of each string
+        vectors = np.loadtxt(
+            column.values,
+            dtype=np.float32,
+            comments=None,
+            ndmin=2
+        )
+        if len(vectors) != len(column):
+            # empty strings are skipped by loadtxt
+            raise ValueError('Some of the vectors are empty')
+        return vectors
+
     @staticmethod
     def add_feature_data(
             feature,
@@ -62,17 +89,23 @@ class VectorFeatureMixin(object):
             preprocessing_parameters,
     ):
         """
-                Expects all the vectors to be of the same size. The vectors need to be
-                whitespace delimited strings. Missing values are not handled.
-                """
+        Expects all the vectors to be of the same size. The vectors can be
+        whitespace delimited strings, paths to .npy files containing a
+        vector each, or lists and arrays, like the list columns of
+        dataframes and parquet files. Missing values are not handled.
+        """
         if len(dataset_df) == 0:
             raise ValueError("There are no vectors in the dataset provided")
 
-        # Convert the string of features into a numpy array
+        csv_path = None
+        if hasattr(dataset_df, 'csv'):
+            csv_path = os.path.dirname(os.path.abspath(dataset_df.csv))
+
+        # Convert the features into a numpy array
         try:
-            dataset[feature[NAME]] = np.array(
-                [x.split() for x in dataset_df[feature[NAME]]],
-                dtype=np.float32
+            dataset[feature[NAME]] = VectorFeatureMixin.feature_data(
+                dataset_df[feature[NAME]],
+                csv_path=csv_path
             )
         except ValueError:
             logger.error(
@@ -99,6 +132,7 @@ class VectorFeatureMixin(object):
 
 class VectorInputFeature(VectorFeatureMixin, InputFeature):
     encoder = 'dense'
+    vector_size = 0
 
     def __init__(self, feature, encoder_obj=None):
         super().__init__(feature)
@@ -24,7 +24,9 @@ class ECD(tf.keras.Model):
             output_features_def,
             **kwargs
     ):
-        super().__init__()
+        # the inputs are cast by cast_to_signature, the layers of the
+        # features and the combiner follow the mixed precision policy
+        super().__init__(dtype='float32')
 
         # ================ Inputs ================
         self.input_features = build_inputs(
@@ -49,6 +51,9 @@ class ECD(tf.keras.Model):
         # ================ Combined loss metric ================
         self.eval_loss_metric = tf.keras.metrics.Mean()
 
+        # ================ Compiled steps ================
+        self._compiled_steps = CompiledSteps()
+
         # After constructing all layers, clear the cache to free up memory
         clear_data_cache()
 
@@ -115,7 +120,11 @@ class ECD(tf.keras.Model):
                 training=training,
                 mask=mask
             )
-            output_logits[output_feature_name] = decoder_outputs
+            # losses, predictions and metrics are computed in float32
+            # also when the layers compute in half precision
+            output_logits[output_feature_name] = cast_to_float32(
+                decoder_outputs
+            )
             output_last_hidden[output_feature_name] = decoder_outputs[
                 'last_hidden']
 
@@ -164,31 +173,91 @@ class ECD(tf.keras.Model):
 
         return predictions
 
-    @tf.function
+    def input_signature(self):
+        return {
+            input_feature_name: tf.TensorSpec(
+                (None,) + tuple(input_feature.get_input_shape()),
+                input_feature.get_input_dtype()
+            )
+            for input_feature_name, input_feature in
+            self.input_features.items()
+        }
+
+    def target_signature(self):
+        return {
+            output_feature_name: tf.TensorSpec(
+                (None,) + tuple(output_feature.get_output_shape()),
+                output_feature.get_output_dtype()
+            )
+            for output_feature_name, output_feature in
+            self.output_features.items()
+        }
+
     def train_step(self, optimizer, inputs, targets,
                    regularization_lambda=0.0):
+        steps = self._compiled_steps
+        if steps.optimizer is not optimizer:
+            # the optimizer is not an argument of the compiled function
+            steps.optimizer = optimizer
+            steps.functions.pop('train_step', None)
+        return steps.call(
+            'train_step',
+            self._train_step,
+            [
+                self.input_signature(),
+                self.target_signature(),
+                tf.TensorSpec((), tf.float32)
+            ],
+            cast_to_signature(inputs, self.input_signature()),
+            cast_to_signature(targets, self.target_signature()),
+            regularization_lambda
+        )
+
+    def _train_step(self, inputs, targets, regularization_lambda):
         with tf.GradientTape() as tape:
             model_outputs = self((inputs, targets), training=True)
             loss, all_losses = self.train_loss(
                 targets, model_outputs, regularization_lambda
             )
-        optimizer.minimize_with_tape(
+        applied = self._compiled_steps.optimizer.minimize_with_tape(
             tape, loss, self.trainable_variables
         )
         # grads = tape.gradient(loss, model.trainable_weights)
         # optimizer.apply_gradients(zip(grads, model.trainable_weights))
-        return loss, all_losses
+        return loss, all_losses, applied
 
-    @tf.function
     def evaluation_step(self, inputs, targets):
+        return self._compiled_steps.call(
+            'evaluation_step',
+            self._evaluation_step,
+            [self.input_signature(), self.target_signature()],
+            cast_to_signature(inputs, self.input_signature()),
+            cast_to_signature(targets, self.target_signature())
+        )
+
+    def _evaluation_step(self, inputs, targets):
         predictions = self.predictions(inputs, output_features=None)
         self.update_metrics(targets, predictions)
         return predictions
 
-    @tf.function
     def predict_step(self, inputs):
+        return self._compiled_steps.call(
+            'predict_step',
+            self._predict_step,
+            [self.input_signature()],
+            cast_to_signature(inputs, self.input_signature())
+        )
+
+    def _predict_step(self, inputs):
         return self.predictions(inputs, output_features=None)
 
+    def retrace_counts(self):
+        """
+        Returns how many times each compiled step was traced again after
+        its first call, for inputs not matching its signature.
+        """
+        return dict(self._compiled_steps.retrace_counts)
+
     def train_loss(self, targets, predictions, regularization_lambda=0.0):
         train_loss = 0
         of_train_losses = {}
@@ -305,12 +374,94 @@ def build_single_input(input_feature_def, other_input_features, **kwargs):
     return input_feature_obj
 
 
-dynamic_length_encoders = {
-    'rnn',
-    'embed'
+class CompiledSteps:
+    """
+    tf.functions of the steps of a model, traced with an input signature
+    with a None batch dimension so batches of any size reuse the same
+    graph. Being a plain object, keras does not track the functions.
+    """
+
+    def __init__(self):
+        self.functions = {}
+        self.retrace_counts = {}
+        self.optimizer = None
+        self._traces = 0
+
+    def call(self, name, python_function, input_signature, *args):
+        if name not in self.functions:
+            def traced_function(*function_args):
+                # runs only when the function is traced
+                self._traces += 1
+                return python_function(*function_args)
+
+            self.functions[name] = tf.function(
+                traced_function,
+                input_signature=input_signature
+            )
+            # the first call traces the function, possibly twice to
+            # create variables
+            return self.functions[name](*args)
+
+        traces = self._traces
+        outputs = self.functions[name](*args)
+        if self._traces > traces:
+            self.retrace_counts[name] = (
+                    self.retrace_counts.get(name, 0) + self._traces - traces
+            )
+        return outputs
+
+
+def cast_to_float32(values):
+    return {
+        key: tf.cast(value, tf.float32)
+        if isinstance(value, tf.Tensor) and value.dtype.is_floating
+        else value
+        for key, value in values.items()
+    }
+
+
+def cast_to_signature(values, signature):
+    # the stored data uses the smallest dtype that fits the values,
+    # the model and the input features do not cast them further
+    return {
+        name: tf.cast(values[name], spec.dtype)
+        for name, spec in signature.items()
+    }
+
+
+# reductions of the encoders whose output does not change when the padding
+# at the end of the sequences is trimmed: sequence and text input features
+# mask the padding, the embedding of masked tokens is zero and the recurrent
+# layers skip them
+padding_independent_reductions = {
+    'embed': {'sum', 'last'},
+    'rnn': {'last'}
 }
 
 
+def ignores_trailing_padding(input_feature):
+    """
+    Returns True if the encoder output of an input feature does not depend
+    on the padding at the end of its sequences, so that it can be trimmed.
+    """
+    if input_feature.type not in {SEQUENCE, TEXT}:
+        return False
+    reduce_output = getattr(input_feature.encoder_obj, 'reduce_output', None)
+    return reduce_output in padding_independent_reductions.get(
+        input_feature.encoder, ()
+    )
+
+
+def get_padding_value(input_feature):
+    """
+    Returns the value the sequences of an input feature are padded with:
+    the index of the padding symbol of text features, which pretrained
+    tokenizers define, 0 for the other features or if input_feature is None.
+    """
+    pad_idx = getattr(input_feature, 'pad_idx', None)
+    return 0 if pad_idx is None else pad_idx
+
+
 def build_outputs(
         output_features_def,
         combiner,
@@ -31,11 +31,13 @@ class Predictor:
             batch_size=128,
             horovod=None,
             debug=False,
+            input_pipeline='batcher',
             **kwargs
     ):
         self._batch_size = batch_size
         self._horovod = horovod
         self._debug = debug
+        self._input_pipeline = input_pipeline
 
     def batch_predict(
             self,
@@ -46,7 +48,8 @@ class Predictor:
         batcher = initialize_batcher(
             dataset, self._batch_size,
             should_shuffle=False,
-            horovod=self._horovod
+            horovod=self._horovod,
+            input_pipeline=self._input_pipeline
         )
 
         progress_bar = None
@@ -105,7 +108,8 @@ class Predictor:
         batcher = initialize_batcher(
             dataset, self._batch_size,
             should_shuffle=False,
-            horovod=self._horovod
+            horovod=self._horovod,
+            input_pipeline=self._input_pipeline
         )
 
         progress_bar = None
@@ -193,7 +197,8 @@ class Predictor:
         batcher = initialize_batcher(
             dataset,
             self._batch_size,
-            should_shuffle=False
+            should_shuffle=False,
+            input_pipeline=self._input_pipeline
         )
 
         progress_bar = tqdm(
@@ -42,6 +42,8 @@ from ludwig.globals import MODEL_WEIGHTS_FILE_NAME
 from ludwig.globals import TRAINING_CHECKPOINTS_DIR_PATH
 from ludwig.globals import TRAINING_PROGRESS_TRACKER_FILE_NAME
 from ludwig.globals import is_progressbar_disabled
+from ludwig.models.ecd import get_padding_value
+from ludwig.models.ecd import ignores_trailing_padding
 from ludwig.models.predictor import Predictor
 from ludwig.modules.metric_modules import get_improved_fun
 from ludwig.modules.metric_modules import get_initial_validation_value
@@ -75,6 +77,12 @@ class Trainer:
             batch_size=128,
             eval_batch_size=0,
             bucketing_field=None,
+            batch_tokens=None,
+            prefetch_batches=0,
+            input_pipeline='batcher',
+            tf_data_cache=False,
+            mixed_precision=None,
+            gradient_accumulation_steps=1,
             validation_field='combined',
             validation_metric='loss',
             early_stop=20,
@@ -123,8 +131,39 @@ class Trainer:
         :type batch_size: Integer
         :param bucketing_field: when batching, buckets datapoints based the
                length of a field together. Bucketing on text length speeds up
-               training of RNNs consistently, 30% in some cases
-        :type bucketing_field:
+               training of RNNs consistently, 30% in some cases.
+               The padding at the end of the field is trimmed from the
+               batches when its encoder output does not depend on it.
+               Not used by distributed training and the `tf_data` input
+               pipeline
+        :type bucketing_field: String
+        :param batch_tokens: when set, training batches are capped by the
+               number of elements of the padded bucketing field (rows
+               times padded length) instead of `batch_size` rows, so
+               when the padding is trimmed batches of short sequences hold
+               more rows than batches of long ones. Requires
+               `bucketing_field`
+        :type batch_tokens: Integer
+        :param prefetch_batches: number of training batches gathered in
+               a background thread while the current batch is used, 0
+               gathers them in the training loop
+        :type prefetch_batches: Integer
+        :param input_pipeline: `batcher` gathers the batches with the
+               batchers of ludwig.utils.batcher, `tf_data` with a
+               tf.data pipeline
+        :type input_pipeline: str
+        :param tf_data_cache: with the `tf_data` input pipeline, caches the
+               gathered rows in memory if True or in files with the given
+               path prefix
+        :type tf_data_cache: Boolean or str
+        :param mixed_precision: keras mixed precision policy the model was
+               built with, `mixed_float16` scales the loss so that small
+               gradients do not underflow
+        :type mixed_precision: str
+        :param gradient_accumulation_steps: number of batches the gradients
+               are accumulated over before they are applied, the effective
+               batch size is `batch_size` times this number
+        :type gradient_accumulation_steps: Integer
         :param validation_field: The first output feature, by default it is set
                as the same field of the first output feature.
         :param validation_metric: metric used on the validation field, it is
@@ -155,7 +194,8 @@ class Trainer:
         :param increase_batch_size_on_plateau_rate: The rate at which the batch
                size increases.
         :type increase_batch_size_on_plateau_rate: Float
-        :param increase_batch_size_on_plateau_max: The maximum size of the batch
+        :param increase_batch_size_on_plateau_max: The maximum size of the batch,
+               including the batches the gradients are accumulated over
         :type increase_batch_size_on_plateau_max: Integer
         :param learning_rate_warmup_epochs: The number of epochs to warmup the
                learning rate for.
@@ -195,6 +235,12 @@ class Trainer:
         self._batch_size = batch_size
         self._eval_batch_size = batch_size if eval_batch_size < 1 else eval_batch_size
         self._bucketing_field = bucketing_field
+        self._batch_tokens = batch_tokens
+        self._prefetch_batches = prefetch_batches
+        self._input_pipeline = input_pipeline
+        self._tf_data_cache = tf_data_cache
+        self._mixed_precision = mixed_precision
+        self._gradient_accumulation_steps = gradient_accumulation_steps
         self._validation_field = validation_field
         self._validation_metric = validation_metric
         self._early_stop = early_stop
@@ -227,6 +273,8 @@ class Trainer:
             optimizer = {TYPE: 'Adam'}
         self._optimizer = ClippedOptimizer(
             horovod=horovod,
+            dynamic_loss_scaling=mixed_precision == 'mixed_float16',
+            gradient_accumulation_steps=gradient_accumulation_steps,
             **optimizer
         )
 
@@ -465,9 +513,24 @@ class Trainer:
 
         set_random_seed(self._random_seed)
         batcher = initialize_batcher(
-            training_set, self._batch_size, self._bucketing_field,
-            horovod=self._horovod
+            training_set, self._batch_size,
+            bucketing_field=self._bucketing_field,
+            batch_tokens=self._batch_tokens,
+            trim_padding=(
+                    self._bucketing_field in model.input_features and
+                    ignores_trailing_padding(
+                        model.input_features[self._bucketing_field]
+                    )
+            ),
+            padding_value=get_padding_value(
+                model.input_features.get(self._bucketing_field)
+            ),
+            horovod=self._horovod,
+            prefetch_batches=self._prefetch_batches,
+            input_pipeline=self._input_pipeline,
+            tf_data_cache=self._tf_data_cache
         )
+        report_wait_time = hasattr(batcher, 'wait_time')
 
         # ================ Training Loop ================
         first_batch = True
@@ -482,8 +545,12 @@ class Trainer:
                     )
                 )
             current_learning_rate = progress_tracker.learning_rate
+            # optimizer updates in this epoch
+            epoch_updates = 0
             # needed because batch size may change
             batcher.batch_size = progress_tracker.batch_size
+            if report_wait_time:
+                epoch_start_wait_time = batcher.wait_time
 
             # Reset the metrics at the start of the next epoch
             model.reset_metrics()
@@ -514,7 +581,7 @@ class Trainer:
                 # if first_batch and is_on_master() and not skip_save_log:
                 #    tf.summary.trace_on(graph=True, profiler=True)
 
-                loss, all_losses = model.train_step(
+                loss, all_losses, applied = model.train_step(
                     self._optimizer,
                     inputs,
                     targets,
@@ -550,34 +617,46 @@ class Trainer:
                     self._horovod.broadcast_variables(
                         self._optimizer.variables(), root_rank=0)
 
-                if self._decay:
-                    current_learning_rate = exponential_decay(
-                        current_learning_rate,
-                        self._decay_rate,
-                        self._decay_steps,
-                        batcher.step
+                # the learning rate follows the optimizer updates, batches
+                # with accumulated or skipped gradients do not change it
+                if applied:
+                    epoch_updates += 1
+                    updates_per_epoch = max(
+                        batcher.steps_per_epoch //
+                        self._gradient_accumulation_steps,
+                        1
                     )
+                    if self._decay:
+                        current_learning_rate = exponential_decay(
+                            current_learning_rate,
+                            self._decay_rate,
+                            self._decay_steps,
+                            epoch_updates
+                        )
 
-                if self._horovod:
-                    current_learning_rate = learning_rate_warmup_distributed(
-                        current_learning_rate,
-                        progress_tracker.epoch,
-                        self._learning_rate_warmup_epochs,
-                        self._horovod.size(),
-                        batcher.step,
-                        batcher.steps_per_epoch
-                    ) * self._horovod.size()
-                else:
-                    current_learning_rate = learning_rate_warmup(
-                        current_learning_rate,
-                        progress_tracker.epoch,
-                        self._learning_rate_warmup_epochs,
-                        batcher.step,
-                        batcher.steps_per_epoch
-                    )
-                self._optimizer.set_learning_rate(current_learning_rate)
+                    if self._horovod:
+                        current_learning_rate = learning_rate_warmup_distributed(
+                            current_learning_rate,
+                            progress_tracker.epoch,
+                            self._learning_rate_warmup_epochs,
+                            self._horovod.size(),
+                            epoch_updates,
+                            updates_per_epoch
+                        ) * self._horovod.size()
+                    else:
+                        current_learning_rate = learning_rate_warmup(
+                            current_learning_rate,
+                            progress_tracker.epoch,
+                            self._learning_rate_warmup_epochs,
+                            epoch_updates,
+                            updates_per_epoch
+                        )
+                    self._optimizer.set_learning_rate(current_learning_rate)
 
                 progress_tracker.steps += 1
+                if self._bucketing_field is not None:
+                    rows, length = batch[self._bucketing_field].shape
+                    progress_tracker.tokens += int(rows * length)
                 if is_on_master():
                     progress_bar.update(1)
                 first_batch = False
@@ -587,7 +666,8 @@ class Trainer:
                 progress_bar.close()
 
             progress_tracker.epoch += 1
-            batcher.reset()  # todo future: this may be useless, doublecheck
+            # the next epoch visits the rows in a new order
+            batcher.reset()
 
             # ================ Eval ================
             # init tables
@@ -654,6 +734,21 @@ class Trainer:
             if is_on_master():
                 logger.info('Took {time}'.format(
                     time=time_utils.strdelta(elapsed_time)))
+                if report_wait_time:
+                    # time the training loop was blocked on batches
+                    # that were not prefetched yet
+                    logger.info('Waited {time} for training batches'.format(
+                        time=time_utils.strdelta(
+                            (batcher.wait_time - epoch_start_wait_time) *
+                            1000.0
+                        )
+                    ))
+                if not tf.config.functions_run_eagerly():
+                    # steps are traced again for every input not matching
+                    # the signature they were traced for
+                    logger.info('Retraced the compiled steps {} times'.format(
+                        sum(model.retrace_counts().values())
+                    ))
 
             # metric prints
             if is_on_master():
@@ -684,7 +779,12 @@ class Trainer:
                     self._increase_batch_size_on_plateau,
                     self._increase_batch_size_on_plateau_patience,
                     self._increase_batch_size_on_plateau_rate,
-                    self._increase_batch_size_on_plateau_max,
+                    # the maximum applies to the effective batch size
+                    max(
+                        self._increase_batch_size_on_plateau_max //
+                        self._gradient_accumulation_steps,
+                        1
+                    ),
                     self._increase_batch_size_eval_metric,
                     self._increase_batch_size_eval_split,
                     self._early_stop,
@@ -734,7 +834,8 @@ class Trainer:
         batcher = initialize_batcher(
             dataset,
             self._batch_size,
-            horovod=self._horovod
+            horovod=self._horovod,
+            input_pipeline=self._input_pipeline
         )
 
         # training step loop
@@ -800,7 +901,8 @@ class Trainer:
             debug=False,
     ):
         predictor = Predictor(
-            batch_size=batch_size, horovod=self._horovod, debug=self._debug
+            batch_size=batch_size, horovod=self._horovod, debug=self._debug,
+            input_pipeline=self._input_pipeline
         )
         metrics, predictions = predictor.batch_evaluation(
             model,
@@ -1217,11 +1319,14 @@ class ProgressTracker:
             test_metrics,
             last_improvement,
             last_learning_rate_reduction,
-            last_increase_batch_size
+            last_increase_batch_size,
+            tokens=0
     ):
         self.batch_size = batch_size
         self.epoch = epoch
         self.steps = steps
+        # elements of the padded bucketing field of the batches trained on
+        self.tokens = tokens
         self.last_improvement_epoch = last_improvement_epoch
         self.last_improvement = last_improvement
         self.last_learning_rate_reduction_epoch = last_learning_rate_reduction_epoch
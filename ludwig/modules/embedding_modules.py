@@ -23,6 +23,7 @@ from tensorflow.keras.layers import Layer
 from ludwig.constants import TYPE
 from ludwig.modules.initializer_modules import get_initializer
 from ludwig.utils.data_utils import load_pretrained_embeddings
+from ludwig.utils.tf_utils import get_compute_dtype
 
 logger = logging.getLogger(__name__)
 
@@ -172,6 +173,8 @@ class Embed(Layer):
         embedded = tf.nn.embedding_lookup(
             self.embeddings, inputs, name='embeddings_lookup'
         )
+        # the embeddings are float32 variables
+        embedded = tf.cast(embedded, get_compute_dtype(self))
 
         if self.dropout:
             embedded = self.dropout(embedded, training=training)
@@ -226,6 +229,7 @@ class EmbedWeighted(Layer):
         embedded = tf.nn.embedding_lookup(
             self.embeddings, multiple_hot_indexes, name='embeddings_lookup'
         )
+        embedded = tf.cast(embedded, get_compute_dtype(self))
 
         # Get the multipliers to embeddings
         weights_mask = tf.expand_dims(inputs, -1)
@@ -295,6 +299,7 @@ class EmbedSparse(Layer):
             sp_weights=None,
             combiner=self.reduce_output
         )
+        embedded_reduced = tf.cast(embedded_reduced, get_compute_dtype(self))
 
         if self.dropout:
             embedded_reduced = self.dropout(
@@ -346,11 +351,13 @@ class EmbedSequence(Layer):
         embedded = tf.nn.embedding_lookup(
             self.embeddings, inputs, name='embeddings_lookup'
         )
+        # the embeddings are float32 variables
+        embedded = tf.cast(embedded, get_compute_dtype(self))
 
         if mask is not None:
             mask_matrix = tf.cast(
                 tf.expand_dims(mask, -1),
-                dtype=tf.float32
+                dtype=get_compute_dtype(self)
             )
             embedded = tf.multiply(embedded, mask_matrix)
 
@@ -37,27 +37,107 @@ def ClippedOptimizer(type='sgd',
                      clipnorm=None,
                      clipvalue=None,
                      horovod=None,
+                     dynamic_loss_scaling=False,
+                     gradient_accumulation_steps=1,
                      **kwargs):
     optimizer = get_from_registry(type.lower(), optimizers_registry)(**kwargs)
     return clip_optimizer(optimizer, clipglobalnorm, clipnorm, clipvalue,
-                          horovod=horovod)
+                          horovod=horovod,
+                          dynamic_loss_scaling=dynamic_loss_scaling,
+                          gradient_accumulation_steps=gradient_accumulation_steps)
 
 
 def clip_optimizer(optimizer, clipglobalnorm, clipnorm, clipvalue,
-                   horovod=None):
+                   horovod=None, dynamic_loss_scaling=False,
+                   gradient_accumulation_steps=1):
     class _ClippedOptimizer(tf.keras.optimizers.Optimizer):
         def __init__(self, **kwargs):
             self.clipglobalnorm = clipglobalnorm
             self.clipnorm = clipnorm
             self.clipvalue = clipvalue
             self.horovod = horovod
+            self.dynamic_loss_scaling = dynamic_loss_scaling
+            self.gradient_accumulation_steps = gradient_accumulation_steps
             super(self.__class__, self).__init__(**kwargs)
+            if self.dynamic_loss_scaling:
+                # float16 gradients of small losses underflow to zero,
+                # the loss is scaled up as much as the gradients stay finite
+                self.loss_scale_optimizer = loss_scale_optimizer(self)
+                self._track_trackable(
+                    self.loss_scale_optimizer,
+                    name='loss_scale_optimizer'
+                )
+            if self.gradient_accumulation_steps > 1:
+                # created with the first gradients
+                self.gradient_accumulators = None
+                self.accumulated_steps = tf.Variable(
+                    0,
+                    trainable=False,
+                    dtype=tf.int64,
+                    name='accumulated_steps'
+                )
+                self._track_trackable(
+                    self.accumulated_steps,
+                    name='accumulated_steps'
+                )
 
         def minimize_with_tape(self, tape, loss, variables):
+            # returns whether the gradients were applied, they are not
+            # while accumulated or when overflowing with loss scaling
+            if self.dynamic_loss_scaling:
+                with tape:
+                    loss = self.loss_scale_optimizer.get_scaled_loss(loss)
+                gradients = self.loss_scale_optimizer.get_unscaled_gradients(
+                    tape.gradient(loss, variables)
+                )
+            else:
+                gradients = tape.gradient(loss, variables)
+
+            if self.gradient_accumulation_steps == 1:
+                return self.apply_clipped_gradients(gradients, variables)
+
+            apply = self.accumulate_gradients(gradients, variables)
+            # slot variables cannot be created inside the conditional
+            self.create_slots(variables)
+
+            def apply_accumulated_gradients():
+                applied = self.apply_clipped_gradients(
+                    self.mean_accumulated_gradients(),
+                    variables
+                )
+                self.reset_accumulated_gradients()
+                return applied
+
+            return tf.cond(apply, apply_accumulated_gradients, lambda: apply)
+
+        def apply_clipped_gradients(self, gradients, variables):
             if self.horovod:
-                tape = self.horovod.DistributedGradientTape(tape)
+                # the local gradients are averaged over the workers once
+                # per update, not for each accumulated batch
+                gradients = [
+                    None if gradient is None
+                    else self.horovod.allreduce(gradient)
+                    for gradient in gradients
+                ]
+            gradients = self.clip_gradients(gradients)
+            if not self.dynamic_loss_scaling:
+                self.apply_gradients(zip(gradients, variables))
+                return tf.constant(True)
+            # steps with overflowing gradients are skipped
+            # and the loss scale lowered
+            self.loss_scale_optimizer.apply_gradients(
+                zip(gradients, variables)
+            )
+            return all_finite(gradients)
 
-            gradients = tape.gradient(loss, variables)
+        def create_slots(self, variables):
+            if hasattr(self, '_create_all_weights'):
+                # keras OptimizerV2
+                self._create_all_weights(variables)
+            else:
+                self.build(variables)
+
+        def clip_gradients(self, gradients):
             if self.clipglobalnorm:
                 gradients, _ = tf.clip_by_global_norm(gradients,
                                                       self.clipglobalnorm)
@@ -75,7 +155,50 @@ def clip_optimizer(optimizer, clipglobalnorm, clipnorm, clipvalue,
                     ),
                     gradients
                 )
-            self.apply_gradients(zip(gradients, variables))
+            return list(gradients)
+
+        def accumulate_gradients(self, gradients, variables):
+            if self.gradient_accumulators is None:
+                with tf.init_scope():
+                    self.gradient_accumulators = [
+                        None if gradient is None else tf.Variable(
+                            tf.zeros(variable.shape, variable.dtype),
+                            trainable=False,
+                            name='gradient_accumulator'
+                        )
+                        for gradient, variable in zip(gradients, variables)
+                    ]
+                for i, accumulator in enumerate(self.gradient_accumulators):
+                    if accumulator is not None:
+                        self._track_trackable(
+                            accumulator,
+                            name='gradient_accumulator_{}'.format(i)
+                        )
+
+            for accumulator, gradient in zip(self.gradient_accumulators,
+                                             gradients):
+                if gradient is None:
+                    continue
+                if isinstance(gradient, tf.IndexedSlices):
+                    accumulator.scatter_add(gradient)
+                else:
+                    accumulator.assign_add(gradient)
+            self.accumulated_steps.assign_add(1)
+            return self.accumulated_steps >= self.gradient_accumulation_steps
+
+        def mean_accumulated_gradients(self):
+            # the losses are means over each micro batch
+            return [
+                None if accumulator is None
+                else accumulator / self.gradient_accumulation_steps
+                for accumulator in self.gradient_accumulators
+            ]
+
+        def reset_accumulated_gradients(self):
+            for accumulator in self.gradient_accumulators:
+                if accumulator is not None:
+                    accumulator.assign(tf.zeros_like(accumulator))
+            self.accumulated_steps.assign(0)
 
         def set_learning_rate(self, learning_rate):
             self.lr.assign(learning_rate)
@@ -83,3 +206,28 @@ def clip_optimizer(optimizer, clipglobalnorm, clipnorm, clipvalue,
     cls = type(optimizer.__class__.__name__, (optimizer.__class__,),
                dict(_ClippedOptimizer.__dict__))
     return cls.from_config(optimizer.get_config())
+
+
+def loss_scale_optimizer(optimizer):
+    """
+    Wraps optimizer in a keras LossScaleOptimizer with a dynamic loss scale.
+    """
+    if hasattr(tf.keras.mixed_precision, 'LossScaleOptimizer'):
+        return tf.keras.mixed_precision.LossScaleOptimizer(optimizer)
+    # TensorFlow < 2.4
+    return tf.keras.mixed_precision.experimental.LossScaleOptimizer(
+        optimizer,
+        loss_scale='dynamic'
+    )
+
+
+def all_finite(gradients):
+    # the keras LossScaleOptimizer applies gradients only when all are finite
+    return tf.reduce_all([
+        tf.reduce_all(tf.math.is_finite(
+            gradient.values
+            if isinstance(gradient, tf.IndexedSlices)
+            else gradient
+        ))
+        for gradient in gradients if gradient is not None
+    ])
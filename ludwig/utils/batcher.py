@@ -14,12 +14,148 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # ==============================================================================
+import itertools
+import logging
 import math
+import queue
+import threading
+import time
 
 import numpy as np
+import tensorflow as tf
+
+logger = logging.getLogger(__name__)
+
+# chunks of rows the rows of out of core datasets are shuffled among
+SHUFFLE_BUFFER_CHUNKS = 8
+
+# rows shuffled together by tf.data pipelines caching the gathered rows
+TF_DATA_SHUFFLE_BUFFER_SIZE = 10000
+
+# rows the lengths of the bucketing field are counted for at a time
+SEQUENCE_LENGTHS_CHUNK_SIZE = 65536
+
+# trimmed sequences keep a multiple of this number of positions
+TRIM_LENGTH_MULTIPLE = 8
+
+# sets of buffers batches are gathered into in turn: a batch stays valid
+# while the following BATCH_BUFFERS - 1 batches are gathered
+BATCH_BUFFERS = 2
+
+
+def chunk_shuffle_permutation(size, chunk_size, buffer_size,
+                              random_state=np.random):
+    """
+    Permutation visiting chunks of consecutive positions in random order,
+    with the positions shuffled within buffers of buffer_size positions.
+    Reading rows stored in chunks in this order reads each chunk once.
+    :param size: number of positions
+    :param chunk_size: number of positions of each chunk
+    :param buffer_size: number of positions shuffled together
+    :param random_state: numpy RandomState or the numpy.random module
+    :return: permutation of range(size)
+    """
+    chunk_starts = np.arange(0, size, chunk_size)
+    random_state.shuffle(chunk_starts)
+    permutation = np.concatenate(
+        [np.arange(start, min(start + chunk_size, size))
+         for start in chunk_starts] +
+        [np.empty(0, dtype=np.int64)]
+    )
+    for start in range(0, size, buffer_size):
+        random_state.shuffle(permutation[start:start + buffer_size])
+    return permutation
+
+
+def shuffled_order(dataset, batch_size, storage_order=None,
+                   random_state=np.random):
+    """
+    Returns a random order of the rows of a dataset. The data is not moved,
+    batches gather their rows following the order.
+    :param dataset: Dataset
+    :param batch_size: size of the batches
+    :param storage_order: Dataset.get_storage_order() of the dataset, rows
+           not in memory are shuffled by chunks of the hdf5 file to read
+           it mostly sequentially
+    :param random_state: numpy RandomState or the numpy.random module
+    :return: permutation of the positions of the rows
+    """
+    if storage_order is None:
+        return random_state.permutation(dataset.size)
+    chunk_size = dataset.get_chunk_size() or batch_size
+    return storage_order[chunk_shuffle_permutation(
+        dataset.size,
+        chunk_size,
+        SHUFFLE_BUFFER_CHUNKS * chunk_size,
+        random_state
+    )]
+
+
+def sequence_lengths(dataset, feature_name, padding_value=0,
+                     chunk_size=SEQUENCE_LENGTHS_CHUNK_SIZE):
+    """
+    Returns the number of non padding elements of each row of a sequence
+    feature, counting a chunk of rows at a time.
+    :param dataset: Dataset
+    :param feature_name: name of the sequence feature
+    :param padding_value: value of the padding elements, the index of the
+           padding symbol for sequences of tokens
+    :param chunk_size: number of rows counted at a time
+    :return: numpy array with the length of each row
+    """
+    lengths = np.empty(dataset.size, dtype=np.int64)
+    for start in range(0, dataset.size, chunk_size):
+        stop = min(start + chunk_size, dataset.size)
+        lengths[start:stop] = np.count_nonzero(
+            dataset.get(feature_name, slice(start, stop)) != padding_value,
+            axis=1
+        )
+    return lengths
 
-from ludwig.utils.data_utils import shuffle_dict_unison_inplace, \
-    shuffle_inplace
+
+class BatchBuffers(object):
+    """
+    Gathers the rows of the batches of a dataset into preallocated arrays
+    that are reused, instead of allocating new arrays for every batch.
+    """
+
+    def __init__(self, dataset, num_buffers=BATCH_BUFFERS):
+        self.dataset = dataset
+        self.buffers = [{} for _ in range(num_buffers)]
+        self.current = 0
+
+    def gather(self, feature_names, idx):
+        """
+        Returns the rows of the features. Rows selected by a slice are
+        views of the in memory data, rows selected by indices are gathered
+        into the next set of buffers.
+        :param feature_names: names of the features
+        :param idx: slice or indices of the rows
+        :return: dictionary of numpy arrays
+        """
+        if isinstance(idx, slice):
+            return {
+                feature_name: self.dataset.get(feature_name, idx)
+                for feature_name in feature_names
+            }
+
+        buffers = self.buffers[self.current]
+        self.current = (self.current + 1) % len(self.buffers)
+        batch = {}
+        for feature_name in feature_names:
+            buffer = buffers.get(feature_name)
+            if buffer is not None and buffer.shape[0] >= len(idx):
+                batch[feature_name] = self.dataset.get(
+                    feature_name,
+                    idx,
+                    out=buffer[:len(idx)]
+                )
+            else:
+                # allocated by the first batch, or when the batch grows
+                value = self.dataset.get(feature_name, idx)
+                buffers[feature_name] = np.empty_like(value)
+                batch[feature_name] = value
+        return batch
 
 
 class Batcher(object):
@@ -29,8 +165,7 @@ class Batcher(object):
 
         # store our dataset as well
         self.dataset = dataset
-        if should_shuffle:
-            shuffle_inplace(self.dataset.get_dataset())
+        self.buffers = BatchBuffers(dataset)
 
         self.ignore_last = ignore_last
         self.batch_size = batch_size
@@ -40,22 +175,30 @@ class Batcher(object):
         self.step = 0
         self.epoch = 0
 
+        # rows are visited following a permutation of their positions,
+        # without shuffling the dataset
+        self.order = None
+        self.storage_order = None
+        if should_shuffle:
+            self.storage_order = dataset.get_storage_order()
+            # seeded from the global random state, batches gathered by a
+            # PrefetchBatcher thread do not draw from it
+            self.random_state = np.random.RandomState(
+                np.random.randint(np.iinfo(np.int32).max)
+            )
+        self.reset()
+
     def next_batch(self):
         if self.last_batch():
-            if self.should_shuffle:
-                self.dataset = shuffle_dict_unison_inplace(self.dataset)
             self.reset()
             self.epoch += 1
 
-        sub_batch = {}
-        for features_name in self.dataset.features:
-            sub_batch[features_name] = self.dataset.get(
-                features_name,
-                range(
-                    self.index,
-                    min(self.index + self.batch_size, self.total_size)
-                )
-            )
+        stop = min(self.index + self.batch_size, self.total_size)
+        if self.order is None:
+            idx = slice(self.index, stop)
+        else:
+            idx = self.order[self.index:stop]
+        sub_batch = self.buffers.gather(self.dataset.features, idx)
 
         self.index += self.batch_size
         self.step += 1
@@ -69,87 +212,173 @@ class Batcher(object):
     def reset(self):
         self.index = 0
         self.step = 0
+        # each pass over the dataset follows a new order
+        if self.should_shuffle:
+            self.order = shuffled_order(
+                self.dataset,
+                self.batch_size,
+                self.storage_order,
+                self.random_state
+            )
 
 
 class BucketedBatcher(object):
     def __init__(self, dataset, bucketing_field, batch_size=128, buckets=10,
                  should_shuffle=True, ignore_last=False,
-                 should_trim=False, trim_side='right'):
+                 should_trim=False, trim_side=None, trim_left=True,
+                 batch_tokens=None, padding_value=0):
         self.should_shuffle = should_shuffle
         self.bucketing_field = bucketing_field
+        # trimming is only correct for encoders whose output does not
+        # depend on the padding
         self.should_trim = should_trim
-        self.trim_side = trim_side
+        # when set, batches are capped by the number of elements of the
+        # padded bucketing field instead of the number of rows
+        self.batch_tokens = batch_tokens
 
         # store our dataset as well
         self.dataset = dataset
+        self.buffers = BatchBuffers(dataset)
 
-        field = dataset.get_dataset()[bucketing_field]
-        field_lengths = np.apply_along_axis(lambda x: np.sign(x).sum(), 1,
-                                            field)
-        sorted_idcs = np.argsort(field_lengths)
+        self.lengths = sequence_lengths(
+            dataset,
+            bucketing_field,
+            padding_value
+        )
+        first_rows = dataset.get(
+            bucketing_field,
+            slice(0, SEQUENCE_LENGTHS_CHUNK_SIZE)
+        )
+        self.max_length = first_rows.shape[1]
+        if trim_side is None:
+            # sequences padded on the left start with padding
+            left_padded = np.any(
+                (first_rows[:, 0] == padding_value) &
+                (self.lengths[:len(first_rows)] > 0)
+            )
+            trim_side = 'left' if left_padded else 'right'
+        if trim_side not in ('right', 'left'):
+            raise ValueError('Invalid trim side:', trim_side)
+        self.trim_side = trim_side
+        if trim_side == 'left' and not trim_left:
+            self.should_trim = False
+        sorted_idcs = np.argsort(self.lengths, kind='stable')
         self.buckets_idcs = []
-        datapoints_per_bucket = len(field) // buckets
+        datapoints_per_bucket = len(sorted_idcs) // buckets
         for b in range(buckets):
             start = datapoints_per_bucket * b
             end = datapoints_per_bucket * (b + 1) if b < buckets - 1 else len(
                 sorted_idcs)
             self.buckets_idcs.append(sorted_idcs[start:end])
 
-        if should_shuffle:
-            self.shuffle(self.buckets_idcs)
-
         self.ignore_last = ignore_last
         self.batch_size = batch_size
-        self.total_size = min(map(len, dataset.get_dataset().values()))
+        self.total_size = dataset.size
         self.bucket_sizes = np.array([x for x in map(len, self.buckets_idcs)])
         self.steps_per_epoch = int(
-            np.asscalar(np.sum(np.ceil(self.bucket_sizes / self.batch_size))))
-        self.indices = np.array([0] * buckets)
-        self.step = 0
+            np.sum(np.ceil(self.bucket_sizes / self.batch_size)))
+        self.batches = None
+        # seeded from the global random state, batches gathered by a
+        # PrefetchBatcher thread do not draw from it
+        self.random_state = np.random.RandomState(
+            np.random.randint(np.iinfo(np.int32).max)
+        )
+        self.reset()
         self.epoch = 0
 
     def shuffle(self, buckets_idcs):
         for i in range(len(buckets_idcs)):
-            np.random.shuffle(buckets_idcs[i])
+            self.random_state.shuffle(buckets_idcs[i])
+
+    def padded_lengths(self, lengths):
+        """
+        Returns the length the bucketing field of batches with rows of the
+        given lengths is padded to.
+        """
+        if not self.should_trim:
+            return np.full_like(lengths, self.max_length)
+        # the lengths are rounded up to limit the number of distinct
+        # shapes kernels are tuned for
+        return np.minimum(
+            TRIM_LENGTH_MULTIPLE * np.ceil(
+                np.maximum(lengths, 1) / TRIM_LENGTH_MULTIPLE
+            ).astype(np.int64),
+            self.max_length
+        )
+
+    def token_batches(self):
+        """
+        Splits the rows sorted by length into batches whose padded
+        bucketing field has at most batch_tokens elements.
+        :return: list of arrays with the positions of the rows of a batch
+        """
+        # the buckets hold consecutive ranges of lengths, their rows are
+        # sorted longest first so the first row of a batch sets its padded
+        # length, rows of the same length are in random order
+        rows = np.concatenate(self.buckets_idcs)
+        if self.should_shuffle:
+            ties = self.random_state.random_sample(len(rows))
+        else:
+            ties = np.arange(len(rows))
+        rows = rows[np.lexsort((ties, -self.lengths[rows]))]
+        padded_lengths = self.padded_lengths(self.lengths[rows])
+
+        batches = []
+        start = 0
+        while start < len(rows):
+            rows_per_batch = max(self.batch_tokens // padded_lengths[start], 1)
+            if self.ignore_last and start + rows_per_batch > len(rows):
+                break
+            batches.append(rows[start:start + rows_per_batch])
+            start += rows_per_batch
+        if self.should_shuffle:
+            batches = [
+                batches[i]
+                for i in self.random_state.permutation(len(batches))
+            ]
+        return batches
 
     def next_batch(self):
         if self.last_batch():
-            if self.should_shuffle:
-                self.shuffle(self.buckets_idcs)
             self.reset()
             self.epoch += 1
 
-        if self.ignore_last:
-            idcs_below_size = self.indices + self.batch_size < self.bucket_sizes
+        if self.batches is not None:
+            i = None
+            selected_idcs = self.batches[self.step]
         else:
-            idcs_below_size = self.indices < self.bucket_sizes
-        i = np.random.choice(
-            np.arange(0, len(self.buckets_idcs))[idcs_below_size])
-
-        selected_bucket = self.buckets_idcs[i]
-        selected_idcs = selected_bucket[
-                        self.indices[i]:self.indices[i] + self.batch_size]
-
-        sub_batch = {}
-        for key in self.dataset.get_dataset():
-            if key == self.bucketing_field and self.should_trim:
-                selected_samples = self.dataset.get(key, selected_idcs)
-                max_length = np.sign(selected_samples).sum(axis=1).max()
-                if self.trim_side == 'right':
-                    sub_batch[key] = selected_samples[:, :max_length]
-                elif self.trim_side == 'left':
-                    sub_batch[key] = selected_samples[:, -max_length:]
-                else:
-                    raise ValueError('Invalid trim side:', self.trim_side)
-
+            if self.ignore_last:
+                idcs_below_size = (
+                        self.indices + self.batch_size < self.bucket_sizes
+                )
+            else:
+                idcs_below_size = self.indices < self.bucket_sizes
+            i = self.random_state.choice(
+                np.arange(0, len(self.buckets_idcs))[idcs_below_size])
+
+            selected_bucket = self.buckets_idcs[i]
+            selected_idcs = selected_bucket[
+                            self.indices[i]:self.indices[i] + self.batch_size]
+
+        sub_batch = self.buffers.gather(self.dataset.features, selected_idcs)
+        if self.should_trim:
+            length = self.padded_lengths(
+                self.lengths[selected_idcs].max(keepdims=True)
+            )[0]
+            selected_samples = sub_batch[self.bucketing_field]
+            if self.trim_side == 'right':
+                sub_batch[self.bucketing_field] = selected_samples[:, :length]
             else:
-                sub_batch[key] = self.dataset.get(key, selected_idcs)
+                sub_batch[self.bucketing_field] = selected_samples[:, -length:]
 
-        self.indices[i] += self.batch_size
+        if i is not None:
+            self.indices[i] += self.batch_size
         self.step += 1
         return sub_batch
 
     def last_batch(self):
+        if self.batches is not None:
+            return self.step >= len(self.batches)
         return not np.any(self.indices < self.bucket_sizes) \
                or (self.ignore_last and
                    not np.any(
@@ -159,6 +388,13 @@ class BucketedBatcher(object):
     def reset(self):
         self.indices = np.array([0] * len(self.buckets_idcs))
         self.step = 0
+        # the indices of each bucket are shuffled, not the dataset
+        if self.should_shuffle:
+            self.shuffle(self.buckets_idcs)
+        if self.batch_tokens is not None:
+            # the number of batches depends on how the rows are grouped
+            self.batches = self.token_batches()
+            self.steps_per_epoch = len(self.batches)
 
 
 class DistributedBatcher(object):
@@ -174,37 +410,37 @@ class DistributedBatcher(object):
             self.partition = (partition_size * partition_number,
                               partition_size * (partition_number + 1))
         self.dataset = dataset
-        if should_shuffle:
-            shuffle_inplace(self.dataset.get_dataset())
+        self.buffers = BatchBuffers(dataset)
 
         self.ignore_last = ignore_last
         self.batch_size = batch_size
         self.total_size = self.partition[1] - self.partition[0]
         self.steps_per_epoch = int(math.ceil(self.total_size / self.batch_size))
-        self.index = self.partition[0]
         self.max_index = self.partition[1]
         self.step = 0
         self.epoch = 0
 
+        # all the workers draw the same permutation of the whole dataset
+        # and visit their own partition of it
+        self.order = None
+        self.storage_order = None
+        self.num_shuffles = 0
+        if should_shuffle:
+            self.storage_order = dataset.get_storage_order()
+            self.random_seed = np.random.randint(np.iinfo(np.int32).max)
+        self.reset()
+
     def next_batch(self):
         if self.last_batch():
-            if self.should_shuffle:
-                self.dataset = shuffle_dict_unison_inplace(
-                    self.dataset,
-                    np.random.RandomState(self.epoch)
-                )
             self.reset()
             self.epoch += 1
 
-        sub_batch = {}
-        for features_name in self.dataset.features:
-            sub_batch[features_name] = self.dataset.get(
-                features_name,
-                range(
-                    self.index,
-                    min(self.index + self.batch_size, self.max_index)
-                )
-            )
+        stop = min(self.index + self.batch_size, self.max_index)
+        if self.order is None:
+            idx = slice(self.index, stop)
+        else:
+            idx = self.order[self.index:stop]
+        sub_batch = self.buffers.gather(self.dataset.features, idx)
 
         self.index += self.batch_size
         self.step += 1
@@ -218,63 +454,328 @@ class DistributedBatcher(object):
     def reset(self):
         self.index = self.partition[0]
         self.step = 0
+        if self.should_shuffle:
+            self.order = shuffled_order(
+                self.dataset,
+                self.batch_size,
+                self.storage_order,
+                np.random.RandomState(self.random_seed + self.num_shuffles)
+            )
+            self.num_shuffles += 1
+
+
+class PrefetchBatcher(object):
+    """
+    Wraps a batcher and gathers its next batches in a background thread
+    while the current batch is used, following the same next_batch,
+    last_batch and reset protocol. The time spent waiting for the batches
+    is accumulated in wait_time.
+    """
+
+    # marks the end of the batches of the epoch in the queue
+    _END = object()
+
+    def __init__(self, batcher, prefetch_batches=2):
+        self.batcher = batcher
+        self.prefetch_batches = prefetch_batches
+        # the prefetched batches and the one being gathered need their own
+        # buffers on top of the ones of the batches in use
+        batcher.buffers = BatchBuffers(
+            batcher.dataset,
+            num_buffers=prefetch_batches + BATCH_BUFFERS + 2
+        )
+        self.step = 0
+        self.epoch = 0
+        self.wait_time = 0.0
+        self._queue = None
+        self._thread = None
+        self._stop = None
+        self._next = None
+
+    @property
+    def batch_size(self):
+        return self.batcher.batch_size
+
+    @batch_size.setter
+    def batch_size(self, batch_size):
+        # batches already prefetched keep the previous size
+        self.batcher.batch_size = batch_size
+
+    @property
+    def steps_per_epoch(self):
+        return self.batcher.steps_per_epoch
+
+    @property
+    def dataset(self):
+        return self.batcher.dataset
+
+    def _produce(self, batch_queue, stop):
+        try:
+            while not self.batcher.last_batch() and not stop.is_set():
+                batch_queue.put(self.batcher.next_batch())
+            batch_queue.put(self._END)
+        except Exception as e:
+            batch_queue.put(e)
+
+    def _start(self):
+        # started lazily, so that changes of the batch size made after
+        # a reset apply to the next epoch
+        if self._thread is None:
+            self._queue = queue.Queue(maxsize=self.prefetch_batches)
+            self._stop = threading.Event()
+            self._thread = threading.Thread(
+                target=self._produce,
+                args=(self._queue, self._stop),
+                daemon=True
+            )
+            self._thread.start()
+
+    def _stop_producer(self):
+        if self._thread is not None:
+            self._stop.set()
+            # unblocks the producer waiting for a free slot
+            while self._thread.is_alive():
+                try:
+                    self._queue.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+            self._thread.join()
+        self._thread = None
+        self._next = None
+
+    def _peek(self):
+        if self._next is None:
+            self._start()
+            start_time = time.perf_counter()
+            self._next = self._queue.get()
+            self.wait_time += time.perf_counter() - start_time
+            if isinstance(self._next, Exception):
+                e = self._next
+                self._stop_producer()
+                raise e
+        return self._next
 
+    def next_batch(self):
+        if self.last_batch():
+            self.reset()
+            self.epoch += 1
 
-# todo future: reintroduce the bucketed batcher
-# def initialize_batcher(dataset, batch_size=128, bucketing_field=None,
-#                        input_features=None, preprocessing=None,
-#                        should_shuffle=True, ignore_last=False, horovod=None):
-#     if horovod:
-#         batcher = DistributedBatcher(
-#             dataset,
-#             horovod.rank(),
-#             horovod,
-#             batch_size,
-#             should_shuffle=should_shuffle,
-#             ignore_last=ignore_last
-#         )
-#     elif bucketing_field is not None:
-#         bucketing_feature = [
-#             feature for feature in input_features if
-#             feature[NAME] == bucketing_field
-#         ]
-#         if not bucketing_feature:
-#             raise ValueError(
-#                 'Bucketing field {} not present in input features'.format(
-#                     bucketing_field
-#                 )
-#             )
-#         else:
-#             bucketing_feature = bucketing_feature[0]
-#         should_trim = bucketing_feature[
-#                           'encoder'] in dynamic_length_encoders
-#         if 'preprocessing' in bucketing_feature:
-#             trim_side = bucketing_feature['preprocessing']['padding']
-#         else:
-#             trim_side = preprocessing[bucketing_feature[TYPE]]['padding']
-#
-#         batcher = BucketedBatcher(
-#             dataset,
-#             bucketing_field=bucketing_field,
-#             batch_size=batch_size,
-#             buckets=10,
-#             ignore_last=ignore_last,
-#             should_shuffle=should_shuffle,
-#             should_trim=should_trim,
-#             trim_side=trim_side
-#         )
-#     else:
-#         batcher = Batcher(
-#             dataset,
-#             batch_size,
-#             should_shuffle=should_shuffle,
-#             ignore_last=ignore_last
-#         )
-#     return batcher
-
-def initialize_batcher(dataset, batch_size=128,
+        batch = self._peek()
+        self._next = None
+        self.step += 1
+        return batch
+
+    def last_batch(self):
+        return self._peek() is self._END
+
+    def reset(self):
+        self._stop_producer()
+        self.batcher.reset()
+        self.step = 0
+
+    def close(self):
+        self._stop_producer()
+
+
+def initialize_tf_dataset(dataset, batch_size=128, should_shuffle=True,
+                          ignore_last=False, horovod=None, cache=False):
+    """
+    Exposes a Dataset as a tf.data.Dataset of batches, dictionaries with
+    a tensor for each feature. The rows of each batch are gathered by
+    parallel map calls and batches are prefetched, with the parallelism
+    autotuned by tf.data.
+    :param dataset: Dataset
+    :param batch_size: size of the batches
+    :param should_shuffle: visit the rows in a new random order every
+           time the tf.data.Dataset is iterated
+    :param ignore_last: drop the last batch if it is smaller
+    :param horovod: horovod module, each worker gets a shard of the rows
+    :param cache: if True the gathered rows are cached in memory the first
+           time they are iterated, if a string in files with that prefix.
+           Cached rows are shuffled within a buffer of
+           TF_DATA_SHUFFLE_BUFFER_SIZE rows
+    :return: tf.data.Dataset
+    """
+    feature_names = list(dataset.features)
+    # dtype and shape of the rows of each feature
+    row_specs = {}
+    for feature_name in feature_names:
+        row = dataset.get(feature_name, [0])
+        row_specs[feature_name] = (tf.as_dtype(row.dtype), row.shape[1:])
+
+    def gather(idx):
+        return [dataset.get(feature_name, idx)
+                for feature_name in feature_names]
+
+    def gather_batch(idx):
+        values = tf.numpy_function(
+            gather,
+            [idx],
+            [row_specs[feature_name][0] for feature_name in feature_names]
+        )
+        batch = {}
+        for feature_name, value in zip(feature_names, values):
+            value.set_shape((None,) + row_specs[feature_name][1])
+            batch[feature_name] = value
+        return batch
+
+    # drawn after the random seed is set, the same for every worker
+    random_seed = np.random.randint(np.iinfo(np.int32).max)
+    storage_order = None
+    if should_shuffle:
+        storage_order = dataset.get_storage_order()
+    num_shuffles = itertools.count()
+
+    def generate_order():
+        # called each time the pipeline is iterated
+        if should_shuffle and cache is False:
+            yield shuffled_order(
+                dataset,
+                batch_size,
+                storage_order,
+                np.random.RandomState(random_seed + next(num_shuffles))
+            )
+        else:
+            yield np.arange(dataset.size)
+
+    rows = tf.data.Dataset.from_generator(
+        generate_order,
+        output_types=tf.int64,
+        output_shapes=(None,)
+    ).unbatch()
+    if horovod:
+        rows = rows.shard(horovod.size(), horovod.rank())
+
+    if cache is False:
+        tf_dataset = rows.batch(
+            batch_size,
+            drop_remainder=ignore_last
+        ).map(
+            gather_batch,
+            num_parallel_calls=tf.data.experimental.AUTOTUNE
+        )
+    else:
+        tf_dataset = rows.batch(batch_size).map(
+            gather_batch,
+            num_parallel_calls=tf.data.experimental.AUTOTUNE
+        ).unbatch().cache('' if cache is True else cache)
+        if should_shuffle:
+            tf_dataset = tf_dataset.shuffle(
+                min(dataset.size, TF_DATA_SHUFFLE_BUFFER_SIZE),
+                seed=random_seed,
+                reshuffle_each_iteration=True
+            )
+        tf_dataset = tf_dataset.batch(batch_size, drop_remainder=ignore_last)
+    return tf_dataset.prefetch(tf.data.experimental.AUTOTUNE)
+
+
+class TFDatasetBatcher(object):
+    """
+    Iterates the tf.data.Dataset built by initialize_tf_dataset following
+    the next_batch, last_batch and reset protocol of the batchers.
+    Batches are dictionaries of tensors. The time spent waiting for the
+    batches is accumulated in wait_time.
+    """
+
+    def __init__(self, dataset, batch_size=128, should_shuffle=True,
+                 ignore_last=False, horovod=None, cache=False):
+        self.dataset = dataset
+        self.should_shuffle = should_shuffle
+        self.ignore_last = ignore_last
+        self.horovod = horovod
+        self.cache = cache
+        self._batch_size = batch_size
+        self.total_size = dataset.size
+        if horovod:
+            self.total_size = int(math.ceil(dataset.size / horovod.size()))
+        self.step = 0
+        self.epoch = 0
+        self.wait_time = 0.0
+        self._tf_dataset = None
+        self._iterator = None
+        self._next = None
+
+    @property
+    def batch_size(self):
+        return self._batch_size
+
+    @batch_size.setter
+    def batch_size(self, batch_size):
+        if batch_size != self._batch_size:
+            # applies from the next iteration of the pipeline
+            self._batch_size = batch_size
+            self._tf_dataset = None
+
+    @property
+    def steps_per_epoch(self):
+        return int(math.ceil(self.total_size / self.batch_size))
+
+    def get_tf_dataset(self):
+        if self._tf_dataset is None:
+            self._tf_dataset = initialize_tf_dataset(
+                self.dataset,
+                self.batch_size,
+                should_shuffle=self.should_shuffle,
+                ignore_last=self.ignore_last,
+                horovod=self.horovod,
+                cache=self.cache
+            )
+        return self._tf_dataset
+
+    def _peek(self):
+        if self._next is None:
+            if self._iterator is None:
+                self._iterator = iter(self.get_tf_dataset())
+            start_time = time.perf_counter()
+            self._next = self._iterator.get_next_as_optional()
+            self.wait_time += time.perf_counter() - start_time
+        return self._next
+
+    def next_batch(self):
+        if self.last_batch():
+            self.reset()
+            self.epoch += 1
+
+        batch = self._peek().get_value()
+        self._next = None
+        self.step += 1
+        return batch
+
+    def last_batch(self):
+        return not self._peek().has_value()
+
+    def reset(self):
+        self._iterator = None
+        self._next = None
+        self.step = 0
+
+
+def initialize_batcher(dataset, batch_size=128, bucketing_field=None,
+                       batch_tokens=None, trim_padding=False, padding_value=0,
                        should_shuffle=True, ignore_last=False,
-                       horovod=None):
+                       horovod=None, prefetch_batches=0,
+                       input_pipeline='batcher', tf_data_cache=False):
+    if input_pipeline == 'tf_data':
+        # tf.data prefetches the batches itself
+        return TFDatasetBatcher(
+            dataset,
+            batch_size,
+            should_shuffle=should_shuffle,
+            ignore_last=ignore_last,
+            horovod=horovod,
+            cache=tf_data_cache
+        )
+    elif input_pipeline != 'batcher':
+        raise ValueError(
+            'Invalid input pipeline {}, valid pipelines are: '
+            'batcher, tf_data'.format(input_pipeline)
+        )
+
+    if batch_tokens is not None and bucketing_field is None:
+        raise ValueError(
+            'Batching by number of tokens requires a bucketing field'
+        )
+
     if horovod:
         batcher = DistributedBatcher(
             dataset,
@@ -284,6 +785,38 @@ def initialize_batcher(dataset, batch_size=128,
             should_shuffle=should_shuffle,
             ignore_last=ignore_last
         )
+    elif bucketing_field is not None:
+        if bucketing_field not in dataset.input_features:
+            raise ValueError(
+                'Bucketing field {} not present in input features'.format(
+                    bucketing_field
+                )
+            )
+        # trim_padding tells that the encoder output of the bucketing field
+        # does not depend on the padding at the end of the sequences, left
+        # padding is kept. padding_value is the index of the padding symbol
+        # of the bucketing field
+        batcher = BucketedBatcher(
+            dataset,
+            bucketing_field=bucketing_field,
+            batch_size=batch_size,
+            buckets=10,
+            ignore_last=ignore_last,
+            should_shuffle=should_shuffle,
+            should_trim=trim_padding,
+            trim_left=False,
+            batch_tokens=batch_tokens,
+            padding_value=padding_value
+        )
+        if batch_tokens is not None and not batcher.should_trim:
+            logger.warning(
+                'The padding of {} is not trimmed for its encoder, batches '
+                'of {} tokens have {} rows'.format(
+                    bucketing_field,
+                    batch_tokens,
+                    max(batch_tokens // batcher.max_length, 1)
+                )
+            )
     else:
         batcher = Batcher(
             dataset,
@@ -291,4 +824,6 @@ def initialize_batcher(dataset, batch_size=128,
             should_shuffle=should_shuffle,
             ignore_last=ignore_last
         )
+    if prefetch_batches > 0:
+        batcher = PrefetchBatcher(batcher, prefetch_batches)
     return batcher
\ No newline at end of file
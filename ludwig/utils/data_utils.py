@@ -23,11 +23,14 @@ import os.path
 import pickle
 import random
 import re
+import shutil
+import sys
 
 import h5py
 import numpy as np
 import pandas as pd
 from pandas.errors import ParserError
+from scipy import sparse
 from sklearn.model_selection import KFold
 
 from ludwig.constants import SPLIT, PREPROCESSING, NAME
@@ -37,10 +40,21 @@ from ludwig.globals import MODEL_HYPERPARAMETERS_FILE_NAME, \
 logger = logging.getLogger(__name__)
 
 DATA_TRAIN_HDF5_FP = 'data_train_hdf5_fp'
+DATA_FINGERPRINT = 'data_fingerprint'
+PREPROCESSING_FINGERPRINT = 'preprocessing_fingerprint'
 DICT_FORMATS = {'dict', 'dictionary', dict}
 DATAFRAME_FORMATS = {'dataframe', 'df', pd.DataFrame}
 CSV_FORMATS = {'csv'}
 HDF5_FORMATS = {'hdf5', 'h5'}
+PARQUET_FORMATS = {'parquet'}
+FEATHER_FORMATS = {'feather'}
+NPY_FORMATS = {'npy'}
+COLUMNAR_FORMATS = PARQUET_FORMATS | FEATHER_FORMATS
+
+NPY_DIR_METADATA_FILE_NAME = 'metadata.json'
+
+# bytes of the chunks of the datasets appended to hdf5 files
+HDF5_CHUNK_SIZE = 1 << 20
 
 
 def get_abs_path(data_csv_path, file_path):
@@ -67,7 +81,58 @@ def read_csv(data_fp, header=0, nrows=None, skiprows=None):
     :param skiprows: number of rows to skip from the csv, None means no skips
     :return: Pandas dataframe with the data
     """
+    separator = _sniff_csv_separator(data_fp)
+
+    try:
+        df = pd.read_csv(data_fp, sep=separator, header=header,
+                         nrows=nrows, skiprows=skiprows)
+    except ParserError:
+        logger.warning('Failed to parse the CSV with pandas default way,'
+                       ' trying \\ as escape character.')
+        df = pd.read_csv(data_fp, sep=separator, header=header,
+                         escapechar='\\',
+                         nrows=nrows, skiprows=skiprows)
+
+    return df
 
+
+def read_csv_chunks(data_fp, chunk_size, header=0, columns=None):
+    """
+    Helper method to read a csv file in chunks of rows, so that files larger
+    than the available memory can be processed
+    :param data_fp: path to the csv file
+    :param chunk_size: number of rows of each chunk
+    :param header: header argument for pandas to read the csv
+    :param columns: names of the columns to read, None means all
+    :return: iterator over Pandas dataframes
+    """
+    usecols = None
+    if columns is not None:
+        columns = set(columns)
+        usecols = lambda column: column in columns
+    separator = _sniff_csv_separator(data_fp)
+
+    num_rows = 0
+    try:
+        for chunk in pd.read_csv(data_fp, sep=separator, header=header,
+                                 usecols=usecols, chunksize=chunk_size):
+            num_rows += len(chunk)
+            yield chunk
+    except ParserError:
+        logger.warning('Failed to parse the CSV with pandas default way,'
+                       ' trying \\ as escape character.')
+        # the rows of the chunks already returned are skipped
+        for chunk in pd.read_csv(data_fp, sep=separator, header=header,
+                                 escapechar='\\', usecols=usecols,
+                                 chunksize=chunk_size):
+            if num_rows >= len(chunk):
+                num_rows -= len(chunk)
+                continue
+            yield chunk.iloc[num_rows:]
+            num_rows = 0
+
+
+def _sniff_csv_separator(data_fp):
     separator = ','
     with open(data_fp, 'r', encoding="utf8") as csvfile:
         try:
@@ -77,18 +142,71 @@ def read_csv(data_fp, header=0, nrows=None, skiprows=None):
         except csv.Error:
             # Could not conclude the delimiter, defaulting to comma
             pass
+    return separator
+
+
+def _columnar_schema_names(data_fp, file_format):
+    return _columnar_dataset(data_fp, file_format).schema.names
+
 
+def _columnar_dataset(data_fp, file_format):
     try:
-        df = pd.read_csv(data_fp, sep=separator, header=header,
-                         nrows=nrows, skiprows=skiprows)
-    except ParserError:
-        logger.warning('Failed to parse the CSV with pandas default way,'
-                       ' trying \\ as escape character.')
-        df = pd.read_csv(data_fp, sep=separator, header=header,
-                         escapechar='\\',
-                         nrows=nrows, skiprows=skiprows)
+        import pyarrow.dataset
+    except ImportError:
+        logger.error(
+            ' pyarrow is not installed. '
+            'In order to read Parquet and Feather files run '
+            'pip install pyarrow'
+        )
+        sys.exit(-1)
+    return pyarrow.dataset.dataset(data_fp, format=file_format)
 
-    return df
+
+def read_parquet(data_fp, columns=None):
+    """
+    Helper method to read a Parquet file. Only the columns in `columns`
+    that are present in the file are read, the others are skipped without
+    being decoded, and the native dtypes of the columns are preserved.
+    :param data_fp: path to the parquet file
+    :param columns: names of the columns to read, None means all
+    :return: Pandas dataframe with the data
+    """
+    if columns is not None:
+        available_columns = set(_columnar_schema_names(data_fp, 'parquet'))
+        columns = [c for c in columns if c in available_columns]
+    return pd.read_parquet(data_fp, columns=columns)
+
+
+def read_feather(data_fp, columns=None):
+    """
+    Helper method to read a Feather (Arrow IPC) file. Works like
+    `read_parquet`, only the columns in `columns` are read.
+    :param data_fp: path to the feather file
+    :param columns: names of the columns to read, None means all
+    :return: Pandas dataframe with the data
+    """
+    if columns is not None:
+        available_columns = set(_columnar_schema_names(data_fp, 'feather'))
+        columns = [c for c in columns if c in available_columns]
+    return pd.read_feather(data_fp, columns=columns)
+
+
+def read_parquet_chunks(data_fp, chunk_size, columns=None):
+    """
+    Helper method to read a Parquet file in batches of rows, only decoding
+    the columns in `columns` that are present in the file.
+    :param data_fp: path to the parquet file
+    :param chunk_size: maximum number of rows of each chunk
+    :param columns: names of the columns to read, None means all
+    :return: iterator over Pandas dataframes
+    """
+    parquet_dataset = _columnar_dataset(data_fp, 'parquet')
+    if columns is not None:
+        available_columns = set(parquet_dataset.schema.names)
+        columns = [c for c in columns if c in available_columns]
+    for batch in parquet_dataset.to_batches(columns=columns,
+                                            batch_size=chunk_size):
+        yield batch.to_pandas()
 
 
 def save_csv(data_fp, data):
@@ -127,7 +245,194 @@ def load_hdf5(data_fp):
     data = {}
     with h5py.File(data_fp, 'r') as h5_file:
         for key in h5_file.keys():
-            data[key] = h5_file[key][()]
+            data[key] = read_hdf5_value(h5_file[key])
+    return data
+
+
+def read_hdf5_value(h5_value):
+    """
+    Reads a value written by save_hdf5 or append_hdf5. Sparse matrices are
+    stored as a group with the data, indices and indptr arrays of their
+    CSR representation and are returned as scipy CSR matrices.
+    :param h5_value: hdf5 dataset or group
+    :return: numpy array or scipy CSR matrix
+    """
+    if isinstance(h5_value, h5py.Group):
+        return sparse.csr_matrix(
+            (
+                h5_value['data'][()],
+                h5_value['indices'][()],
+                h5_value['indptr'][()]
+            ),
+            shape=tuple(h5_value.attrs['shape'])
+        )
+    return h5_value[()]
+
+
+def read_hdf5_rows(h5_value, rows):
+    """
+    Reads some rows of a value written by save_hdf5 or append_hdf5 without
+    loading the whole value.
+    :param h5_value: hdf5 dataset or group of a sparse matrix
+    :param rows: strictly increasing indices of the rows to read
+    :return: numpy array or scipy CSR matrix with the rows
+    """
+    if isinstance(h5_value, h5py.Group):
+        data = h5_value['data']
+        indices = h5_value['indices']
+        runs_data = [np.empty(0, dtype=data.dtype)]
+        runs_indices = [np.empty(0, dtype=indices.dtype)]
+        row_lengths = [np.empty(0, dtype=np.int64)]
+        # each run of consecutive rows is read with a single slice of
+        # indptr, data and indices
+        for start, end in _get_group_bounds(rows - np.arange(len(rows))):
+            run_indptr = h5_value['indptr'][rows[start]:rows[end - 1] + 2]
+            runs_data.append(data[run_indptr[0]:run_indptr[-1]])
+            runs_indices.append(indices[run_indptr[0]:run_indptr[-1]])
+            row_lengths.append(np.diff(run_indptr))
+        row_indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum(np.concatenate(row_lengths), out=row_indptr[1:])
+        return sparse.csr_matrix(
+            (
+                np.concatenate(runs_data),
+                np.concatenate(runs_indices),
+                row_indptr
+            ),
+            shape=(len(rows), h5_value.attrs['shape'][1])
+        )
+    # each chunk of rows is read with a single slice, much faster than
+    # selecting the rows one by one
+    chunk_size = (h5_value.chunks or get_row_chunks(h5_value))[0]
+    data = np.empty((len(rows),) + h5_value.shape[1:], dtype=h5_value.dtype)
+    for start, end in _get_group_bounds(rows // chunk_size):
+        first_row = rows[start]
+        data[start:end] = h5_value[first_row:rows[end - 1] + 1][
+            rows[start:end] - first_row
+        ]
+    return data
+
+
+def _get_group_bounds(group_ids):
+    """
+    Returns the start and end positions of the runs of equal values
+    of group_ids.
+    """
+    if len(group_ids) == 0:
+        return []
+    bounds = np.concatenate(
+        ([0], np.flatnonzero(np.diff(group_ids)) + 1, [len(group_ids)])
+    )
+    return zip(bounds[:-1], bounds[1:])
+
+
+def get_hdf5_num_rows(h5_value):
+    if isinstance(h5_value, h5py.Group):
+        return h5_value.attrs['shape'][0]
+    return h5_value.shape[0]
+
+
+def out_of_core_data_key(key):
+    """
+    Key of the hdf5 dataset holding the rows of a feature that is not kept
+    in memory, the in memory dataset only holds the indices of its rows.
+    """
+    return key + '_data'
+
+
+def append_out_of_core_data(data_fp, data, key):
+    """
+    Appends data[key] to the out of core data of key in a hdf5 file and
+    replaces it with the indices of its rows in the file.
+    :param data_fp: path to the hdf5 file
+    :param data: dictionary of numpy arrays or scipy sparse matrices
+    :param key: key of the value to move to the hdf5 file
+    """
+    data_key = out_of_core_data_key(key)
+    num_rows = 0
+    if os.path.isfile(data_fp):
+        with h5py.File(data_fp, 'r') as h5_file:
+            if data_key in h5_file:
+                num_rows = get_hdf5_num_rows(h5_file[data_key])
+    if data[key].shape[0] > 0:
+        append_hdf5(data_fp, {data_key: data[key]})
+    data[key] = np.arange(num_rows, num_rows + data[key].shape[0])
+
+
+def save_npy_dir(data_dir, data, metadata=None):
+    """
+    Saves each value of data as a raw .npy file in a directory, so that it
+    can be memory mapped by load_npy_dir. Sparse matrices are saved as a
+    subdirectory with the data, indices, indptr and shape of their CSR
+    representation. A previous content of the directory is replaced.
+    :param data_dir: path to the directory
+    :param data: dictionary of numpy arrays or scipy sparse matrices
+    :param metadata: train set metadata, saved as a json file in the directory
+    """
+    if os.path.isdir(data_dir):
+        shutil.rmtree(data_dir)
+    os.makedirs(data_dir)
+    for key, value in data.items():
+        if sparse.issparse(value):
+            value = value.tocsr()
+            sparse_dir = os.path.join(data_dir, key)
+            os.makedirs(sparse_dir)
+            for name, array in (
+                    ('data', value.data),
+                    ('indices', value.indices),
+                    ('indptr', value.indptr),
+                    ('shape', np.array(value.shape))
+            ):
+                np.save(os.path.join(sparse_dir, name + '.npy'), array)
+        else:
+            np.save(os.path.join(data_dir, key + '.npy'), np.asarray(value))
+    if metadata is not None:
+        save_npy_dir_metadata(data_dir, metadata)
+
+
+def save_npy_dir_metadata(data_dir, metadata):
+    save_json(os.path.join(data_dir, NPY_DIR_METADATA_FILE_NAME), metadata)
+
+
+def load_npy_dir_metadata(data_dir):
+    metadata_fp = os.path.join(data_dir, NPY_DIR_METADATA_FILE_NAME)
+    if not os.path.isfile(metadata_fp):
+        return None
+    return load_json(metadata_fp)
+
+
+def load_npy_dir(data_dir, keys=None):
+    """
+    Loads the values saved by save_npy_dir memory mapping their files:
+    loading is instant, rows are read from the page cache when they are
+    accessed and processes reading the same directory share its pages.
+    :param data_dir: path to the directory
+    :param keys: keys to load, all of them if None
+    :return: dictionary of read only memory mapped numpy arrays
+             and scipy CSR matrices
+    """
+    if keys is None:
+        keys = [
+            os.path.splitext(file_name)[0]
+            for file_name in sorted(os.listdir(data_dir))
+            if file_name != NPY_DIR_METADATA_FILE_NAME
+        ]
+    data = {}
+    for key in keys:
+        value_fp = os.path.join(data_dir, key)
+        if os.path.isdir(value_fp):
+            # scipy keeps the memory mapped arrays of the CSR representation
+            data[key] = sparse.csr_matrix(
+                tuple(
+                    np.load(
+                        os.path.join(value_fp, name + '.npy'),
+                        mmap_mode='r'
+                    )
+                    for name in ('data', 'indices', 'indptr')
+                ),
+                shape=tuple(np.load(os.path.join(value_fp, 'shape.npy')))
+            )
+        else:
+            data[key] = np.load(value_fp + '.npy', mmap_mode='r')
     return data
 
 
@@ -140,13 +445,114 @@ def save_hdf5(data_fp, data, metadata=None):
         mode = 'r+'
     with h5py.File(data_fp, mode) as h5_file:
         for key, value in data.items():
-            dataset = h5_file.create_dataset(key, data=value)
-            if key in metadata:
-                if 'in_memory' in metadata[key]['preprocessing']:
-                    if metadata[key]['preprocessing']['in_memory']:
-                        dataset.attrs['in_memory'] = True
-                    else:
-                        dataset.attrs['in_memory'] = False
+            if sparse.issparse(value):
+                dataset = _create_sparse_hdf5_group(h5_file, key, value)
+            else:
+                dataset = h5_file.create_dataset(key, data=value)
+            _set_in_memory_attr(dataset, metadata.get(key))
+
+
+def append_hdf5(data_fp, data, metadata=None):
+    """
+    Appends data to the datasets of a HDF5 file along the first axis.
+    Datasets that are not in the file yet are created resizable, so that
+    data can be written one chunk of rows at a time.
+    :param data_fp: path to the hdf5 file
+    :param data: dictionary of numpy arrays with the same number of rows
+    :param metadata: train set metadata
+    """
+    if metadata is None:
+        metadata = {}
+    with h5py.File(data_fp, 'a') as h5_file:
+        for key, value in data.items():
+            if sparse.issparse(value):
+                if key not in h5_file:
+                    group = _create_sparse_hdf5_group(
+                        h5_file,
+                        key,
+                        value,
+                        resizable=True
+                    )
+                    _set_in_memory_attr(group, metadata.get(key))
+                else:
+                    _append_sparse_hdf5_group(h5_file[key], value)
+                continue
+
+            value = np.asarray(value)
+            if key not in h5_file:
+                dataset = h5_file.create_dataset(
+                    key,
+                    data=value,
+                    maxshape=(None,) + value.shape[1:],
+                    chunks=get_row_chunks(value)
+                )
+                _set_in_memory_attr(dataset, metadata.get(key))
+            else:
+                dataset = h5_file[key]
+                num_rows = dataset.shape[0]
+                dataset.resize(num_rows + value.shape[0], axis=0)
+                dataset[num_rows:] = value
+
+
+def get_row_chunks(value):
+    """
+    Chunk shape of a resizable hdf5 dataset holding value: each chunk
+    contains whole rows and about HDF5_CHUNK_SIZE bytes, so that reading
+    consecutive rows reads consecutive chunks.
+    :param value: numpy array or hdf5 dataset
+    :return: chunk shape
+    """
+    row_shape = tuple(max(dim, 1) for dim in value.shape[1:])
+    row_size = value.dtype.itemsize * int(np.prod(row_shape))
+    return (max(HDF5_CHUNK_SIZE // row_size, 1),) + row_shape
+
+
+def _create_sparse_hdf5_group(h5_file, key, value, resizable=False):
+    value = value.tocsr()
+    group = h5_file.create_group(key)
+    group.attrs['shape'] = value.shape
+    for name, array in (
+            ('data', value.data),
+            ('indices', value.indices),
+            # int64 so that appended chunks can exceed 2^31 values
+            ('indptr', value.indptr.astype(np.int64))
+    ):
+        if resizable:
+            group.create_dataset(
+                name,
+                data=array,
+                maxshape=(None,),
+                chunks=True
+            )
+        else:
+            group.create_dataset(name, data=array)
+    return group
+
+
+def _append_sparse_hdf5_group(group, value):
+    value = value.tocsr()
+    num_values = group['indptr'][-1]
+    # indptr of the appended rows continue from the last stored offset
+    for name, array in (
+            ('data', value.data),
+            ('indices', value.indices),
+            ('indptr', value.indptr[1:] + num_values)
+    ):
+        dataset = group[name]
+        num_rows = dataset.shape[0]
+        dataset.resize(num_rows + array.shape[0], axis=0)
+        dataset[num_rows:] = array
+    num_rows, num_columns = group.attrs['shape']
+    group.attrs['shape'] = (num_rows + value.shape[0], num_columns)
+
+
+def _set_in_memory_attr(dataset, feature_metadata):
+    if feature_metadata is not None:
+        if 'in_memory' in feature_metadata['preprocessing']:
+            if feature_metadata['preprocessing']['in_memory']:
+                dataset.attrs['in_memory'] = True
+            else:
+                dataset.attrs['in_memory'] = False
 
 
 def load_object(object_fp):
@@ -262,11 +668,12 @@ def split_data(split, data):
 
 def shuffle_unison_inplace(list_of_lists, random_state=None):
     if list_of_lists:
-        assert all(len(l) == len(list_of_lists[0]) for l in list_of_lists)
+        size = list_of_lists[0].shape[0]
+        assert all(l.shape[0] == size for l in list_of_lists)
         if random_state is not None:
-            p = random_state.permutation(len(list_of_lists[0]))
+            p = random_state.permutation(size)
         else:
-            p = np.random.permutation(len(list_of_lists[0]))
+            p = np.random.permutation(size)
         return [l[p] for l in list_of_lists]
     return None
 
@@ -313,9 +720,10 @@ def split_dataset_ttv(dataset, split):
 
 def split_dataset(dataset, split, value_to_split=0):
     splitted_dataset = {}
+    mask = np.asarray(split) == value_to_split
     for key in dataset:
-        splitted_dataset[key] = dataset[key][split == value_to_split]
-        if len(splitted_dataset[key]) == 0:
+        splitted_dataset[key] = dataset[key][mask]
+        if splitted_dataset[key].shape[0] == 0:
             return None
     return splitted_dataset
 
@@ -350,7 +758,7 @@ def load_from_file(file_name, field=None, dtype=int, ground_truth_split=2):
     if file_name.endswith('.hdf5') and field is not None:
         hdf5_data = h5py.File(file_name, 'r')
         split = hdf5_data[SPLIT][()]
-        column = hdf5_data[field][()]
+        column = read_hdf5_value(hdf5_data[field])
         hdf5_data.close()
         array = column[split == ground_truth_split]  # ground truth
     elif file_name.endswith('.npy'):
@@ -381,8 +789,9 @@ def replace_file_extension(file_path, extension):
 
 
 def file_exists_with_diff_extension(file_path, extension):
+    # npy preprocessed data is a directory
     return file_path is None or \
-           os.path.isfile(replace_file_extension(file_path, extension))
+           os.path.exists(replace_file_extension(file_path, extension))
 
 
 def add_sequence_feature_column(df, col_name, seq_length):
@@ -489,11 +898,18 @@ def figure_data_format_dataset(dataset):
     elif isinstance(dataset, dict):
         return dict
     elif isinstance(dataset, str):
+        if os.path.isdir(dataset):
+            # directory of .npy files written by save_npy_dir
+            return 'npy'
         dataset = dataset.lower()
         if dataset.endswith('.csv'):
             return 'csv'
         elif dataset.endswith('.h5') or dataset.endswith('.hdf5'):
             return 'hdf5'
+        elif dataset.endswith('.parquet'):
+            return 'parquet'
+        elif dataset.endswith('.feather'):
+            return 'feather'
         else:
             raise ValueError(
                 "Dataset path string {} "
@@ -31,11 +31,25 @@ default_random_seed = 42
 default_preprocessing_force_split = False
 default_preprocessing_split_probabilities = (0.7, 0.1, 0.2)
 default_preprocessing_stratify = None
+default_preprocessing_chunk_size = None
+default_preprocessing_num_workers = 1
+default_preprocessing_worker_type = 'thread'
+default_preprocessing_cache_dir = None
+default_preprocessing_cache_max_size = 10 * 1024 ** 3
+default_preprocessing_cache_checksum = False
+default_preprocessing_processed_data_format = 'hdf5'
 
 default_preprocessing_parameters = {
     'force_split': default_preprocessing_force_split,
     'split_probabilities': default_preprocessing_split_probabilities,
-    'stratify': default_preprocessing_stratify
+    'stratify': default_preprocessing_stratify,
+    'chunk_size': default_preprocessing_chunk_size,
+    'num_workers': default_preprocessing_num_workers,
+    'worker_type': default_preprocessing_worker_type,
+    'cache_dir': default_preprocessing_cache_dir,
+    'cache_max_size': default_preprocessing_cache_max_size,
+    'cache_checksum': default_preprocessing_cache_checksum,
+    'processed_data_format': default_preprocessing_processed_data_format
 }
 default_preprocessing_parameters.update({
     name: base_type.preprocessing_defaults for name, base_type in
@@ -68,6 +82,12 @@ default_training_params = {
     'validation_field': COMBINED,
     'validation_metric': LOSS,
     'bucketing_field': None,
+    'batch_tokens': None,
+    'prefetch_batches': 0,
+    'input_pipeline': 'batcher',
+    'tf_data_cache': False,
+    'mixed_precision': None,
+    'gradient_accumulation_steps': 1,
     'learning_rate_warmup_epochs': 1
 }
 
@@ -14,6 +14,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # ==============================================================================
+import numpy as np
+
+
 def set_bit(v, index, x):
     """Set the index:th bit of v to 1 if x is truthy, else to 0, and return the new value."""
     mask = 1 << index  # Compute mask, an integer with just bit 'index' set.
@@ -94,6 +97,39 @@ def h3_to_components(h3_value):
         'cells': h3_components(h3_value)
     }
 
+
+def h3_to_components_array(h3_values, max_resolution, padding_value):
+    '''
+    Vectorized version of h3_to_components extracting the values of an
+    array of H3 integers with shifts and masks.
+    :param h3_values: array of H3 integers
+    :param max_resolution: number of cells to extract
+    :param padding_value: value of the cells beyond the resolution
+    :return: uint8 matrix with a row for each value containing mode, edge,
+             resolution, base cell and the max_resolution cells
+    '''
+    h3_values = np.asarray(h3_values, dtype=np.uint64)
+
+    def array_bitslice(start_bit, slice_length):
+        return (
+                (h3_values >> np.uint64(start_bit)) &
+                np.uint64(2 ** slice_length - 1)
+        ).astype(np.uint8)
+
+    components = np.empty((len(h3_values), 4 + max_resolution), dtype=np.uint8)
+    components[:, 0] = array_bitslice(64 - 5, 4)
+    components[:, 1] = array_bitslice(64 - 8, 3)
+    components[:, 2] = array_bitslice(64 - 12, 4)
+    components[:, 3] = array_bitslice(64 - 19, 7)
+    for i in range(1, max_resolution + 1):
+        components[:, 3 + i] = np.where(
+            components[:, 2] >= i,
+            array_bitslice(64 - 19 - 3 * i, 3),
+            padding_value
+        )
+    return components
+
+
 if __name__ == '__main__':
     value = 622236723497533439
     components = h3_to_components(value)
@@ -140,6 +140,58 @@ def process_text(
         filter_stopwords=False
 ):
     doc = nlp_pipeline.tokenizer(text)
+    return _doc_units(
+        doc,
+        return_lemma,
+        filter_numbers,
+        filter_punctuation,
+        filter_short_tokens,
+        filter_stopwords
+    )
+
+
+def process_texts(
+        texts,
+        nlp_pipeline,
+        batch_size=1000,
+        n_process=1,
+        return_lemma=False,
+        filter_numbers=False,
+        filter_punctuation=False,
+        filter_short_tokens=False,
+        filter_stopwords=False
+):
+    """
+    Same as process_text for an iterable of texts, which are processed
+    in batches with nlp_pipeline.pipe, using n_process processes. Like
+    process_text only the tokenizer runs, the other components of the
+    pipeline are disabled.
+    :return: generator of lists of units, one for each text
+    """
+    for doc in nlp_pipeline.pipe(
+            texts,
+            batch_size=batch_size,
+            n_process=n_process,
+            disable=nlp_pipeline.pipe_names
+    ):
+        yield _doc_units(
+            doc,
+            return_lemma,
+            filter_numbers,
+            filter_punctuation,
+            filter_short_tokens,
+            filter_stopwords
+        )
+
+
+def _doc_units(
+        doc,
+        return_lemma=False,
+        filter_numbers=False,
+        filter_punctuation=False,
+        filter_short_tokens=False,
+        filter_stopwords=False
+):
     return [token.lemma_ if return_lemma else token.text
             for token in doc if pass_filters(token,
                                              filter_numbers,
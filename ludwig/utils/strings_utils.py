@@ -19,12 +19,15 @@ import re
 import unicodedata
 from abc import abstractmethod
 from collections import Counter
+from itertools import chain
 
 import numpy as np
+import pandas as pd
 
 from ludwig.utils.math_utils import int_type
 from ludwig.utils.misc_utils import get_from_registry
-from ludwig.utils.nlp_utils import load_nlp_pipeline, process_text
+from ludwig.utils.nlp_utils import load_nlp_pipeline, process_text, \
+    process_texts
 
 UNKNOWN_SYMBOL = '<UNK>'
 PADDING_SYMBOL = '<PAD>'
@@ -35,6 +38,19 @@ SPACE_PUNCTUATION_REGEX = re.compile(r'\w+|[^\w\s]')
 COMMA_REGEX = re.compile(r'\s*,\s*')
 UNDERSCORE_REGEX = re.compile(r'\s*_\s*')
 
+# tokenizers that can process a whole column with a single regex pass
+SPLIT_TOKENIZER_REGEXES = {
+    'space': SPLIT_REGEX,
+    'underscore': UNDERSCORE_REGEX,
+    'comma': COMMA_REGEX,
+}
+FINDALL_TOKENIZER_REGEXES = {
+    'space_punct': SPACE_PUNCTUATION_REGEX,
+}
+# separates sequences when tokenizing a whole column at once
+SEQUENCE_SEPARATOR = '\x01'
+
+
 def make_safe_filename(s):
     def safe_char(c):
         if c.isalnum():
@@ -95,11 +111,12 @@ def create_vocabulary(
         vocab_file=None,
         unknown_symbol=UNKNOWN_SYMBOL,
         padding_symbol=PADDING_SYMBOL,
-        pretrained_model_name_or_path=None
+        pretrained_model_name_or_path=None,
+        unit_counts=None,
+        max_line_length=0,
+        n_process=1
 ):
     vocab = None
-    max_line_length = 0
-    unit_counts = Counter()
 
     tokenizer = get_from_registry(
         tokenizer_type,
@@ -107,6 +124,7 @@ def create_vocabulary(
     )(
         vocab_file=vocab_file,
         pretrained_model_name_or_path=pretrained_model_name_or_path,
+        n_process=n_process
     )
 
     if tokenizer_type == 'hf_tokenizer':
@@ -135,10 +153,8 @@ def create_vocabulary(
     elif vocab_file is not None:
         vocab = load_vocabulary(vocab_file)
 
-    for line in data:
-        processed_line = tokenizer(line.lower() if lowercase else line)
-        unit_counts.update(processed_line)
-        max_line_length = max(max_line_length, len(processed_line))
+    if unit_counts is None:
+        unit_counts, max_line_length = _count_units(data, tokenizer, lowercase)
 
     if vocab is None:
         vocab = [unit for unit, count in
@@ -166,6 +182,65 @@ def create_vocabulary(
     return vocab, str2idx, str2freq, max_line_length, pad_idx, padding_symbol, unknown_symbol
 
 
+def count_units(
+        data,
+        tokenizer_type='space',
+        lowercase=True,
+        vocab_file=None,
+        pretrained_model_name_or_path=None,
+        unit_counts=None,
+        max_line_length=0,
+        n_process=1
+):
+    """
+    Counts the units obtained tokenizing data. When unit_counts and
+    max_line_length are provided they are updated with the counts of data,
+    so that counts can be accumulated over chunks of a dataset and the
+    vocabulary built afterwards with create_vocabulary.
+    :param data: iterable of strings
+    :param tokenizer_type: type of the tokenizer
+    :param lowercase: if True lowercase strings before tokenizing
+    :param vocab_file: vocabulary file used by the tokenizer
+    :param pretrained_model_name_or_path: pretrained hf tokenizer
+    :param unit_counts: Counter of the units counted so far
+    :param max_line_length: maximum number of units seen so far in a line
+    :param n_process: number of processes of the spaCy tokenizers
+    :return: units Counter, maximum number of units in a line
+    """
+    tokenizer = get_from_registry(
+        tokenizer_type,
+        tokenizer_registry
+    )(
+        vocab_file=vocab_file,
+        pretrained_model_name_or_path=pretrained_model_name_or_path,
+        n_process=n_process
+    )
+    return _count_units(
+        data,
+        tokenizer,
+        lowercase,
+        unit_counts=unit_counts,
+        max_line_length=max_line_length
+    )
+
+
+def _count_units(
+        data,
+        tokenizer,
+        lowercase,
+        unit_counts=None,
+        max_line_length=0
+):
+    if unit_counts is None:
+        unit_counts = Counter()
+    if lowercase:
+        data = (line.lower() for line in data)
+    for processed_line in tokenizer.tokenize_batch(data):
+        unit_counts.update(processed_line)
+        max_line_length = max(max_line_length, len(processed_line))
+    return unit_counts, max_line_length
+
+
 def get_sequence_vector(sequence, tokenizer_type, unit_to_id, lowercase=True):
     tokenizer = get_from_registry(tokenizer_type, tokenizer_registry)()
 
@@ -216,48 +291,226 @@ def build_sequence_matrix(
         unknown_symbol=UNKNOWN_SYMBOL,
         lowercase=True,
         tokenizer_vocab_file=None,
-        pretrained_model_name_or_path=None
-
+        pretrained_model_name_or_path=None,
+        n_process=1
 ):
     tokenizer = get_from_registry(tokenizer_type, tokenizer_registry)(
         vocab_file=tokenizer_vocab_file,
         pretrained_model_name_or_path=pretrained_model_name_or_path,
+        n_process=n_process
     )
 
     format_dtype = int_type(len(inverse_vocabulary) - 1)
 
-    max_length = 0
-    unit_vectors = []
-    for sequence in sequences:
-        unit_indices_vector = _get_sequence_vector(
-            sequence,
-            tokenizer,
-            tokenizer_type,
-            format_dtype,
+    if lowercase:
+        sequences = [sequence.lower() for sequence in sequences]
+
+    if tokenizer_type == 'characters':
+        unit_indices, lengths = _get_character_indices(
+            sequences,
             inverse_vocabulary,
-            lowercase=lowercase,
+            format_dtype,
             unknown_symbol=unknown_symbol
         )
-        unit_vectors.append(unit_indices_vector)
-        if len(unit_indices_vector) > max_length:
-            max_length = len(unit_indices_vector)
-
+    else:
+        units, lengths = _tokenize_sequences(
+            sequences,
+            tokenizer,
+            tokenizer_type
+        )
+        if tokenizer_type == 'hf_tokenizer':
+            unit_indices = np.array(units, dtype=format_dtype)
+        else:
+            unit_indices = _get_unit_indices(
+                units,
+                inverse_vocabulary,
+                format_dtype,
+                unknown_symbol=unknown_symbol
+            )
+
+    max_length = lengths.max() if len(lengths) > 0 else 0
     if max_length < length_limit:
         logging.debug('max length of {0}: {1} < limit: {2}'.format(
             format, max_length, length_limit
         ))
-    max_length = length_limit
-    sequence_matrix = np.full((len(sequences), max_length),
-                              inverse_vocabulary[padding_symbol],
-                              dtype=format_dtype)
-    for i, vector in enumerate(unit_vectors):
-        limit = min(vector.shape[0], max_length)
-        if padding == 'right':
-            sequence_matrix[i, :limit] = vector[:limit]
-        else:  # if padding == 'left
-            sequence_matrix[i, max_length - limit:] = vector[:limit]
+    return build_padded_matrix(
+        unit_indices,
+        lengths,
+        length_limit,
+        inverse_vocabulary[padding_symbol],
+        padding=padding,
+        dtype=format_dtype
+    )
 
-    return sequence_matrix
+
+def build_padded_matrix(
+        values,
+        lengths,
+        length_limit,
+        padding_value,
+        padding='right',
+        dtype=None
+):
+    """
+    Scatters the concatenated values of many sequences into a matrix with a
+    row for each sequence, cutting them at length_limit and padding them.
+    :param values: numpy array with the values of all sequences
+    :param lengths: number of values of each sequence
+    :param length_limit: number of columns of the matrix
+    :param padding_value: value of the padding cells
+    :param padding: 'right' pads after the values, 'left' before them
+    :param dtype: dtype of the matrix, the one of values if None
+    :return: matrix of shape (len(lengths), length_limit)
+    """
+    matrix = np.full(
+        (len(lengths), length_limit),
+        padding_value,
+        dtype=dtype if dtype is not None else values.dtype
+    )
+
+    # position of each value in its sequence, values beyond the limit are cut
+    rows = np.repeat(np.arange(len(lengths)), lengths)
+    columns = np.arange(len(values)) - np.repeat(
+        np.cumsum(lengths) - lengths,
+        lengths
+    )
+    kept = columns < length_limit
+    rows = rows[kept]
+    columns = columns[kept]
+    if padding != 'right':
+        columns += length_limit - np.minimum(lengths, length_limit)[rows]
+    matrix[rows, columns] = values[kept]
+
+    return matrix
+
+
+def tokenize_column(sequences, tokenizer_type):
+    """
+    Tokenizes all sequences at once, with a single regex pass for the
+    regex based tokenizers.
+    :param sequences: iterable of strings
+    :param tokenizer_type: type of the tokenizer
+    :return: units of all sequences, number of units of each sequence
+    """
+    tokenizer = get_from_registry(tokenizer_type, tokenizer_registry)()
+    return _tokenize_sequences(list(sequences), tokenizer, tokenizer_type)
+
+
+def _tokenize_sequences(sequences, tokenizer, tokenizer_type):
+    """
+    Tokenizes sequences. Regex based tokenizers process all sequences
+    joined by a separator with a single regex pass.
+    :param sequences: list of strings
+    :param tokenizer: tokenizer used for the other tokenizer types
+    :param tokenizer_type: type of the tokenizer
+    :return: units of all sequences, number of units of each sequence
+    """
+    if (tokenizer_type in SPLIT_TOKENIZER_REGEXES or
+            tokenizer_type in FINDALL_TOKENIZER_REGEXES):
+        text = SEQUENCE_SEPARATOR.join(
+            [sequence.strip() for sequence in sequences]
+        )
+        # the separator can only be used if sequences do not contain it
+        if len(sequences) > 0 and (
+                text.count(SEQUENCE_SEPARATOR) == len(sequences) - 1
+        ):
+            if tokenizer_type in SPLIT_TOKENIZER_REGEXES:
+                # the captured separators are returned between units
+                parts = re.compile(
+                    '({})|{}'.format(
+                        SEQUENCE_SEPARATOR,
+                        SPLIT_TOKENIZER_REGEXES[tokenizer_type].pattern
+                    )
+                ).split(text)
+                units = np.array(parts[::2], dtype=object)
+                ends = np.flatnonzero(
+                    np.array(parts[1::2], dtype=object) == SEQUENCE_SEPARATOR
+                )
+                ends = np.append(ends, len(units) - 1)
+            else:
+                # the separator is matched as a unit itself
+                parts = np.array(
+                    FINDALL_TOKENIZER_REGEXES[tokenizer_type].findall(text),
+                    dtype=object
+                )
+                is_separator = parts == SEQUENCE_SEPARATOR
+                units = parts[~is_separator]
+                ends = np.flatnonzero(is_separator) - np.arange(
+                    len(sequences) - 1
+                ) - 1
+                ends = np.append(ends, len(units) - 1)
+            lengths = np.diff(ends, prepend=-1)
+            return units, lengths
+
+    unit_sequences = list(tokenizer.tokenize_batch(sequences))
+    lengths = np.fromiter(map(len, unit_sequences), dtype=np.int64)
+    return list(chain.from_iterable(unit_sequences)), lengths
+
+
+def _get_character_indices(
+        sequences,
+        unit_to_id,
+        format_dtype,
+        unknown_symbol=UNKNOWN_SYMBOL
+):
+    """
+    Maps the characters of sequences to their ids working on the unicode
+    code points of the concatenation of all sequences.
+    :return: ids of all characters, number of characters of each sequence
+    """
+    lengths = np.fromiter(map(len, sequences), dtype=np.int64)
+    code_points = np.frombuffer(
+        ''.join(sequences).encode('utf-32-le', 'surrogatepass'),
+        dtype=np.uint32
+    )
+
+    characters = [unit for unit in unit_to_id if len(unit) == 1]
+    vocabulary_code_points = np.array(
+        [ord(character) for character in characters],
+        dtype=np.uint32
+    )
+    order = np.argsort(vocabulary_code_points)
+    vocabulary_code_points = vocabulary_code_points[order]
+    vocabulary_ids = np.array(
+        [unit_to_id[character] for character in characters],
+        dtype=format_dtype
+    )[order]
+
+    positions = np.searchsorted(vocabulary_code_points, code_points)
+    positions = np.minimum(positions, max(len(characters) - 1, 0))
+    known = np.zeros(len(code_points), dtype=bool)
+    if len(characters) > 0:
+        known = vocabulary_code_points[positions] == code_points
+
+    unit_indices = np.empty(len(code_points), dtype=format_dtype)
+    unit_indices[known] = vocabulary_ids[positions[known]]
+    if not known.all():
+        unit_indices[~known] = unit_to_id[unknown_symbol]
+    return unit_indices, lengths
+
+
+def _get_unit_indices(
+        units,
+        unit_to_id,
+        format_dtype,
+        unknown_symbol=UNKNOWN_SYMBOL
+):
+    """
+    Maps units to their ids with a single hash lookup over all of them.
+    :param units: list of units
+    :param unit_to_id: vocabulary dictionary
+    :param format_dtype: dtype of the ids
+    :param unknown_symbol: symbol of units not in the vocabulary
+    :return: numpy array of ids
+    """
+    positions = pd.Index(list(unit_to_id.keys())).get_indexer(units)
+    unit_indices = np.array(list(unit_to_id.values()), dtype=format_dtype)[
+        positions
+    ]
+    unknown = positions == -1
+    if unknown.any():
+        unit_indices[unknown] = unit_to_id[unknown_symbol]
+    return unit_indices
 
 
 class BaseTokenizer:
@@ -269,6 +522,15 @@ class BaseTokenizer:
     def __call__(self, text):
         pass
 
+    def tokenize_batch(self, texts):
+        """
+        Tokenizes an iterable of texts, tokenizers that can process many
+        texts at once more efficiently override it.
+        :param texts: iterable of strings
+        :return: iterable of lists of units, one for each text
+        """
+        return map(self, texts)
+
 
 class CharactersToListTokenizer(BaseTokenizer):
     def __call__(self, text):
@@ -305,852 +567,607 @@ class StrippedStringToListTokenizer(BaseTokenizer):
         return [text.strip()]
 
 
-class EnglishTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(text, load_nlp_pipeline('en'))
+class SpacyTokenizer(BaseTokenizer):
+    """
+    Tokenizer backed by the spaCy pipeline of a language. Batches of texts
+    go through nlp.pipe, using n_process processes.
+    """
+    language = 'xx'
+    return_lemma = False
+    filter_numbers = False
+    filter_punctuation = False
+    filter_short_tokens = False
+    filter_stopwords = False
+
+    def __init__(self, batch_size=1000, n_process=1, **kwargs):
+        super().__init__()
+        self.batch_size = batch_size
+        self.n_process = n_process
 
+    def _processing_parameters(self):
+        return {
+            'return_lemma': self.return_lemma,
+            'filter_numbers': self.filter_numbers,
+            'filter_punctuation': self.filter_punctuation,
+            'filter_short_tokens': self.filter_short_tokens,
+            'filter_stopwords': self.filter_stopwords
+        }
 
-class EnglishFilterTokenizer(BaseTokenizer):
     def __call__(self, text):
         return process_text(
             text,
-            load_nlp_pipeline('en'),
-            filter_numbers=True,
-            filter_punctuation=True,
-            filter_short_tokens=True
+            load_nlp_pipeline(self.language),
+            **self._processing_parameters()
         )
 
-
-class EnglishRemoveStopwordsTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(
-            text,
-            load_nlp_pipeline('en'),
-            filter_stopwords=True
+    def tokenize_batch(self, texts):
+        return process_texts(
+            texts,
+            load_nlp_pipeline(self.language),
+            batch_size=self.batch_size,
+            n_process=self.n_process,
+            **self._processing_parameters()
         )
 
 
-class EnglishLemmatizeTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        process_text(text, load_nlp_pipeline('en'), return_lemma=True)
+class EnglishTokenizer(SpacyTokenizer):
+    language = 'en'
 
 
-class EnglishLemmatizeFilterTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(
-            text,
-            load_nlp_pipeline('en'),
-            return_lemma=True,
-            filter_numbers=True,
-            filter_punctuation=True,
-            filter_short_tokens=True
-        )
+class EnglishFilterTokenizer(SpacyTokenizer):
+    language = 'en'
+    filter_numbers = True
+    filter_punctuation = True
+    filter_short_tokens = True
 
 
-class EnglishLemmatizeRemoveStopwordsTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(
-            text,
-            load_nlp_pipeline('en'),
-            return_lemma=True,
-            filter_stopwords=True
-        )
+class EnglishRemoveStopwordsTokenizer(SpacyTokenizer):
+    language = 'en'
+    filter_stopwords = True
 
 
-class ItalianTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(text, load_nlp_pipeline('it'))
+class EnglishLemmatizeTokenizer(SpacyTokenizer):
+    language = 'en'
+    return_lemma = True
 
 
-class ItalianFilterTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(
-            text,
-            load_nlp_pipeline('it'),
-            filter_numbers=True,
-            filter_punctuation=True,
-            filter_short_tokens=True
-        )
+class EnglishLemmatizeFilterTokenizer(SpacyTokenizer):
+    language = 'en'
+    return_lemma = True
+    filter_numbers = True
+    filter_punctuation = True
+    filter_short_tokens = True
 
 
-class ItalianRemoveStopwordsTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(
-            text,
-            load_nlp_pipeline('it'),
-            filter_stopwords=True
-        )
+class EnglishLemmatizeRemoveStopwordsTokenizer(SpacyTokenizer):
+    language = 'en'
+    return_lemma = True
+    filter_stopwords = True
 
 
-class ItalianLemmatizeTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(
-            text,
-            load_nlp_pipeline('it'),
-            return_lemma=True
-        )
+class ItalianTokenizer(SpacyTokenizer):
+    language = 'it'
 
 
-class ItalianLemmatizeFilterTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(
-            text,
-            load_nlp_pipeline('it'),
-            return_lemma=True,
-            filter_numbers=True,
-            filter_punctuation=True,
-            filter_short_tokens=True
-        )
+class ItalianFilterTokenizer(SpacyTokenizer):
+    language = 'it'
+    filter_numbers = True
+    filter_punctuation = True
+    filter_short_tokens = True
 
 
-class ItalianLemmatizeRemoveStopwordsTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(
-            text,
-            load_nlp_pipeline('it'),
-            return_lemma=True,
-            filter_stopwords=True
-        )
+class ItalianRemoveStopwordsTokenizer(SpacyTokenizer):
+    language = 'it'
+    filter_stopwords = True
 
 
-class SpanishTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(text, load_nlp_pipeline('es'))
+class ItalianLemmatizeTokenizer(SpacyTokenizer):
+    language = 'it'
+    return_lemma = True
 
 
-class SpanishFilterTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(
-            text,
-            load_nlp_pipeline('es'),
-            filter_numbers=True,
-            filter_punctuation=True,
-            filter_short_tokens=True
-        )
+class ItalianLemmatizeFilterTokenizer(SpacyTokenizer):
+    language = 'it'
+    return_lemma = True
+    filter_numbers = True
+    filter_punctuation = True
+    filter_short_tokens = True
 
 
-class SpanishRemoveStopwordsTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(
-            text,
-            load_nlp_pipeline('es'),
-            filter_stopwords=True
-        )
+class ItalianLemmatizeRemoveStopwordsTokenizer(SpacyTokenizer):
+    language = 'it'
+    return_lemma = True
+    filter_stopwords = True
 
 
-class SpanishLemmatizeTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(
-            text,
-            load_nlp_pipeline('es'),
-            return_lemma=True
-        )
+class SpanishTokenizer(SpacyTokenizer):
+    language = 'es'
 
 
-class SpanishLemmatizeFilterTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(
-            text,
-            load_nlp_pipeline('es'),
-            return_lemma=True,
-            filter_numbers=True,
-            filter_punctuation=True,
-            filter_short_tokens=True
-        )
+class SpanishFilterTokenizer(SpacyTokenizer):
+    language = 'es'
+    filter_numbers = True
+    filter_punctuation = True
+    filter_short_tokens = True
 
 
-class SpanishLemmatizeRemoveStopwordsTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(
-            text,
-            load_nlp_pipeline('es'),
-            return_lemma=True,
-            filter_stopwords=True
-        )
+class SpanishRemoveStopwordsTokenizer(SpacyTokenizer):
+    language = 'es'
+    filter_stopwords = True
 
 
-class GermanTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(text, load_nlp_pipeline('de'))
+class SpanishLemmatizeTokenizer(SpacyTokenizer):
+    language = 'es'
+    return_lemma = True
 
 
-class GermanFilterTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(
-            text,
-            load_nlp_pipeline('de'),
-            filter_numbers=True,
-            filter_punctuation=True,
-            filter_short_tokens=True
-        )
+class SpanishLemmatizeFilterTokenizer(SpacyTokenizer):
+    language = 'es'
+    return_lemma = True
+    filter_numbers = True
+    filter_punctuation = True
+    filter_short_tokens = True
 
 
-class GermanRemoveStopwordsTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(
-            text,
-            load_nlp_pipeline('de'),
-            filter_stopwords=True
-        )
+class SpanishLemmatizeRemoveStopwordsTokenizer(SpacyTokenizer):
+    language = 'es'
+    return_lemma = True
+    filter_stopwords = True
 
 
-class GermanLemmatizeTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(
-            text,
-            load_nlp_pipeline('de'),
-            return_lemma=True
-        )
+class GermanTokenizer(SpacyTokenizer):
+    language = 'de'
 
 
-class GermanLemmatizeFilterTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(
-            text,
-            load_nlp_pipeline('de'),
-            return_lemma=True,
-            filter_numbers=True,
-            filter_punctuation=True,
-            filter_short_tokens=True
-        )
+class GermanFilterTokenizer(SpacyTokenizer):
+    language = 'de'
+    filter_numbers = True
+    filter_punctuation = True
+    filter_short_tokens = True
 
 
-class GermanLemmatizeRemoveStopwordsTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(
-            text,
-            load_nlp_pipeline('de'),
-            return_lemma=True,
-            filter_stopwords=True
-        )
+class GermanRemoveStopwordsTokenizer(SpacyTokenizer):
+    language = 'de'
+    filter_stopwords = True
 
 
-class FrenchTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(text, load_nlp_pipeline('fr'))
+class GermanLemmatizeTokenizer(SpacyTokenizer):
+    language = 'de'
+    return_lemma = True
 
 
-class FrenchFilterTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(
-            text,
-            load_nlp_pipeline('fr'),
-            filter_numbers=True,
-            filter_punctuation=True,
-            filter_short_tokens=True
-        )
+class GermanLemmatizeFilterTokenizer(SpacyTokenizer):
+    language = 'de'
+    return_lemma = True
+    filter_numbers = True
+    filter_punctuation = True
+    filter_short_tokens = True
 
 
-class FrenchRemoveStopwordsTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(
-            text,
-            load_nlp_pipeline('fr'),
-            filter_stopwords=True
-        )
+class GermanLemmatizeRemoveStopwordsTokenizer(SpacyTokenizer):
+    language = 'de'
+    return_lemma = True
+    filter_stopwords = True
 
 
-class FrenchLemmatizeTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(
-            text,
-            load_nlp_pipeline('fr'),
-            return_lemma=True
-        )
+class FrenchTokenizer(SpacyTokenizer):
+    language = 'fr'
 
 
-class FrenchLemmatizeFilterTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(
-            text,
-            load_nlp_pipeline('fr'),
-            return_lemma=True,
-            filter_numbers=True,
-            filter_punctuation=True,
-            filter_short_tokens=True
-        )
+class FrenchFilterTokenizer(SpacyTokenizer):
+    language = 'fr'
+    filter_numbers = True
+    filter_punctuation = True
+    filter_short_tokens = True
 
 
-class FrenchLemmatizeRemoveStopwordsTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(
-            text,
-            load_nlp_pipeline('fr'),
-            return_lemma=True,
-            filter_stopwords=True
-        )
+class FrenchRemoveStopwordsTokenizer(SpacyTokenizer):
+    language = 'fr'
+    filter_stopwords = True
 
 
-class PortugueseTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(text, load_nlp_pipeline('pt'))
+class FrenchLemmatizeTokenizer(SpacyTokenizer):
+    language = 'fr'
+    return_lemma = True
 
 
-class PortugueseFilterTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(
-            text,
-            load_nlp_pipeline('pt'),
-            filter_numbers=True,
-            filter_punctuation=True,
-            filter_short_tokens=True
-        )
+class FrenchLemmatizeFilterTokenizer(SpacyTokenizer):
+    language = 'fr'
+    return_lemma = True
+    filter_numbers = True
+    filter_punctuation = True
+    filter_short_tokens = True
 
 
-class PortugueseRemoveStopwordsTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(
-            text,
-            load_nlp_pipeline('pt'),
-            filter_stopwords=True
-        )
+class FrenchLemmatizeRemoveStopwordsTokenizer(SpacyTokenizer):
+    language = 'fr'
+    return_lemma = True
+    filter_stopwords = True
 
 
-class PortugueseLemmatizeTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(text, load_nlp_pipeline('pt'), return_lemma=True)
+class PortugueseTokenizer(SpacyTokenizer):
+    language = 'pt'
 
 
-class PortugueseLemmatizeFilterTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(
-            text,
-            load_nlp_pipeline('pt'),
-            return_lemma=True,
-            filter_numbers=True,
-            filter_punctuation=True,
-            filter_short_tokens=True
-        )
+class PortugueseFilterTokenizer(SpacyTokenizer):
+    language = 'pt'
+    filter_numbers = True
+    filter_punctuation = True
+    filter_short_tokens = True
 
 
-class PortugueseLemmatizeRemoveStopwordsTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(
-            text,
-            load_nlp_pipeline('pt'),
-            return_lemma=True,
-            filter_stopwords=True
-        )
+class PortugueseRemoveStopwordsTokenizer(SpacyTokenizer):
+    language = 'pt'
+    filter_stopwords = True
 
 
-class DutchTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(text, load_nlp_pipeline('nl'))
+class PortugueseLemmatizeTokenizer(SpacyTokenizer):
+    language = 'pt'
+    return_lemma = True
 
 
-class DutchFilterTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(
-            text,
-            load_nlp_pipeline('nl'),
-            filter_numbers=True,
-            filter_punctuation=True,
-            filter_short_tokens=True
-        )
+class PortugueseLemmatizeFilterTokenizer(SpacyTokenizer):
+    language = 'pt'
+    return_lemma = True
+    filter_numbers = True
+    filter_punctuation = True
+    filter_short_tokens = True
 
 
-class DutchRemoveStopwordsTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(
-            text,
-            load_nlp_pipeline('nl'),
-            filter_stopwords=True
-        )
+class PortugueseLemmatizeRemoveStopwordsTokenizer(SpacyTokenizer):
+    language = 'pt'
+    return_lemma = True
+    filter_stopwords = True
 
 
-class DutchLemmatizeTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(text, load_nlp_pipeline('nl'), return_lemma=True)
+class DutchTokenizer(SpacyTokenizer):
+    language = 'nl'
 
 
-class DutchLemmatizeFilterTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(
-            text,
-            load_nlp_pipeline('nl'),
-            return_lemma=True,
-            filter_numbers=True,
-            filter_punctuation=True,
-            filter_short_tokens=True
-        )
+class DutchFilterTokenizer(SpacyTokenizer):
+    language = 'nl'
+    filter_numbers = True
+    filter_punctuation = True
+    filter_short_tokens = True
 
 
-class DutchLemmatizeRemoveStopwordsTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(
-            text,
-            load_nlp_pipeline('nl'),
-            return_lemma=True,
-            filter_stopwords=True
-        )
+class DutchRemoveStopwordsTokenizer(SpacyTokenizer):
+    language = 'nl'
+    filter_stopwords = True
 
 
-class GreekTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(text, load_nlp_pipeline('el'))
+class DutchLemmatizeTokenizer(SpacyTokenizer):
+    language = 'nl'
+    return_lemma = True
 
 
-class GreekFilterTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(
-            text,
-            load_nlp_pipeline('el'),
-            filter_numbers=True,
-            filter_punctuation=True,
-            filter_short_tokens=True
-        )
+class DutchLemmatizeFilterTokenizer(SpacyTokenizer):
+    language = 'nl'
+    return_lemma = True
+    filter_numbers = True
+    filter_punctuation = True
+    filter_short_tokens = True
 
 
-class GreekRemoveStopwordsTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(
-            text,
-            load_nlp_pipeline('el'),
-            filter_stopwords=True
-        )
+class DutchLemmatizeRemoveStopwordsTokenizer(SpacyTokenizer):
+    language = 'nl'
+    return_lemma = True
+    filter_stopwords = True
 
 
-class GreekLemmatizeTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(text, load_nlp_pipeline('el'), return_lemma=True)
+class GreekTokenizer(SpacyTokenizer):
+    language = 'el'
 
 
-class GreekLemmatizeFilterTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(
-            text,
-            load_nlp_pipeline('el'),
-            return_lemma=True,
-            filter_numbers=True,
-            filter_punctuation=True,
-            filter_short_tokens=True
-        )
+class GreekFilterTokenizer(SpacyTokenizer):
+    language = 'el'
+    filter_numbers = True
+    filter_punctuation = True
+    filter_short_tokens = True
 
 
-class GreekLemmatizeRemoveStopwordsFilterTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(
-            text,
-            load_nlp_pipeline('el'),
-            return_lemma=True,
-            filter_stopwords=True
-        )
+class GreekRemoveStopwordsTokenizer(SpacyTokenizer):
+    language = 'el'
+    filter_stopwords = True
 
 
-class NorwegianTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(text, load_nlp_pipeline('nb'))
+class GreekLemmatizeTokenizer(SpacyTokenizer):
+    language = 'el'
+    return_lemma = True
 
 
-class NorwegianFilterTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(
-            text,
-            load_nlp_pipeline('nb'),
-            filter_numbers=True,
-            filter_punctuation=True,
-            filter_short_tokens=True
-        )
+class GreekLemmatizeFilterTokenizer(SpacyTokenizer):
+    language = 'el'
+    return_lemma = True
+    filter_numbers = True
+    filter_punctuation = True
+    filter_short_tokens = True
 
 
-class NorwegianRemoveStopwordsTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(
-            text,
-            load_nlp_pipeline('nb'),
-            filter_stopwords=True
-        )
+class GreekLemmatizeRemoveStopwordsFilterTokenizer(SpacyTokenizer):
+    language = 'el'
+    return_lemma = True
+    filter_stopwords = True
 
 
-class NorwegianLemmatizeTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(text, load_nlp_pipeline('nb'), return_lemma=True)
+class NorwegianTokenizer(SpacyTokenizer):
+    language = 'nb'
 
 
-class NorwegianLemmatizeFilterTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(
-            text,
-            load_nlp_pipeline('nb'),
-            return_lemma=True,
-            filter_numbers=True,
-            filter_punctuation=True,
-            filter_short_tokens=True
-        )
+class NorwegianFilterTokenizer(SpacyTokenizer):
+    language = 'nb'
+    filter_numbers = True
+    filter_punctuation = True
+    filter_short_tokens = True
 
 
-class NorwegianLemmatizeRemoveStopwordsFilterTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(
-            text,
-            load_nlp_pipeline('nb'),
-            return_lemma=True,
-            filter_stopwords=True
-        )
+class NorwegianRemoveStopwordsTokenizer(SpacyTokenizer):
+    language = 'nb'
+    filter_stopwords = True
 
 
-class LithuanianTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(text, load_nlp_pipeline('lt'))
+class NorwegianLemmatizeTokenizer(SpacyTokenizer):
+    language = 'nb'
+    return_lemma = True
 
 
-class LithuanianFilterTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(
-            text,
-            load_nlp_pipeline('lt'),
-            filter_numbers=True,
-            filter_punctuation=True,
-            filter_short_tokens=True
-        )
+class NorwegianLemmatizeFilterTokenizer(SpacyTokenizer):
+    language = 'nb'
+    return_lemma = True
+    filter_numbers = True
+    filter_punctuation = True
+    filter_short_tokens = True
 
 
-class LithuanianRemoveStopwordsTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(
-            text,
-            load_nlp_pipeline('lt'),
-            filter_stopwords=True
-        )
+class NorwegianLemmatizeRemoveStopwordsFilterTokenizer(SpacyTokenizer):
+    language = 'nb'
+    return_lemma = True
+    filter_stopwords = True
 
 
-class LithuanianLemmatizeTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(text, load_nlp_pipeline('lt'), return_lemma=True)
+class LithuanianTokenizer(SpacyTokenizer):
+    language = 'lt'
 
 
-class LithuanianLemmatizeFilterTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(
-            text,
-            load_nlp_pipeline('lt'),
-            return_lemma=True,
-            filter_numbers=True,
-            filter_punctuation=True,
-            filter_short_tokens=True
-        )
+class LithuanianFilterTokenizer(SpacyTokenizer):
+    language = 'lt'
+    filter_numbers = True
+    filter_punctuation = True
+    filter_short_tokens = True
 
 
-class LithuanianLemmatizeRemoveStopwordsFilterTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(
-            text,
-            load_nlp_pipeline('lt'),
-            return_lemma=True,
-            filter_stopwords=True
-        )
+class LithuanianRemoveStopwordsTokenizer(SpacyTokenizer):
+    language = 'lt'
+    filter_stopwords = True
 
 
-class DanishTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(text, load_nlp_pipeline('da'))
+class LithuanianLemmatizeTokenizer(SpacyTokenizer):
+    language = 'lt'
+    return_lemma = True
 
 
-class DanishFilterTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(
-            text,
-            load_nlp_pipeline('da'),
-            filter_numbers=True,
-            filter_punctuation=True,
-            filter_short_tokens=True
-        )
+class LithuanianLemmatizeFilterTokenizer(SpacyTokenizer):
+    language = 'lt'
+    return_lemma = True
+    filter_numbers = True
+    filter_punctuation = True
+    filter_short_tokens = True
 
 
-class DanishRemoveStopwordsTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(
-            text,
-            load_nlp_pipeline('da'),
-            filter_stopwords=True
-        )
+class LithuanianLemmatizeRemoveStopwordsFilterTokenizer(SpacyTokenizer):
+    language = 'lt'
+    return_lemma = True
+    filter_stopwords = True
 
 
-class DanishLemmatizeTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(text, load_nlp_pipeline('da'), return_lemma=True)
+class DanishTokenizer(SpacyTokenizer):
+    language = 'da'
 
 
-class DanishLemmatizeFilterTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(
-            text,
-            load_nlp_pipeline('da'),
-            return_lemma=True,
-            filter_numbers=True,
-            filter_punctuation=True,
-            filter_short_tokens=True
-        )
+class DanishFilterTokenizer(SpacyTokenizer):
+    language = 'da'
+    filter_numbers = True
+    filter_punctuation = True
+    filter_short_tokens = True
 
 
-class DanishLemmatizeRemoveStopwordsFilterTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(
-            text,
-            load_nlp_pipeline('da'),
-            return_lemma=True,
-            filter_stopwords=True
-        )
+class DanishRemoveStopwordsTokenizer(SpacyTokenizer):
+    language = 'da'
+    filter_stopwords = True
 
 
-class PolishTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(text, load_nlp_pipeline('pl'))
+class DanishLemmatizeTokenizer(SpacyTokenizer):
+    language = 'da'
+    return_lemma = True
 
 
-class PolishFilterTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(
-            text,
-            load_nlp_pipeline('pl'),
-            filter_numbers=True,
-            filter_punctuation=True,
-            filter_short_tokens=True
-        )
+class DanishLemmatizeFilterTokenizer(SpacyTokenizer):
+    language = 'da'
+    return_lemma = True
+    filter_numbers = True
+    filter_punctuation = True
+    filter_short_tokens = True
 
 
-class PolishRemoveStopwordsTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(
-            text,
-            load_nlp_pipeline('pl'),
-            filter_stopwords=True
-        )
+class DanishLemmatizeRemoveStopwordsFilterTokenizer(SpacyTokenizer):
+    language = 'da'
+    return_lemma = True
+    filter_stopwords = True
 
 
-class PolishLemmatizeTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(text, load_nlp_pipeline('pl'), return_lemma=True)
+class PolishTokenizer(SpacyTokenizer):
+    language = 'pl'
 
 
-class PolishLemmatizeFilterTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(
-            text,
-            load_nlp_pipeline('pl'),
-            return_lemma=True,
-            filter_numbers=True,
-            filter_punctuation=True,
-            filter_short_tokens=True
-        )
+class PolishFilterTokenizer(SpacyTokenizer):
+    language = 'pl'
+    filter_numbers = True
+    filter_punctuation = True
+    filter_short_tokens = True
 
 
-class PolishLemmatizeRemoveStopwordsFilterTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(
-            text,
-            load_nlp_pipeline('pl'),
-            return_lemma=True,
-            filter_stopwords=True
-        )
+class PolishRemoveStopwordsTokenizer(SpacyTokenizer):
+    language = 'pl'
+    filter_stopwords = True
 
 
-class RomanianTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(text, load_nlp_pipeline('ro'))
+class PolishLemmatizeTokenizer(SpacyTokenizer):
+    language = 'pl'
+    return_lemma = True
 
 
-class RomanianFilterTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(
-            text,
-            load_nlp_pipeline('ro'),
-            filter_numbers=True,
-            filter_punctuation=True,
-            filter_short_tokens=True
-        )
+class PolishLemmatizeFilterTokenizer(SpacyTokenizer):
+    language = 'pl'
+    return_lemma = True
+    filter_numbers = True
+    filter_punctuation = True
+    filter_short_tokens = True
 
 
-class RomanianRemoveStopwordsTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(
-            text,
-            load_nlp_pipeline('ro'),
-            filter_stopwords=True
-        )
+class PolishLemmatizeRemoveStopwordsFilterTokenizer(SpacyTokenizer):
+    language = 'pl'
+    return_lemma = True
+    filter_stopwords = True
 
 
-class RomanianLemmatizeTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(text, load_nlp_pipeline('ro'), return_lemma=True)
+class RomanianTokenizer(SpacyTokenizer):
+    language = 'ro'
 
 
-class RomanianLemmatizeFilterTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(
-            text,
-            load_nlp_pipeline('ro'),
-            return_lemma=True,
-            filter_numbers=True,
-            filter_punctuation=True,
-            filter_short_tokens=True
-        )
+class RomanianFilterTokenizer(SpacyTokenizer):
+    language = 'ro'
+    filter_numbers = True
+    filter_punctuation = True
+    filter_short_tokens = True
 
 
-class RomanianLemmatizeRemoveStopwordsFilterTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(
-            text,
-            load_nlp_pipeline('ro'),
-            return_lemma=True,
-            filter_stopwords=True
-        )
+class RomanianRemoveStopwordsTokenizer(SpacyTokenizer):
+    language = 'ro'
+    filter_stopwords = True
 
 
-class JapaneseTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(text, load_nlp_pipeline('jp'))
+class RomanianLemmatizeTokenizer(SpacyTokenizer):
+    language = 'ro'
+    return_lemma = True
 
 
-class JapaneseFilterTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(
-            text,
-            load_nlp_pipeline('jp'),
-            filter_numbers=True,
-            filter_punctuation=True,
-            filter_short_tokens=True
-        )
+class RomanianLemmatizeFilterTokenizer(SpacyTokenizer):
+    language = 'ro'
+    return_lemma = True
+    filter_numbers = True
+    filter_punctuation = True
+    filter_short_tokens = True
 
 
-class JapaneseRemoveStopwordsTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(
-            text,
-            load_nlp_pipeline('jp'),
-            filter_stopwords=True
-        )
+class RomanianLemmatizeRemoveStopwordsFilterTokenizer(SpacyTokenizer):
+    language = 'ro'
+    return_lemma = True
+    filter_stopwords = True
 
 
-class JapaneseLemmatizeTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(text, load_nlp_pipeline('jp'), return_lemma=True)
+class JapaneseTokenizer(SpacyTokenizer):
+    language = 'ja'
 
 
-class JapaneseLemmatizeFilterTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(
-            text,
-            load_nlp_pipeline('jp'),
-            return_lemma=True,
-            filter_numbers=True,
-            filter_punctuation=True,
-            filter_short_tokens=True
-        )
+class JapaneseFilterTokenizer(SpacyTokenizer):
+    language = 'ja'
+    filter_numbers = True
+    filter_punctuation = True
+    filter_short_tokens = True
 
 
-class JapaneseLemmatizeRemoveStopwordsFilterTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(
-            text,
-            load_nlp_pipeline('jp'),
-            return_lemma=True,
-            filter_stopwords=True
-        )
+class JapaneseRemoveStopwordsTokenizer(SpacyTokenizer):
+    language = 'ja'
+    filter_stopwords = True
 
 
-class ChineseTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(text, load_nlp_pipeline('zh'))
+class JapaneseLemmatizeTokenizer(SpacyTokenizer):
+    language = 'ja'
+    return_lemma = True
 
 
-class ChineseFilterTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(
-            text,
-            load_nlp_pipeline('zh'),
-            filter_numbers=True,
-            filter_punctuation=True,
-            filter_short_tokens=True
-        )
+class JapaneseLemmatizeFilterTokenizer(SpacyTokenizer):
+    language = 'ja'
+    return_lemma = True
+    filter_numbers = True
+    filter_punctuation = True
+    filter_short_tokens = True
 
 
-class ChineseRemoveStopwordsTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(
-            text,
-            load_nlp_pipeline('zh'),
-            filter_stopwords=True
-        )
+class JapaneseLemmatizeRemoveStopwordsFilterTokenizer(SpacyTokenizer):
+    language = 'ja'
+    return_lemma = True
+    filter_stopwords = True
 
 
-class ChineseLemmatizeTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(text, load_nlp_pipeline('zh'), return_lemma=True)
+class ChineseTokenizer(SpacyTokenizer):
+    language = 'zh'
 
 
-class ChineseLemmatizeFilterTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(
-            text,
-            load_nlp_pipeline('zh'),
-            return_lemma=True,
-            filter_numbers=True,
-            filter_punctuation=True,
-            filter_short_tokens=True
-        )
+class ChineseFilterTokenizer(SpacyTokenizer):
+    language = 'zh'
+    filter_numbers = True
+    filter_punctuation = True
+    filter_short_tokens = True
 
 
-class ChineseLemmatizeRemoveStopwordsFilterTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(
-            text,
-            load_nlp_pipeline('zh'),
-            return_lemma=True,
-            filter_stopwords=True
-        )
+class ChineseRemoveStopwordsTokenizer(SpacyTokenizer):
+    language = 'zh'
+    filter_stopwords = True
 
 
-class MultiTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(text, load_nlp_pipeline('xx'))
+class ChineseLemmatizeTokenizer(SpacyTokenizer):
+    language = 'zh'
+    return_lemma = True
 
 
-class MultiFilterTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(
-            text,
-            load_nlp_pipeline('xx'),
-            filter_numbers=True,
-            filter_punctuation=True,
-            filter_short_tokens=True
-        )
+class ChineseLemmatizeFilterTokenizer(SpacyTokenizer):
+    language = 'zh'
+    return_lemma = True
+    filter_numbers = True
+    filter_punctuation = True
+    filter_short_tokens = True
 
 
-class MultiRemoveStopwordsTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(
-            text,
-            load_nlp_pipeline('xx'),
-            filter_stopwords=True
-        )
+class ChineseLemmatizeRemoveStopwordsFilterTokenizer(SpacyTokenizer):
+    language = 'zh'
+    return_lemma = True
+    filter_stopwords = True
 
 
-class MultiLemmatizeTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(text, load_nlp_pipeline('xx'), return_lemma=True)
+class MultiTokenizer(SpacyTokenizer):
+    language = 'xx'
 
 
-class MultiLemmatizeFilterTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(
-            text,
-            load_nlp_pipeline('xx'),
-            return_lemma=True,
-            filter_numbers=True,
-            filter_punctuation=True,
-            filter_short_tokens=True
-        )
+class MultiFilterTokenizer(SpacyTokenizer):
+    language = 'xx'
+    filter_numbers = True
+    filter_punctuation = True
+    filter_short_tokens = True
 
 
-class MultiLemmatizeRemoveStopwordsTokenizer(BaseTokenizer):
-    def __call__(self, text):
-        return process_text(
-            text,
-            load_nlp_pipeline('xx'),
-            return_lemma=True,
-            filter_stopwords=True
-        )
+class MultiRemoveStopwordsTokenizer(SpacyTokenizer):
+    language = 'xx'
+    filter_stopwords = True
+
+
+class MultiLemmatizeTokenizer(SpacyTokenizer):
+    language = 'xx'
+    return_lemma = True
+
+
+class MultiLemmatizeFilterTokenizer(SpacyTokenizer):
+    language = 'xx'
+    return_lemma = True
+    filter_numbers = True
+    filter_punctuation = True
+    filter_short_tokens = True
+
+
+class MultiLemmatizeRemoveStopwordsTokenizer(SpacyTokenizer):
+    language = 'xx'
+    return_lemma = True
+    filter_stopwords = True
 
 
 class HFTokenizer(BaseTokenizer):
@@ -1168,6 +1185,9 @@ class HFTokenizer(BaseTokenizer):
     def __call__(self, text):
         return self.tokenizer.encode(text)
 
+    def tokenize_batch(self, texts):
+        return self.tokenizer(list(texts))['input_ids']
+
 
 tokenizer_registry = {
     'characters': CharactersToListTokenizer,
@@ -14,6 +14,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # ==============================================================================
+import contextlib
 import multiprocessing
 import warnings
 
@@ -45,6 +46,52 @@ def to_sparse(tensor, lengths, max_length):
     return tf.SparseTensor(indices, values, shape)
 
 
+# keras mixed precision policies, float16 computations need loss scaling
+MIXED_PRECISION_POLICIES = {'mixed_float16', 'mixed_bfloat16'}
+
+
+@contextlib.contextmanager
+def mixed_precision_policy(policy_name):
+    """
+    Layers created in this context compute in the half precision dtype of
+    the keras mixed precision policy and keep float32 variables.
+    :param policy_name: `mixed_float16`, `mixed_bfloat16` or None to keep
+           the current policy
+    """
+    if policy_name is None:
+        yield
+        return
+    if policy_name not in MIXED_PRECISION_POLICIES:
+        raise ValueError(
+            'Invalid mixed precision policy {}, valid policies are: '
+            '{}'.format(policy_name, ', '.join(sorted(MIXED_PRECISION_POLICIES)))
+        )
+    if hasattr(tf.keras.mixed_precision, 'set_global_policy'):
+        global_policy = tf.keras.mixed_precision.global_policy
+        set_global_policy = tf.keras.mixed_precision.set_global_policy
+    else:
+        # TensorFlow < 2.4
+        global_policy = tf.keras.mixed_precision.experimental.global_policy
+        set_global_policy = tf.keras.mixed_precision.experimental.set_policy
+    previous_policy = global_policy()
+    set_global_policy(policy_name)
+    try:
+        yield
+    finally:
+        set_global_policy(previous_policy)
+
+
+def get_compute_dtype(layer):
+    """
+    Returns the dtype the layer computes in, the half precision dtype
+    under a mixed precision policy. Layer.compute_dtype only exists from
+    TensorFlow 2.4.
+    """
+    if hasattr(layer, 'compute_dtype'):
+        return layer.compute_dtype
+    return layer._compute_dtype
+
+
 def initialize_tensorflow(gpus=None,
                           gpu_memory_limit=None,
                           allow_parallel_threads=True,
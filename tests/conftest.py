@@ -15,6 +15,7 @@
 # ==============================================================================
 
 import os
+import shutil
 import uuid
 
 import pytest
@@ -86,3 +87,7 @@ def delete_temporary_data(csv_path):
     hdf5_path = replace_file_extension(csv_path, 'hdf5')
     if os.path.isfile(hdf5_path):
         os.remove(hdf5_path)
+
+    npy_path = replace_file_extension(csv_path, 'npy')
+    if os.path.isdir(npy_path):
+        shutil.rmtree(npy_path)
@@ -13,12 +13,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # ==============================================================================
+import copy
 import logging
 import os
 import shutil
 import uuid
 from collections import namedtuple
 
+import numpy as np
 import pandas as pd
 import pytest
 import yaml
@@ -30,7 +32,9 @@ from ludwig.experiment import experiment_cli
 from ludwig.features.h3_feature import H3InputFeature
 from ludwig.predict import predict_cli
 from ludwig.utils.data_utils import read_csv
+from ludwig.utils.data_utils import replace_file_extension
 from ludwig.utils.defaults import default_random_seed
+from ludwig.utils.defaults import merge_with_defaults
 from tests.conftest import delete_temporary_data
 from tests.integration_tests.utils import ENCODERS, HF_ENCODERS, \
     HF_ENCODERS_SHORT, slow
@@ -415,6 +419,488 @@ def test_experiment_image_dataset(
     delete_temporary_data(test_csv_filename)
 
 
+@pytest.mark.parametrize('data_format', ['parquet', 'feather'])
+def test_experiment_columnar_dataset(data_format, csv_filename, tmpdir):
+    input_features = [
+        category_feature(vocab_size=10),
+        numerical_feature(),
+        text_feature(vocab_size=10, min_len=1),
+    ]
+    output_features = [category_feature(vocab_size=2, reduce_input='sum')]
+
+    rel_path = generate_data(
+        input_features,
+        output_features,
+        os.path.join(tmpdir, csv_filename)
+    )
+    dataset_df = read_csv(rel_path)
+    # columns not used by any feature are not loaded
+    dataset_df['unused_column'] = 'unused'
+    dataset_fp = replace_file_extension(rel_path, data_format)
+    if data_format == 'parquet':
+        dataset_df.to_parquet(dataset_fp)
+    else:
+        dataset_df.to_feather(dataset_fp)
+
+    run_experiment(
+        input_features,
+        output_features,
+        dataset=dataset_fp,
+        output_directory=str(tmpdir)
+    )
+
+
+def test_experiment_chunked_preprocessing(csv_filename, tmpdir):
+    input_features = [
+        category_feature(vocab_size=10),
+        numerical_feature(normalization='zscore'),
+        text_feature(vocab_size=10, min_len=1),
+        set_feature(),
+        timeseries_feature(),
+    ]
+    output_features = [category_feature(vocab_size=2, reduce_input='sum')]
+    rel_path = generate_data(
+        input_features,
+        output_features,
+        os.path.join(tmpdir, csv_filename)
+    )
+
+    model_definition = {
+        'input_features': input_features,
+        'output_features': output_features,
+        'combiner': {'type': 'concat', 'fc_size': 14},
+        'preprocessing': {'chunk_size': 17},
+        'training': {'epochs': 2}
+    }
+    run_experiment(
+        None, None,
+        model_definition=model_definition,
+        dataset=rel_path,
+        output_directory=str(tmpdir)
+    )
+
+
+@pytest.mark.parametrize('worker_type', ['process', 'thread'])
+def test_parallel_preprocessing(worker_type, csv_filename, tmpdir):
+    input_features = [
+        category_feature(vocab_size=10),
+        numerical_feature(normalization='minmax'),
+        text_feature(vocab_size=10, min_len=1),
+        set_feature(),
+        date_feature(),
+    ]
+    output_features = [category_feature(vocab_size=2, reduce_input='sum')]
+    rel_path = generate_data(
+        input_features,
+        output_features,
+        os.path.join(tmpdir, csv_filename)
+    )
+
+    preprocessed = []
+    for num_workers in [1, 3]:
+        model_definition = {
+            'input_features': copy.deepcopy(input_features),
+            'output_features': copy.deepcopy(output_features),
+            'preprocessing': {
+                'num_workers': num_workers,
+                'worker_type': worker_type
+            }
+        }
+        model_definition = merge_with_defaults(model_definition)
+        preprocessed.append(preprocess_for_training(
+            model_definition,
+            dataset=rel_path,
+            skip_save_processed_input=True,
+            preprocessing_params=model_definition['preprocessing']
+        ))
+
+    # results do not depend on the number of workers
+    sequential, parallel = preprocessed
+    assert sequential[3] == parallel[3]
+    for sequential_set, parallel_set in zip(sequential[:3], parallel[:3]):
+        sequential_data = sequential_set.get_dataset()
+        parallel_data = parallel_set.get_dataset()
+        assert sequential_data.keys() == parallel_data.keys()
+        for key in sequential_data:
+            assert np.array_equal(
+                sequential_set.get(key),
+                parallel_set.get(key)
+            )
+
+
+@pytest.mark.parametrize('tf_data_cache', [False, True])
+def test_experiment_tf_data_pipeline(tf_data_cache, csv_filename, tmpdir):
+    input_features = [
+        category_feature(vocab_size=10),
+        numerical_feature(),
+        text_feature(vocab_size=10, min_len=1),
+        set_feature(),
+    ]
+    output_features = [category_feature(vocab_size=2, reduce_input='sum')]
+    rel_path = generate_data(
+        input_features,
+        output_features,
+        os.path.join(tmpdir, csv_filename)
+    )
+
+    model_definition = {
+        'input_features': input_features,
+        'output_features': output_features,
+        'combiner': {'type': 'concat', 'fc_size': 14},
+        'training': {
+            'epochs': 2,
+            'input_pipeline': 'tf_data',
+            'tf_data_cache': tf_data_cache
+        }
+    }
+    model = LudwigModel(model_definition)
+    model.train(
+        dataset=rel_path,
+        output_directory=str(tmpdir),
+        skip_save_processed_input=True,
+        skip_save_model=True,
+        skip_save_progress=True,
+        skip_save_log=True
+    )
+    predictions, _ = model.predict(dataset=rel_path)
+    assert len(predictions) == len(read_csv(rel_path))
+
+
+@pytest.mark.parametrize('batch_tokens', [None, 256])
+@pytest.mark.parametrize('encoder', ['rnn', 'stacked_cnn'])
+def test_experiment_bucketing(encoder, batch_tokens, csv_filename, tmpdir):
+    input_features = [
+        text_feature(vocab_size=10, min_len=1, encoder=encoder),
+        numerical_feature(),
+    ]
+    output_features = [category_feature(vocab_size=2, reduce_input='sum')]
+    rel_path = generate_data(
+        input_features,
+        output_features,
+        os.path.join(tmpdir, csv_filename)
+    )
+
+    model_definition = {
+        'input_features': input_features,
+        'output_features': output_features,
+        'combiner': {'type': 'concat', 'fc_size': 14},
+        'training': {
+            'epochs': 2,
+            'bucketing_field': input_features[0]['name'],
+            'batch_tokens': batch_tokens
+        }
+    }
+    model = LudwigModel(model_definition)
+    model.train(
+        dataset=rel_path,
+        output_directory=str(tmpdir),
+        skip_save_processed_input=True,
+        skip_save_model=True,
+        skip_save_progress=True,
+        skip_save_log=True
+    )
+    predictions, _ = model.predict(dataset=rel_path)
+    assert len(predictions) == len(read_csv(rel_path))
+
+
+@pytest.mark.parametrize('chunk_size', [None, 17])
+def test_out_of_core_preprocessing(chunk_size, csv_filename, tmpdir):
+    input_features = [
+        category_feature(vocab_size=10),
+        numerical_feature(),
+        text_feature(vocab_size=10, min_len=1),
+        sequence_feature(vocab_size=10),
+        set_feature(),
+        bag_feature(),
+        timeseries_feature(),
+    ]
+    output_features = [category_feature(vocab_size=2, reduce_input='sum')]
+    rel_path = generate_data(
+        input_features,
+        output_features,
+        os.path.join(tmpdir, csv_filename)
+    )
+
+    preprocessed = []
+    for in_memory in [True, False]:
+        model_definition = {
+            'input_features': copy.deepcopy(input_features),
+            'output_features': copy.deepcopy(output_features),
+            'preprocessing': {'chunk_size': chunk_size}
+        }
+        for feature in model_definition['input_features']:
+            feature['preprocessing'] = {'in_memory': in_memory}
+        model_definition = merge_with_defaults(model_definition)
+        preprocessed.append(preprocess_for_training(
+            model_definition,
+            dataset=rel_path,
+            skip_save_processed_input=True,
+            preprocessing_params=model_definition['preprocessing']
+        ))
+
+    # the features not in memory are read from disk one batch at a time
+    in_memory, out_of_core = preprocessed
+    for in_memory_set, out_of_core_set in zip(
+            in_memory[:3],
+            out_of_core[:3]
+    ):
+        idx = np.random.permutation(in_memory_set.size)[:10]
+        for feature in input_features:
+            assert np.array_equal(
+                in_memory_set.get(feature['name'], idx),
+                out_of_core_set.get(feature['name'], idx)
+            )
+
+
+def test_chunked_preprocessing_out_of_core(csv_filename, tmpdir):
+    input_features = [
+        category_feature(vocab_size=10),
+        numerical_feature(),
+        text_feature(vocab_size=10, min_len=1),
+        set_feature(),
+    ]
+    output_features = [category_feature(vocab_size=2, reduce_input='sum')]
+    rel_path = generate_data(
+        input_features,
+        output_features,
+        os.path.join(tmpdir, csv_filename)
+    )
+
+    preprocessed = []
+    for skip_save_processed_input in [True, False]:
+        model_definition = merge_with_defaults({
+            'input_features': copy.deepcopy(input_features),
+            'output_features': copy.deepcopy(output_features),
+            'preprocessing': {'chunk_size': 17}
+        })
+        original_model_definition = copy.deepcopy(model_definition)
+        preprocessed.append(preprocess_for_training(
+            model_definition,
+            dataset=rel_path,
+            skip_save_processed_input=skip_save_processed_input,
+            preprocessing_params=model_definition['preprocessing']
+        ))
+        assert model_definition == original_model_definition
+
+    # the saved hdf5 file backs the text feature, only the indices of its
+    # rows are loaded, the other features are kept in memory
+    in_memory, out_of_core = preprocessed
+    text_name = input_features[2]['name']
+    for in_memory_set, out_of_core_set in zip(
+            in_memory[:3],
+            out_of_core[:3]
+    ):
+        assert out_of_core_set.data_hdf5_fp == replace_file_extension(
+            rel_path,
+            'hdf5'
+        )
+        assert out_of_core_set.get_dataset()[text_name].ndim == 1
+        for feature in input_features + output_features:
+            assert in_memory_set.is_in_memory(feature['name'])
+            assert out_of_core_set.is_in_memory(feature['name']) == (
+                feature['name'] != text_name
+            )
+            assert np.array_equal(
+                in_memory_set.get(feature['name']),
+                out_of_core_set.get(feature['name'])
+            )
+
+
+@pytest.mark.parametrize('chunk_size', [None, 17])
+def test_npy_processed_data(chunk_size, csv_filename, tmpdir):
+    input_features = [
+        category_feature(vocab_size=10),
+        numerical_feature(),
+        text_feature(vocab_size=10, min_len=1),
+        set_feature(),
+        bag_feature(),
+    ]
+    output_features = [category_feature(vocab_size=2, reduce_input='sum')]
+    rel_path = generate_data(
+        input_features,
+        output_features,
+        os.path.join(tmpdir, csv_filename)
+    )
+    npy_dir_path = replace_file_extension(rel_path, 'npy')
+
+    def preprocess(dataset, processed_data_format):
+        model_definition = merge_with_defaults({
+            'input_features': copy.deepcopy(input_features),
+            'output_features': copy.deepcopy(output_features),
+            'preprocessing': {
+                'chunk_size': chunk_size,
+                'processed_data_format': processed_data_format
+            }
+        })
+        return preprocess_for_training(
+            model_definition,
+            dataset=dataset,
+            preprocessing_params=model_definition['preprocessing']
+        )
+
+    built = preprocess(rel_path, 'hdf5')
+    os.remove(replace_file_extension(rel_path, 'hdf5'))
+    os.remove(replace_file_extension(rel_path, 'json'))
+    saved = preprocess(rel_path, 'npy')
+    assert os.path.isdir(npy_dir_path)
+    # the npy directory is reused, or provided directly
+    cached = preprocess(rel_path, 'npy')
+    loaded = preprocess(npy_dir_path, 'npy')
+    for dataset in cached[:3] + loaded[:3]:
+        assert isinstance(
+            dataset.get_dataset()[input_features[1]['name']],
+            np.memmap
+        )
+
+    # rows are grouped by split, each split keeps the order of the rows
+    for preprocessed in [saved, cached, loaded]:
+        for built_set, npy_set in zip(built[:3], preprocessed[:3]):
+            assert built_set.size == npy_set.size
+            for feature in input_features + output_features:
+                assert np.array_equal(
+                    built_set.get(feature['name']),
+                    npy_set.get(feature['name'])
+                )
+
+
+@pytest.mark.parametrize('chunk_size', [None, 17])
+def test_processed_data_reuse(chunk_size, csv_filename, tmpdir):
+    input_features = [
+        category_feature(vocab_size=10),
+        text_feature(vocab_size=10, min_len=1),
+    ]
+    output_features = [category_feature(vocab_size=2, reduce_input='sum')]
+    rel_path = generate_data(
+        input_features,
+        output_features,
+        os.path.join(tmpdir, csv_filename)
+    )
+    hdf5_fp = replace_file_extension(rel_path, 'hdf5')
+
+    def preprocess(text_preprocessing, skip_save_processed_input=False):
+        model_definition = merge_with_defaults({
+            'input_features': copy.deepcopy(input_features),
+            'output_features': copy.deepcopy(output_features),
+            'preprocessing': {'chunk_size': chunk_size}
+        })
+        model_definition['input_features'][1]['preprocessing'] = \
+            text_preprocessing
+        return preprocess_for_training(
+            model_definition,
+            dataset=rel_path,
+            skip_save_processed_input=skip_save_processed_input,
+            preprocessing_params=model_definition['preprocessing']
+        )[3]
+
+    preprocess({})
+    mtime = os.path.getmtime(hdf5_fp)
+    # the hdf5 and json files are reused with the same preprocessing
+    assert 'data_fingerprint' in preprocess({})
+    assert os.path.getmtime(hdf5_fp) == mtime
+
+    # other preprocessing parameters are not served the previous files
+    text_name = input_features[1]['name']
+    metadata = preprocess(
+        {'word_most_common': 5},
+        skip_save_processed_input=True
+    )
+    assert metadata[text_name]['word_vocab_size'] <= 5 + 4
+    # which are kept when the processed input is not saved
+    assert os.path.getmtime(hdf5_fp) == mtime
+
+    metadata = preprocess({'word_most_common': 5})
+    assert metadata[text_name]['word_vocab_size'] <= 5 + 4
+    assert os.path.getmtime(hdf5_fp) != mtime
+
+
+def test_preprocessing_cache(csv_filename, tmpdir):
+    input_features = [
+        category_feature(vocab_size=10),
+        numerical_feature(normalization='zscore'),
+        text_feature(vocab_size=10, min_len=1),
+    ]
+    output_features = [category_feature(vocab_size=2, reduce_input='sum')]
+    rel_path = generate_data(
+        input_features,
+        output_features,
+        os.path.join(tmpdir, csv_filename)
+    )
+    cache_dir = os.path.join(tmpdir, 'cache')
+
+    def preprocess(features_preprocessing):
+        model_definition = {
+            'input_features': copy.deepcopy(input_features),
+            'output_features': copy.deepcopy(output_features),
+            'preprocessing': {'cache_dir': cache_dir}
+        }
+        for feature in model_definition['input_features']:
+            if feature['name'] in features_preprocessing:
+                feature['preprocessing'] = features_preprocessing[
+                    feature['name']
+                ]
+        model_definition = merge_with_defaults(model_definition)
+        training_set, _, _, metadata = preprocess_for_training(
+            model_definition,
+            dataset=rel_path,
+            skip_save_processed_input=True,
+            preprocessing_params=model_definition['preprocessing']
+        )
+        return training_set.get_dataset(), metadata
+
+    # one entry per feature and one for the split
+    data, metadata = preprocess({})
+    assert len(os.listdir(cache_dir)) == 5
+
+    cached_data, cached_metadata = preprocess({})
+    assert len(os.listdir(cache_dir)) == 5
+    assert cached_metadata == metadata
+    for key in data:
+        assert np.array_equal(data[key], cached_data[key])
+
+    # only the feature with different preprocessing is rebuilt
+    text_name = input_features[2]['name']
+    preprocess({text_name: {'word_most_common': 5}})
+    assert len(os.listdir(cache_dir)) == 6
+
+    # changing the data invalidates all entries
+    dataset_df = pd.read_csv(rel_path)
+    dataset_df.iloc[:len(dataset_df) // 2].to_csv(rel_path, index=False)
+    preprocess({})
+    assert len(os.listdir(cache_dir)) == 11
+
+
+def test_text_feature_level_preprocessing(csv_filename, tmpdir):
+    input_features = [
+        text_feature(level='char', encoder='parallel_cnn'),
+        text_feature(level='word', encoder='parallel_cnn'),
+    ]
+    output_features = [category_feature(vocab_size=2, reduce_input='sum')]
+    rel_path = generate_data(
+        input_features,
+        output_features,
+        os.path.join(tmpdir, csv_filename)
+    )
+
+    model_definition = merge_with_defaults({
+        'input_features': input_features,
+        'output_features': output_features,
+    })
+    training_set, _, _, metadata = preprocess_for_training(
+        model_definition,
+        dataset=rel_path,
+        skip_save_processed_input=True,
+        preprocessing_params=model_definition['preprocessing']
+    )
+
+    # only the level used by each text feature is preprocessed
+    for feature in input_features:
+        other_level = 'word' if feature['level'] == 'char' else 'char'
+        feature_metadata = metadata[feature['name']]
+        assert '{}_idx2str'.format(feature['level']) in feature_metadata
+        assert '{}_idx2str'.format(other_level) not in feature_metadata
+        assert feature['name'] in training_set.get_dataset()
+
+
 def test_experiment_audio_inputs(csv_filename):
     # Audio Inputs
     audio_dest_folder = os.path.join(os.getcwd(), 'generated_audio')
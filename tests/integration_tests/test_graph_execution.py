@@ -15,10 +15,14 @@
 # ==============================================================================
 
 import contextlib
+import math
+import os
 
 import pytest
 import tensorflow as tf
 
+from ludwig.api import LudwigModel
+from ludwig.utils.tf_utils import get_compute_dtype
 from tests.integration_tests.utils import category_feature
 from tests.integration_tests.utils import generate_data
 from tests.integration_tests.utils import \
@@ -135,3 +139,130 @@ def test_sequence_generator(
 
         # run the experiment
         run_experiment(input_features, output_features, dataset=rel_path)
+
+
+def test_compiled_steps_not_retraced(csv_filename, tmpdir):
+    with graph_mode():
+        input_features = [
+            text_feature(vocab_size=10, min_len=1, encoder='rnn'),
+            numerical_feature()
+        ]
+        output_features = [category_feature(vocab_size=2, reduce_input='sum')]
+        rel_path = generate_data(
+            input_features,
+            output_features,
+            os.path.join(tmpdir, csv_filename)
+        )
+
+        model_definition = {
+            'input_features': input_features,
+            'output_features': output_features,
+            'combiner': {'type': 'concat', 'fc_size': 14},
+            'training': {
+                'epochs': 2,
+                'bucketing_field': input_features[0]['name'],
+                'batch_tokens': 256
+            }
+        }
+        model = LudwigModel(model_definition)
+        model.train(
+            dataset=rel_path,
+            output_directory=str(tmpdir),
+            skip_save_processed_input=True,
+            skip_save_model=True,
+            skip_save_progress=True,
+            skip_save_log=True
+        )
+        model.predict(dataset=rel_path, batch_size=7)
+
+        # batches of any size reuse the same graphs
+        assert model.model.retrace_counts() == {}
+
+
+@pytest.mark.parametrize('mixed_precision', ['mixed_float16', 'mixed_bfloat16'])
+def test_mixed_precision(mixed_precision, csv_filename, tmpdir):
+    with graph_mode():
+        input_features = [
+            text_feature(vocab_size=10, min_len=1, encoder='rnn'),
+            numerical_feature()
+        ]
+        output_features = [
+            category_feature(vocab_size=2, reduce_input='sum'),
+            sequence_feature(vocab_size=10, max_len=5, decoder='generator')
+        ]
+        rel_path = generate_data(
+            input_features,
+            output_features,
+            os.path.join(tmpdir, csv_filename)
+        )
+
+        model_definition = {
+            'input_features': input_features,
+            'output_features': output_features,
+            'combiner': {'type': 'concat', 'fc_size': 14},
+            'training': {'epochs': 2, 'mixed_precision': mixed_precision}
+        }
+        model = LudwigModel(model_definition)
+        _, _, output_directory = model.train(
+            dataset=rel_path,
+            output_directory=str(tmpdir),
+            skip_save_processed_input=True,
+            skip_save_progress=True,
+            skip_save_log=True
+        )
+        assert get_compute_dtype(model.model.combiner) == \
+            mixed_precision[6:]
+        predictions, _ = model.predict(dataset=rel_path)
+
+        # the float32 variables are loaded with any policy
+        for policy in [None, 'mixed_float16', 'mixed_bfloat16']:
+            loaded_model = LudwigModel.load(
+                os.path.join(output_directory, 'model'),
+                mixed_precision=policy
+            )
+            assert get_compute_dtype(loaded_model.model.combiner) == \
+                (policy or mixed_precision)[6:]
+            loaded_predictions, _ = loaded_model.predict(dataset=rel_path)
+            assert len(loaded_predictions) == len(predictions)
+
+
+@pytest.mark.parametrize('mixed_precision', [None, 'mixed_float16'])
+def test_gradient_accumulation(mixed_precision, csv_filename, tmpdir):
+    with graph_mode():
+        input_features = [
+            text_feature(vocab_size=10, min_len=1, encoder='rnn'),
+            numerical_feature()
+        ]
+        output_features = [category_feature(vocab_size=2, reduce_input='sum')]
+        rel_path = generate_data(
+            input_features, output_features,
+            os.path.join(tmpdir, csv_filename), num_examples=200
+        )
+
+        model_definition = {
+            'input_features': input_features,
+            'output_features': output_features,
+            'combiner': {'type': 'concat', 'fc_size': 14},
+            'training': {
+                'epochs': 2,
+                'batch_size': 16,
+                'gradient_accumulation_steps': 4,
+                'decay': True,
+                'mixed_precision': mixed_precision
+            }
+        }
+        model = LudwigModel(model_definition)
+        model.train(
+            dataset=rel_path,
+            output_directory=str(tmpdir),
+            skip_save_processed_input=True,
+            skip_save_model=True,
+            skip_save_progress=True,
+            skip_save_log=True
+        )
+
+        # one optimizer update every 4 batches
+        optimizer = model.model._compiled_steps.optimizer
+        assert 0 < optimizer.iterations.numpy() <= 2 * math.ceil(200 / 16) // 4
+        assert optimizer.accumulated_steps.numpy() < 4
+        assert model.model.retrace_counts() == {}
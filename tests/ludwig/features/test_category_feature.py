@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2019 Uber Technologies, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+import numpy as np
+import pandas as pd
+import pytest
+
+from ludwig.features.category_feature import CategoryFeatureMixin
+from ludwig.utils.strings_utils import UNKNOWN_SYMBOL
+from ludwig.utils.strings_utils import count_units
+
+column = pd.Series(['a', ' b', 'B', 'c ', 'a', 'b', 'd', 'a', 'B'])
+
+
+@pytest.mark.parametrize('lowercase', [False, True])
+def test_category_feature_stats(lowercase):
+    preprocessing_parameters = {'lowercase': lowercase, 'most_common': 2}
+    stats = CategoryFeatureMixin.update_feature_stats(
+        None,
+        column,
+        preprocessing_parameters
+    )
+
+    # same counts, in the same order, as tokenizing each row
+    unit_counts, max_length = count_units(
+        column,
+        'stripped',
+        lowercase=lowercase
+    )
+    assert list(stats['unit_counts'].items()) == list(unit_counts.items())
+    assert stats['max_length'] == max_length
+
+    metadata = CategoryFeatureMixin.get_feature_meta_from_stats(
+        stats,
+        preprocessing_parameters
+    )
+    assert np.array_equal(
+        CategoryFeatureMixin.feature_data(column, metadata),
+        [
+            metadata['str2idx'].get(
+                value.strip(),
+                metadata['str2idx'][UNKNOWN_SYMBOL]
+            )
+            for value in column
+        ]
+    )
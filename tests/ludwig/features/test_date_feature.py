@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2019 Uber Technologies, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+import numpy as np
+import pandas as pd
+import pytest
+
+from ludwig.features.date_feature import DateFeatureMixin
+
+
+@pytest.mark.parametrize(
+    'dates,datetime_format',
+    [
+        (
+            [
+                '2020-03-04 05:06:07',
+                '1999-12-31 23:59:59',
+                '',
+                'not a date',
+                '1500-01-01',
+                '2021-06-01T10:00:00+02:00',
+            ],
+            None
+        ),
+        (
+            ['04/03/2020 05:06', '31/12/1999 23:59', '2020-03-04'],
+            '%d/%m/%Y %H:%M'
+        ),
+    ]
+)
+def test_dates_to_matrix(dates, datetime_format):
+    preprocessing_parameters = {
+        'fill_value': '2000-01-01',
+        'datetime_format': datetime_format
+    }
+    column = pd.Series(dates, index=np.arange(len(dates))[::-1])
+
+    date_matrix = DateFeatureMixin.dates_to_matrix(
+        column,
+        datetime_format,
+        preprocessing_parameters
+    )
+
+    # same as parsing each date separately
+    assert np.array_equal(
+        date_matrix,
+        [
+            DateFeatureMixin.date_to_list(
+                date_str,
+                datetime_format,
+                preprocessing_parameters
+            )
+            for date_str in dates
+        ]
+    )
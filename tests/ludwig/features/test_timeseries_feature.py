@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2019 Uber Technologies, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+import numpy as np
+import pandas as pd
+import pytest
+
+from ludwig.features.timeseries_feature import TimeseriesFeatureMixin
+
+timeseries = [
+    [1.5, 2, 3],
+    [4],
+    [-5, 6.25, 7, 8, 9],
+]
+
+
+@pytest.mark.parametrize('padding', ['right', 'left'])
+@pytest.mark.parametrize(
+    'tokenizer,separator',
+    [('space', ' '), ('comma', ', ')]
+)
+@pytest.mark.parametrize('dtype', ['float32', 'float16'])
+def test_timeseries_feature_data(tokenizer, separator, padding, dtype):
+    column = pd.Series([
+        ' ' + separator.join(map(str, ts)) + ' ' for ts in timeseries
+    ])
+    preprocessing_parameters = {
+        'timeseries_length_limit': 4,
+        'padding_value': 0,
+        'padding': padding,
+        'tokenizer': tokenizer,
+        'dtype': dtype
+    }
+    metadata = TimeseriesFeatureMixin.get_feature_meta(
+        column,
+        preprocessing_parameters
+    )
+    assert metadata['max_timeseries_length'] == 4
+
+    timeseries_data = TimeseriesFeatureMixin.feature_data(
+        column,
+        metadata,
+        preprocessing_parameters
+    )
+
+    expected = np.zeros((len(timeseries), 4), dtype=dtype)
+    for i, ts in enumerate(timeseries):
+        ts = ts[:4]
+        if padding == 'right':
+            expected[i, :len(ts)] = ts
+        else:
+            expected[i, 4 - len(ts):] = ts
+    assert timeseries_data.dtype == np.dtype(dtype)
+    assert np.array_equal(timeseries_data, expected)
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2019 Uber Technologies, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ludwig.features.vector_feature import VectorFeatureMixin
+
+vectors = np.random.RandomState(0).rand(5, 3).astype(np.float32)
+
+
+def test_vector_feature_data_formats(tmpdir):
+    strings = pd.Series([
+        '\t'.join(map(repr, vector.tolist())) for vector in vectors
+    ])
+    assert np.array_equal(VectorFeatureMixin.feature_data(strings), vectors)
+
+    lists = pd.Series([vector.tolist() for vector in vectors])
+    assert np.array_equal(VectorFeatureMixin.feature_data(lists), vectors)
+
+    file_names = []
+    for i, vector in enumerate(vectors):
+        file_names.append('vector_{}.npy'.format(i))
+        np.save(os.path.join(tmpdir, file_names[-1]), vector)
+    assert np.array_equal(
+        VectorFeatureMixin.feature_data(
+            pd.Series(file_names),
+            csv_path=str(tmpdir)
+        ),
+        vectors
+    )
+
+
+@pytest.mark.parametrize(
+    'strings',
+    [['1 2', '3'], ['1 2', ''], ['1 2', '3 x']]
+)
+def test_vector_feature_data_invalid(strings):
+    with pytest.raises(ValueError):
+        VectorFeatureMixin.feature_data(pd.Series(strings))
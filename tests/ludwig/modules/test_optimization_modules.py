@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2020 Uber Technologies, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+import numpy as np
+import tensorflow as tf
+
+from ludwig.modules.optimization_modules import ClippedOptimizer
+
+
+def test_dynamic_loss_scaling(tmpdir):
+    optimizer = ClippedOptimizer(
+        type='sgd',
+        learning_rate=0.1,
+        clipglobalnorm=None,
+        dynamic_loss_scaling=True
+    )
+    variable = tf.Variable([1.0, 2.0])
+    loss_scale = optimizer.loss_scale_optimizer.loss_scale.numpy()
+
+    # the gradients are unscaled before they are applied
+    with tf.GradientTape() as tape:
+        loss = tf.reduce_sum(variable * variable)
+    assert optimizer.minimize_with_tape(tape, loss, [variable])
+    assert np.allclose(variable.numpy(), [0.8, 1.6])
+    assert optimizer.loss_scale_optimizer.loss_scale.numpy() == loss_scale
+
+    # overflowing gradients are skipped and the scale is halved
+    with tf.GradientTape() as tape:
+        loss = tf.reduce_sum(variable * np.inf)
+    assert not optimizer.minimize_with_tape(tape, loss, [variable])
+    assert np.allclose(variable.numpy(), [0.8, 1.6])
+    assert optimizer.loss_scale_optimizer.loss_scale.numpy() == \
+        loss_scale / 2
+
+    # the loss scale is saved with the optimizer
+    checkpoint_path = tf.train.Checkpoint(optimizer=optimizer).save(
+        str(tmpdir.join('checkpoint'))
+    )
+    restored_optimizer = ClippedOptimizer(
+        type='sgd',
+        learning_rate=0.1,
+        clipglobalnorm=None,
+        dynamic_loss_scaling=True
+    )
+    tf.train.Checkpoint(optimizer=restored_optimizer).restore(
+        checkpoint_path
+    )
+    assert restored_optimizer.loss_scale_optimizer.loss_scale.numpy() == \
+        loss_scale / 2
+
+
+def test_gradient_accumulation():
+    optimizer = ClippedOptimizer(
+        type='sgd',
+        learning_rate=0.1,
+        clipglobalnorm=None,
+        gradient_accumulation_steps=2
+    )
+    variable = tf.Variable([1.0, 2.0])
+    embeddings = tf.Variable(tf.ones([3, 2]))
+
+    def minimize(indices):
+        with tf.GradientTape() as tape:
+            # the embeddings get sparse gradients
+            loss = tf.reduce_sum(variable * variable) + tf.reduce_sum(
+                tf.gather(embeddings, indices)
+            )
+        return optimizer.minimize_with_tape(
+            tape, loss, [variable, embeddings]
+        )
+
+    # the gradients are applied every other step
+    assert not minimize([0])
+    assert np.allclose(variable.numpy(), [1.0, 2.0])
+    assert np.allclose(embeddings.numpy(), 1)
+    assert optimizer.iterations.numpy() == 0
+
+    # the mean of the accumulated gradients is applied
+    assert minimize([0, 1])
+    assert np.allclose(variable.numpy(), [0.8, 1.6])
+    assert np.allclose(embeddings.numpy()[:, 0], [0.9, 0.95, 1])
+    assert optimizer.iterations.numpy() == 1
+    assert optimizer.accumulated_steps.numpy() == 0
+
+
+def test_gradient_accumulation_horovod():
+    allreduced = []
+
+    class Horovod:
+        @staticmethod
+        def allreduce(tensor):
+            allreduced.append(tensor)
+            return tensor
+
+    optimizer = ClippedOptimizer(
+        type='sgd',
+        learning_rate=0.1,
+        clipglobalnorm=None,
+        horovod=Horovod,
+        gradient_accumulation_steps=2
+    )
+    variable = tf.Variable([1.0, 2.0])
+
+    def minimize():
+        with tf.GradientTape() as tape:
+            loss = tf.reduce_sum(variable * variable)
+        return optimizer.minimize_with_tape(tape, loss, [variable])
+
+    # the gradients are only allreduced when they are applied
+    assert not minimize()
+    assert allreduced == []
+    assert minimize()
+    assert len(allreduced) == 1
+    assert np.allclose(allreduced[0].numpy(), [2.0, 4.0])
+    assert np.allclose(variable.numpy(), [0.8, 1.6])
@@ -0,0 +1,434 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2019 Uber Technologies, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+import os
+
+import numpy as np
+import pytest
+
+from ludwig.data.dataset import Dataset
+from ludwig.features.sequence_feature import SequenceInputFeature
+from ludwig.models.ecd import ignores_trailing_padding
+from ludwig.utils.batcher import Batcher
+from ludwig.utils.batcher import BucketedBatcher
+from ludwig.utils.batcher import DistributedBatcher
+from ludwig.utils.batcher import PrefetchBatcher
+from ludwig.utils.batcher import TFDatasetBatcher
+from ludwig.utils.batcher import chunk_shuffle_permutation
+from ludwig.utils.batcher import initialize_batcher
+from ludwig.utils.batcher import sequence_lengths
+from ludwig.utils.data_utils import append_out_of_core_data
+
+
+def test_chunk_shuffle_permutation():
+    permutation = chunk_shuffle_permutation(100, 10, 20)
+    assert sorted(permutation) == list(range(100))
+    # each buffer contains two whole chunks
+    for start in range(0, 100, 20):
+        chunks = np.unique(permutation[start:start + 20] // 10)
+        assert len(chunks) == 2
+
+
+def test_out_of_core_batcher(tmpdir):
+    data_fp = os.path.join(tmpdir, 'data.hdf5')
+    x = np.random.rand(50, 4)
+    dataset = {'x': x, 'y': np.arange(50)}
+    append_out_of_core_data(data_fp, dataset, 'x')
+    # rows stored in a different order than the dataset positions
+    permutation = np.random.permutation(50)
+    dataset = {key: value[permutation] for key, value in dataset.items()}
+
+    features = [
+        {'name': 'x', 'type': 'vector', 'preprocessing': {'in_memory': False}}
+    ]
+    output_features = [{'name': 'y', 'type': 'numerical'}]
+    batcher = Batcher(
+        Dataset(dataset, features, output_features, data_fp),
+        batch_size=8
+    )
+    ys = []
+    while not batcher.last_batch():
+        batch = batcher.next_batch()
+        assert np.array_equal(batch['x'], x[batch['y']])
+        # batches are gathered into reused buffers
+        ys.append(batch['y'].copy())
+    assert sorted(np.concatenate(ys)) == list(range(50))
+
+
+def test_batcher_shuffles_indices():
+    x = np.random.rand(50, 4)
+    dataset = {'x': x, 'y': np.arange(50)}
+    features = [{'name': 'x', 'type': 'vector'}]
+    output_features = [{'name': 'y', 'type': 'numerical'}]
+
+    batcher = Batcher(
+        Dataset(dataset, features, output_features, None),
+        batch_size=8
+    )
+    orders = []
+    for epoch in range(2):
+        ys = []
+        while not batcher.last_batch():
+            batch = batcher.next_batch()
+            assert np.array_equal(batch['x'], x[batch['y']])
+            ys.append(batch['y'].copy())
+        orders.append(np.concatenate(ys))
+        assert sorted(orders[-1]) == list(range(50))
+        batcher.reset()
+    # the dataset is not moved, each epoch follows a new permutation
+    assert dataset['x'] is x
+    assert not np.array_equal(orders[0], orders[1])
+
+    # without shuffling batches are views of the dataset
+    batcher = Batcher(
+        Dataset(dataset, features, output_features, None),
+        batch_size=8,
+        should_shuffle=False
+    )
+    batch = batcher.next_batch()
+    assert np.shares_memory(batch['x'], x)
+    assert np.array_equal(batch['y'], np.arange(8))
+
+
+class FakeHorovod:
+    def __init__(self, size):
+        self._size = size
+
+    def size(self):
+        return self._size
+
+
+def test_distributed_batcher_partitions():
+    dataset = {'y': np.arange(50)}
+    output_features = [{'name': 'y', 'type': 'numerical'}]
+
+    ys = []
+    for rank in range(3):
+        # workers draw the same permutation
+        np.random.seed(42)
+        batcher = DistributedBatcher(
+            Dataset(dataset, [], output_features, None),
+            rank,
+            FakeHorovod(3),
+            batch_size=8
+        )
+        while not batcher.last_batch():
+            ys.append(batcher.next_batch()['y'].copy())
+    assert sorted(np.concatenate(ys)) == list(range(50))
+
+
+def test_prefetch_batcher():
+    x = np.random.rand(50, 4)
+    dataset = {'x': x, 'y': np.arange(50)}
+    features = [{'name': 'x', 'type': 'vector'}]
+    output_features = [{'name': 'y', 'type': 'numerical'}]
+    batcher = PrefetchBatcher(
+        Batcher(
+            Dataset(dataset, features, output_features, None),
+            batch_size=8
+        ),
+        prefetch_batches=3
+    )
+
+    for batch_size in [8, 10]:
+        # the batch size applies to the batches prefetched after a reset
+        batcher.batch_size = batch_size
+        ys = []
+        previous_batch = None
+        while not batcher.last_batch():
+            batch = batcher.next_batch()
+            assert len(batch['y']) <= batch_size
+            assert np.array_equal(batch['x'], x[batch['y']])
+            # the previous batch is not overwritten by the prefetched ones
+            if previous_batch is not None:
+                assert np.array_equal(previous_batch[0], previous_batch[1])
+            previous_batch = (batch['y'], batch['y'].copy())
+            ys.append(batch['y'].copy())
+        assert batcher.step == len(ys)
+        assert sorted(np.concatenate(ys)) == list(range(50))
+        batcher.reset()
+    assert batcher.wait_time > 0
+
+    # a reset in the middle of an epoch restarts it
+    batcher.next_batch()
+    batcher.reset()
+    ys = []
+    while not batcher.last_batch():
+        ys.append(batcher.next_batch()['y'].copy())
+    assert sorted(np.concatenate(ys)) == list(range(50))
+    batcher.close()
+
+
+@pytest.mark.parametrize('cache', [False, True])
+def test_tf_dataset_batcher(cache, tmpdir):
+    data_fp = os.path.join(tmpdir, 'data.hdf5')
+    x = np.random.rand(50, 4).astype(np.float32)
+    dataset = {'x': x, 'y': np.arange(50)}
+    append_out_of_core_data(data_fp, dataset, 'x')
+    features = [
+        {'name': 'x', 'type': 'vector', 'preprocessing': {'in_memory': False}}
+    ]
+    output_features = [{'name': 'y', 'type': 'numerical'}]
+    batcher = TFDatasetBatcher(
+        Dataset(dataset, features, output_features, data_fp),
+        batch_size=8,
+        cache=cache
+    )
+
+    orders = []
+    for epoch in range(2):
+        ys = []
+        while not batcher.last_batch():
+            batch = batcher.next_batch()
+            assert batch['x'].shape[1:] == (4,)
+            assert np.array_equal(batch['x'].numpy(), x[batch['y'].numpy()])
+            ys.append(batch['y'].numpy())
+        assert batcher.step == batcher.steps_per_epoch
+        orders.append(np.concatenate(ys))
+        assert sorted(orders[-1]) == list(range(50))
+        batcher.reset()
+    assert not np.array_equal(orders[0], orders[1])
+
+    batcher.batch_size = 50
+    assert len(batcher.next_batch()['y']) == 50
+
+
+def padded_sequences(lengths, max_length, padding):
+    sequences = np.zeros((len(lengths), max_length), dtype=np.int32)
+    for i, length in enumerate(lengths):
+        if padding == 'right':
+            sequences[i, :length] = np.arange(1, length + 1)
+        elif length > 0:
+            sequences[i, -length:] = np.arange(1, length + 1)
+    return sequences
+
+
+@pytest.mark.parametrize('pad_idx', [0, 50])
+@pytest.mark.parametrize('padding', ['right', 'left'])
+def test_bucketed_batcher(padding, pad_idx):
+    lengths = np.random.randint(0, 40, size=100)
+    lengths[0] = 10
+    x = padded_sequences(lengths, 40, padding)
+    if pad_idx != 0:
+        # the first token has index 0
+        x = np.where(x == 0, pad_idx, x - 1)
+    dataset = Dataset(
+        {'x': x, 'y': np.arange(100)},
+        [{'name': 'x', 'type': 'sequence', 'encoder': 'rnn'}],
+        [{'name': 'y', 'type': 'numerical'}],
+        None
+    )
+    assert np.array_equal(
+        sequence_lengths(dataset, 'x', pad_idx, chunk_size=7),
+        lengths
+    )
+
+    batcher = BucketedBatcher(
+        dataset,
+        'x',
+        batch_size=8,
+        should_trim=True,
+        padding_value=pad_idx
+    )
+    assert batcher.trim_side == padding
+    ys = []
+    while not batcher.last_batch():
+        batch = batcher.next_batch()
+        max_length = lengths[batch['y']].max()
+        assert batch['x'].shape[1] % 8 == 0
+        assert max_length <= batch['x'].shape[1] < max_length + 8
+        # only padding is trimmed
+        assert np.array_equal(
+            np.count_nonzero(batch['x'] != pad_idx, axis=1),
+            lengths[batch['y']]
+        )
+        ys.append(batch['y'].copy())
+    assert batcher.step == batcher.steps_per_epoch
+    assert sorted(np.concatenate(ys)) == list(range(100))
+
+
+def test_prefetch_bucketed_batcher_random_state():
+    lengths = np.random.randint(0, 40, size=100)
+    dataset = Dataset(
+        {'x': padded_sequences(lengths, 40, 'right'), 'y': np.arange(100)},
+        [{'name': 'x', 'type': 'sequence', 'encoder': 'rnn'}],
+        [{'name': 'y', 'type': 'numerical'}],
+        None
+    )
+
+    epochs = []
+    for prefetch_batches in [0, 3]:
+        np.random.seed(42)
+        batcher = initialize_batcher(
+            dataset,
+            batch_size=8,
+            bucketing_field='x',
+            prefetch_batches=prefetch_batches
+        )
+        ys = []
+        for epoch in range(2):
+            while not batcher.last_batch():
+                ys.append(batcher.next_batch()['y'].copy())
+                # draws of the training loop do not change the batches
+                np.random.random()
+            batcher.reset()
+        epochs.append(np.concatenate(ys))
+        if prefetch_batches > 0:
+            batcher.close()
+    assert np.array_equal(epochs[0], epochs[1])
+
+
+@pytest.mark.parametrize('trim_padding', [True, False])
+def test_bucketed_batcher_batch_tokens(trim_padding, caplog):
+    # a few long sequences among many short ones
+    lengths = np.concatenate([
+        np.random.randint(1, 8, size=180),
+        np.random.randint(60, 64, size=20)
+    ])
+    x = padded_sequences(lengths, 64, 'right')
+    dataset = Dataset(
+        {'x': x, 'y': np.arange(200)},
+        [{'name': 'x', 'type': 'sequence', 'encoder': 'rnn'}],
+        [{'name': 'y', 'type': 'numerical'}],
+        None
+    )
+    batcher = initialize_batcher(
+        dataset,
+        bucketing_field='x',
+        batch_tokens=256,
+        trim_padding=trim_padding
+    )
+    # untrimmed batches of tokens are batches of a fixed size
+    assert ('batches of 256 tokens have 4 rows' in caplog.text) != \
+        trim_padding
+
+    for epoch in range(2):
+        steps_per_epoch = batcher.steps_per_epoch
+        ys = []
+        while not batcher.last_batch():
+            batch = batcher.next_batch()
+            assert batch['x'].size <= 256
+            ys.append(batch['y'].copy())
+        assert batcher.step == steps_per_epoch == len(ys)
+        assert sorted(np.concatenate(ys)) == list(range(200))
+        batcher.reset()
+
+    if trim_padding:
+        # short sequences are batched 32 at a time, long ones 4 at a time
+        assert steps_per_epoch == 180 // 32 + 1 + 20 // 4
+    else:
+        assert steps_per_epoch == 200 // 4
+
+
+@pytest.mark.parametrize('padding', ['right', 'left'])
+def test_initialize_bucketed_batcher(padding):
+    lengths = np.random.randint(1, 20, size=50)
+    x = padded_sequences(lengths, 20, padding)
+    dataset = {'x': x, 'y': np.arange(50)}
+    input_features = [{'name': 'x', 'type': 'sequence', 'encoder': 'rnn'}]
+    output_features = [{'name': 'y', 'type': 'numerical'}]
+
+    for trim_padding in [True, False]:
+        batcher = initialize_batcher(
+            Dataset(dataset, input_features, output_features, None),
+            batch_size=8,
+            bucketing_field='x',
+            trim_padding=trim_padding,
+            prefetch_batches=2
+        )
+        # only the padding at the end of the sequences is trimmed
+        should_trim = trim_padding and padding == 'right'
+        assert batcher.batcher.should_trim == should_trim
+        batch = batcher.next_batch()
+        assert 0 < len(batch['y']) <= 8
+        if should_trim:
+            assert batch['x'].shape[1] < 20 + 8
+            assert np.array_equal(
+                np.count_nonzero(batch['x'], axis=1),
+                lengths[batch['y']]
+            )
+        else:
+            assert batch['x'].shape[1] == 20
+        batcher.close()
+
+    with pytest.raises(ValueError):
+        initialize_batcher(
+            Dataset(dataset, [], output_features, None),
+            bucketing_field='x'
+        )
+    with pytest.raises(ValueError):
+        initialize_batcher(
+            Dataset(dataset, [], output_features, None),
+            batch_tokens=256
+        )
+
+
+@pytest.mark.parametrize('encoder,reduce_output,trimmed', [
+    ('rnn', 'last', True),
+    ('embed', 'sum', True),
+    ('embed', 'last', True),
+    ('rnn', 'sum', False),
+    ('parallel_cnn', 'sum', False),
+])
+def test_bucketed_batches_encoder_outputs(encoder, reduce_output, trimmed):
+    # a few long sequences among many short ones
+    lengths = np.concatenate([
+        np.random.randint(1, 8, size=90),
+        np.random.randint(30, 40, size=10)
+    ])
+    x = padded_sequences(lengths, 40, 'right')
+    feature = {
+        'name': 'x',
+        'type': 'sequence',
+        'encoder': encoder,
+        'reduce_output': reduce_output
+    }
+    dataset = Dataset(
+        {'x': x, 'y': np.arange(100)},
+        [feature],
+        [{'name': 'y', 'type': 'numerical'}],
+        None
+    )
+    input_feature = SequenceInputFeature({
+        **feature,
+        'vocab': [str(i) for i in range(40)],
+        'max_sequence_length': 40
+    })
+    assert ignores_trailing_padding(input_feature) == trimmed
+
+    batcher = initialize_batcher(
+        dataset,
+        bucketing_field='x',
+        batch_tokens=128,
+        trim_padding=ignores_trailing_padding(input_feature)
+    )
+    while not batcher.last_batch():
+        batch = batcher.next_batch()
+        assert batch['x'].size <= 128
+        if trimmed:
+            # training batches encode as the padded rows evaluation encodes
+            assert np.allclose(
+                input_feature(batch['x'])['encoder_output'],
+                input_feature(x[batch['y']])['encoder_output'],
+                atol=1e-6
+            )
+        else:
+            assert batch['x'].shape[1] == 40
+
+    # batches of short sequences hold more rows than 128 // 40
+    if trimmed:
+        assert batcher.steps_per_epoch < (100 // 3 + 1) // 2
+    else:
+        assert batcher.steps_per_epoch == 100 // 3 + 1
@@ -13,9 +13,31 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # ==============================================================================
+import os
+
+import h5py
+import numpy as np
 import pandas as pd
+import pytest
+from scipy import sparse
 
+from ludwig.data.cache import PreprocessingCache
+from ludwig.data.preprocessing import normalize_columns
 from ludwig.utils.data_utils import add_sequence_feature_column
+from ludwig.utils.data_utils import append_hdf5
+from ludwig.utils.data_utils import append_out_of_core_data
+from ludwig.utils.data_utils import load_hdf5
+from ludwig.utils.data_utils import load_npy_dir
+from ludwig.utils.data_utils import load_npy_dir_metadata
+from ludwig.utils.data_utils import out_of_core_data_key
+from ludwig.utils.data_utils import read_csv
+from ludwig.utils.data_utils import read_csv_chunks
+from ludwig.utils.data_utils import read_feather
+from ludwig.utils.data_utils import read_hdf5_rows
+from ludwig.utils.data_utils import read_parquet
+from ludwig.utils.data_utils import save_hdf5
+from ludwig.utils.data_utils import save_npy_dir
+from ludwig.utils.data_utils import split_dataset_ttv
 
 
 def test_add_sequence_feature_column():
@@ -53,3 +75,178 @@ def test_add_sequence_feature_column():
 
     add_sequence_feature_column(df, 'y', 2)
     assert df.equals(pd.DataFrame([1, 2, 3, 4, 5], columns=['x']))
+
+
+@pytest.mark.parametrize('data_format', ['parquet', 'feather'])
+def test_read_columnar_projection(data_format, tmpdir):
+    df = pd.DataFrame({
+        'x': [1, 2, 3],
+        'y': [0.5, 1.5, 2.5],
+        'unused': ['a', 'b', 'c'],
+    })
+    data_fp = os.path.join(tmpdir, 'data.' + data_format)
+    read_fn = read_parquet
+    if data_format == 'parquet':
+        df.to_parquet(data_fp)
+    else:
+        df.to_feather(data_fp)
+        read_fn = read_feather
+
+    # columns not in the file (e.g. split) are ignored
+    projected_df = read_fn(data_fp, columns=['x', 'y', 'split'])
+    assert list(projected_df.columns) == ['x', 'y']
+    assert projected_df['x'].dtype == df['x'].dtype
+    assert projected_df['y'].dtype == df['y'].dtype
+
+    assert list(read_fn(data_fp).columns) == ['x', 'y', 'unused']
+
+
+def test_read_csv_chunks_escapechar(tmpdir):
+    data_fp = os.path.join(tmpdir, 'data.csv')
+    with open(data_fp, 'w') as f:
+        f.write('x,y\n1,a\n2,b\n3,c\n4,d\n5,"e\\",f"\n6,g\n')
+
+    # the row failing to parse is in the second chunk, the rows of the
+    # first one are not returned twice
+    df = pd.concat(read_csv_chunks(data_fp, 3))
+    assert df.equals(read_csv(data_fp))
+    assert df['y'].tolist() == ['a', 'b', 'c', 'd', 'e",f', 'g']
+
+
+def test_preprocessing_cache_eviction(tmpdir):
+    cache = PreprocessingCache(os.path.join(tmpdir, 'cache'))
+    data = {'x': np.arange(100)}
+    for key in ['a', 'b']:
+        cache.put(key, data, {'key': key})
+        os.utime(os.path.join(cache.cache_dir, key), (1000, 1000))
+
+    cached_data, cached_metadata = cache.get('a')
+    assert np.array_equal(cached_data['x'], data['x'])
+    assert cached_metadata == {'key': 'a'}
+    assert cache.get('c') is None
+
+    # only two entries fit, the least recently used one is evicted
+    entry_size = sum(
+        os.path.getsize(os.path.join(cache.cache_dir, 'a', file_name))
+        for file_name in os.listdir(os.path.join(cache.cache_dir, 'a'))
+    )
+    cache.max_size = 2 * entry_size
+    cache.put('c', data, {'key': 'c'})
+    assert sorted(os.listdir(cache.cache_dir)) == ['a', 'c']
+
+
+def test_sparse_hdf5(tmpdir):
+    matrix = sparse.random(20, 10, density=0.2, format='csr', dtype=np.float32)
+    data = {'x': matrix, 'y': np.arange(20)}
+
+    saved_fp = os.path.join(tmpdir, 'saved.hdf5')
+    save_hdf5(saved_fp, data)
+    loaded = load_hdf5(saved_fp)
+    assert sparse.issparse(loaded['x'])
+    assert np.array_equal(loaded['x'].toarray(), matrix.toarray())
+
+    # chunks appended one after the other
+    appended_fp = os.path.join(tmpdir, 'appended.hdf5')
+    for start in range(0, 20, 7):
+        append_hdf5(
+            appended_fp,
+            {key: value[start:start + 7] for key, value in data.items()}
+        )
+    loaded = load_hdf5(appended_fp)
+    assert np.array_equal(loaded['x'].toarray(), matrix.toarray())
+    assert np.array_equal(loaded['y'], data['y'])
+
+    split = np.arange(20) % 3
+    training_set, test_set, validation_set = split_dataset_ttv(loaded, split)
+    assert np.array_equal(
+        validation_set['x'].toarray(),
+        matrix.toarray()[split == 1]
+    )
+
+
+def test_normalize_columns():
+    df = pd.DataFrame({
+        'category': [1, None, 2],
+        'numerical': [0.5, None, 1.5],
+        'text': ['a b', 'c', 'd'],
+    })
+    features = [
+        {'name': 'category', 'type': 'category'},
+        {'name': 'numerical', 'type': 'numerical',
+         'preprocessing': {'missing_value_strategy': 'fill_with_mean'}},
+        {'name': 'text', 'type': 'text'},
+    ]
+    preprocessing_parameters = {
+        'category': {'missing_value_strategy': 'fill_with_const',
+                     'fill_value': '<UNK>'},
+        'numerical': {'missing_value_strategy': 'fill_with_const',
+                      'fill_value': 0},
+        'text': {'missing_value_strategy': 'fill_with_const',
+                 'fill_value': ''},
+    }
+    text_values = df['text'].values
+    normalize_columns(df, features, preprocessing_parameters)
+    assert list(df['category']) == ['1.0', '<UNK>', '2.0']
+    assert list(df['numerical']) == [0.5, 1.0, 1.5]
+    # columns that are already normalized are not copied
+    assert np.shares_memory(df['text'].values, text_values)
+
+    category_values = df['category'].values
+    normalize_columns(df, features, preprocessing_parameters)
+    assert np.shares_memory(df['category'].values, category_values)
+
+
+def test_out_of_core_data(tmpdir):
+    dense = np.random.rand(20, 3)
+    matrix = sparse.random(20, 10, density=0.2, format='csr', dtype=np.float32)
+
+    data_fp = os.path.join(tmpdir, 'data.hdf5')
+    indices = {'x': [], 'y': []}
+    for start in range(0, 20, 7):
+        chunk = {'x': dense[start:start + 7], 'y': matrix[start:start + 7]}
+        for key in chunk:
+            append_out_of_core_data(data_fp, chunk, key)
+            indices[key].append(chunk[key])
+    for key in indices:
+        assert np.array_equal(np.concatenate(indices[key]), np.arange(20))
+
+    # single rows, runs of consecutive rows, runs across appended chunks
+    for rows in [
+        np.array([0, 3, 4, 12, 19]),
+        np.array([5, 6, 7, 8, 9, 15, 16]),
+        np.arange(20),
+        np.array([], dtype=np.int64)
+    ]:
+        with h5py.File(data_fp, 'r') as h5_file:
+            assert np.array_equal(
+                read_hdf5_rows(h5_file[out_of_core_data_key('x')], rows),
+                dense[rows]
+            )
+            sparse_rows = read_hdf5_rows(
+                h5_file[out_of_core_data_key('y')],
+                rows
+            )
+            assert sparse_rows.shape == (len(rows), 10)
+            assert np.array_equal(
+                sparse_rows.toarray(),
+                matrix[rows].toarray()
+            )
+
+
+def test_npy_dir(tmpdir):
+    matrix = sparse.random(20, 10, density=0.2, format='csr', dtype=np.float32)
+    data = {'x': np.random.rand(20, 3), 'y': matrix, 'z': np.arange(20)}
+    data_dir = os.path.join(tmpdir, 'data.npy')
+    save_npy_dir(data_dir, data, {'x': {'preprocessing': {}}})
+
+    loaded = load_npy_dir(data_dir)
+    assert sorted(loaded) == ['x', 'y', 'z']
+    assert isinstance(loaded['x'], np.memmap)
+    assert np.array_equal(loaded['x'], data['x'])
+    assert sparse.issparse(loaded['y'])
+    assert np.array_equal(loaded['y'].toarray(), matrix.toarray())
+    assert load_npy_dir_metadata(data_dir) == {'x': {'preprocessing': {}}}
+
+    loaded = load_npy_dir(data_dir, ['z'])
+    assert list(loaded) == ['z']
+    assert np.array_equal(loaded['z'], data['z'])
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2019 Uber Technologies, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+import numpy as np
+
+from ludwig.features.h3_feature import H3FeatureMixin
+from ludwig.features.h3_feature import H3_PADDING_VALUE
+from ludwig.features.h3_feature import MAX_H3_RESOLUTION
+from ludwig.utils.h3_util import components_to_h3
+from ludwig.utils.h3_util import h3_to_components_array
+
+
+def test_h3_to_components_array():
+    random_state = np.random.RandomState(0)
+    h3_values = [622236723497533439, 576495936675512319]
+    for resolution in range(MAX_H3_RESOLUTION + 1):
+        h3_values.append(components_to_h3({
+            'mode': 1,
+            'edge': random_state.randint(8),
+            'resolution': resolution,
+            'base_cell': random_state.randint(122),
+            'cells': random_state.randint(7, size=resolution).tolist()
+        }))
+
+    components = h3_to_components_array(
+        h3_values,
+        MAX_H3_RESOLUTION,
+        H3_PADDING_VALUE
+    )
+
+    assert components.dtype == np.uint8
+    assert np.array_equal(
+        components,
+        [H3FeatureMixin.h3_to_list(h3_value) for h3_value in h3_values]
+    )
@@ -75,3 +75,22 @@ def test_norm():
         np.array([0, 0.25, 0.5 , 0.75, 1])
     )
 
+
+
+def test_norm_chunked():
+    for normalization in ['zscore', 'minmax']:
+        preprocessing_parameters = {'normalization': normalization}
+        stats = None
+        for chunk in [data_df['x'][:2], data_df['x'][2:]]:
+            stats = NumericalFeatureMixin.update_feature_stats(
+                stats, chunk.astype(str), preprocessing_parameters
+            )
+        chunked_meta = NumericalFeatureMixin.get_feature_meta_from_stats(
+            stats, preprocessing_parameters
+        )
+        feature_meta = NumericalFeatureMixin.get_feature_meta(
+            data_df['x'], preprocessing_parameters
+        )
+        assert chunked_meta.keys() == feature_meta.keys()
+        for key in feature_meta:
+            assert np.isclose(chunked_meta[key], feature_meta[key])
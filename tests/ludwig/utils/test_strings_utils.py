@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2019 Uber Technologies, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+import numpy as np
+import pytest
+
+from ludwig.utils.strings_utils import PADDING_SYMBOL
+from ludwig.utils.strings_utils import UNKNOWN_SYMBOL
+from ludwig.utils.strings_utils import build_sequence_matrix
+from ludwig.utils.strings_utils import create_vocabulary
+from ludwig.utils.strings_utils import get_sequence_vector
+from ludwig.utils.strings_utils import tokenizer_registry
+
+SEQUENCES = [
+    'Hello world, hello!',
+    '',
+    '  a_b , c_d  ',
+    'Ünïcode   text\twith\nspaces',
+    'x,y,,z',
+    'contains \x01 separator',
+]
+
+
+@pytest.mark.parametrize('padding', ['right', 'left'])
+@pytest.mark.parametrize(
+    'tokenizer_type',
+    ['characters', 'space', 'space_punct', 'underscore', 'comma', 'stripped']
+)
+def test_build_sequence_matrix(tokenizer_type, padding):
+    for sequences in [SEQUENCES, SEQUENCES[:-1]]:
+        _, str2idx, _, _, _, _, _ = create_vocabulary(
+            sequences,
+            tokenizer_type,
+            num_most_frequent=6
+        )
+        length_limit = 8
+
+        sequence_matrix = build_sequence_matrix(
+            sequences,
+            str2idx,
+            tokenizer_type,
+            length_limit,
+            PADDING_SYMBOL,
+            padding=padding,
+            unknown_symbol=UNKNOWN_SYMBOL
+        )
+
+        # same as looking up each sequence on its own
+        assert sequence_matrix.shape == (len(sequences), length_limit)
+        for sequence, row in zip(sequences, sequence_matrix):
+            vector = get_sequence_vector(
+                sequence,
+                tokenizer_type,
+                str2idx
+            )[:length_limit]
+            expected = np.full(length_limit, str2idx[PADDING_SYMBOL])
+            if padding == 'right':
+                expected[:len(vector)] = vector
+            else:
+                expected[length_limit - len(vector):] = vector
+            assert np.array_equal(row, expected)
+
+
+@pytest.mark.parametrize(
+    'tokenizer_type',
+    ['space_punct', 'english_tokenize_filter', 'english_lemmatize']
+)
+def test_tokenize_batch(tokenizer_type):
+    if tokenizer_type.startswith('english'):
+        pytest.importorskip('spacy')
+    tokenizer = tokenizer_registry[tokenizer_type]()
+    texts = [sequence.lower() for sequence in SEQUENCES]
+
+    # batches give the same units as tokenizing one text at a time
+    assert list(tokenizer.tokenize_batch(texts)) == [
+        tokenizer(text) for text in texts
+    ]